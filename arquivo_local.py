@@ -0,0 +1,135 @@
+"""Arquivos de currículo vindos do disco ou de pacotes ZIP para processamento em lote"""
+
+import os
+import io
+import glob
+import zipfile
+from typing import List, Optional, Iterable, Union
+
+EXTENSOES_SUPORTADAS = ('.pdf', '.docx', '.doc')
+
+
+class ArquivoCurriculo:
+    """
+    Arquivo de currículo com a mesma interface do UploadedFile do Streamlit.
+
+    Expõe name, size, type e getvalue() para que o Curriculo processe da mesma
+    forma arquivos enviados pela interface, lidos do disco ou extraídos de um ZIP.
+    Arquivos em disco só são lidos quando getvalue() é chamado.
+    """
+
+    TIPOS_MIME = {
+        '.pdf': 'application/pdf',
+        '.docx': 'application/vnd.openxmlformats-officedocument.wordprocessingml.document',
+        '.doc': 'application/msword'
+    }
+
+    def __init__(self, nome: str, dados: Optional[bytes] = None, caminho: Optional[str] = None):
+        """
+        Args:
+            nome (str): Nome do arquivo (usado para identificar o tipo)
+            dados (bytes): Conteúdo em memória, quando não há caminho em disco
+            caminho (str): Caminho do arquivo em disco
+        """
+        if dados is None and caminho is None:
+            raise ValueError("Informe os dados ou o caminho do arquivo")
+
+        self.name = nome
+        self.caminho = caminho
+        self._dados = dados
+
+    @property
+    def size(self) -> int:
+        if self._dados is not None:
+            return len(self._dados)
+        return os.path.getsize(self.caminho)
+
+    @property
+    def type(self) -> str:
+        extensao = os.path.splitext(self.name)[1].lower()
+        return self.TIPOS_MIME.get(extensao, 'application/octet-stream')
+
+    def getvalue(self) -> bytes:
+        if self._dados is not None:
+            return self._dados
+
+        with open(self.caminho, 'rb') as arquivo:
+            return arquivo.read()
+
+    @classmethod
+    def de_caminho(cls, caminho: str) -> 'ArquivoCurriculo':
+        return cls(os.path.basename(caminho), caminho=caminho)
+
+
+def _extensao_suportada(nome: str) -> bool:
+    return nome.lower().endswith(EXTENSOES_SUPORTADAS)
+
+
+def _expandir_zip(fonte, prefixo: str = "") -> List[ArquivoCurriculo]:
+    """
+    Lê os currículos contidos num ZIP (caminho ou bytes).
+    """
+    arquivos = []
+
+    with zipfile.ZipFile(fonte) as pacote:
+        for info in pacote.infolist():
+            nome = info.filename
+            if info.is_dir() or nome.startswith('__MACOSX/') or not _extensao_suportada(nome):
+                continue
+
+            nome_exibicao = f"{prefixo}{nome}" if prefixo else nome
+            arquivos.append(ArquivoCurriculo(nome_exibicao, dados=pacote.read(info)))
+
+    return arquivos
+
+
+def coletar_arquivos(origem: Union[str, Iterable]) -> List[ArquivoCurriculo]:
+    """
+    Normaliza a origem de um lote numa lista de arquivos de currículo.
+
+    Args:
+        origem: Pasta, arquivo ZIP, padrão glob, caminho de arquivo ou lista
+            contendo caminhos e/ou objetos de upload (com name e getvalue())
+
+    Returns:
+        List[ArquivoCurriculo]: Arquivos suportados (PDF/DOCX), em ordem de nome
+    """
+    if isinstance(origem, (str, os.PathLike)):
+        caminho = os.fspath(origem)
+
+        if os.path.isdir(caminho):
+            encontrados = []
+            for raiz, _, nomes in os.walk(caminho):
+                for nome in nomes:
+                    caminho_arquivo = os.path.join(raiz, nome)
+                    if nome.lower().endswith('.zip'):
+                        encontrados.extend(_expandir_zip(caminho_arquivo, prefixo=f"{nome}/"))
+                    elif _extensao_suportada(nome):
+                        encontrados.append(ArquivoCurriculo.de_caminho(caminho_arquivo))
+            return sorted(encontrados, key=lambda a: a.name)
+
+        if caminho.lower().endswith('.zip') and os.path.isfile(caminho):
+            return _expandir_zip(caminho)
+
+        if os.path.isfile(caminho):
+            return [ArquivoCurriculo.de_caminho(caminho)]
+
+        # Trata como padrão glob (ex.: "curriculos/**/*.pdf")
+        caminhos = sorted(glob.glob(caminho, recursive=True))
+        arquivos = []
+        for caminho_arquivo in caminhos:
+            if os.path.isfile(caminho_arquivo):
+                arquivos.extend(coletar_arquivos(caminho_arquivo))
+        return arquivos
+
+    arquivos = []
+    for item in origem:
+        if isinstance(item, (str, os.PathLike)):
+            arquivos.extend(coletar_arquivos(item))
+        elif getattr(item, 'name', '').lower().endswith('.zip'):
+            # ZIP enviado pela interface
+            arquivos.extend(_expandir_zip(io.BytesIO(item.getvalue()), prefixo=f"{item.name}/"))
+        elif item is not None:
+            arquivos.append(item)
+
+    return arquivos
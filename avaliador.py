@@ -1,7 +1,10 @@
 from gemini_api import GeminiClient
-from typing import Dict, Any, Optional
-import json
-import re
+from rastreamento import medir_etapa
+from modelos import ResultadoAvaliacao, classificar_score
+from historico_persistente import HistoricoAvaliacoes
+from perfil_vaga import PerfilVaga, obter_perfil_vaga
+from normalizador_texto import normalizar_texto_avaliacao
+from typing import Dict, Any, Optional, Callable, Union
 
 class Avaliador:
     # Classe responsável pela avaliação de currículos usando IA
@@ -15,146 +18,66 @@ class Avaliador:
             self.gemini_client = None
             self.status_conexao = f"Erro de conexão: {str(e)}"
     
-    def avaliar_curriculo(self, texto_curriculo: str, requisitos_vaga: str) -> Dict[str, Any]:
+    def avaliar_curriculo(self, texto_curriculo: str, requisitos_vaga: Union[str, PerfilVaga],
+                          callback_parcial: Optional[Callable[[Dict[str, Any]], None]] = None,
+                          contexto_candidato: str = "") -> ResultadoAvaliacao:
         # Avalia um currículo contra os requisitos da vaga
+        # requisitos_vaga pode vir já compilado (PerfilVaga), reaproveitado entre candidatos;
+        # contexto_candidato traz os dados estruturados do currículo para o prompt
+        # callback_parcial recebe os campos da avaliação conforme chegam do streaming
+        # (o score já acompanhado da classificação), antes do resultado final
         if not self.gemini_client:
-            return self._criar_resultado_erro("Cliente Gemini não inicializado")
+            return ResultadoAvaliacao.de_erro("Cliente Gemini não inicializado")
         
         # Validação de entrada
         if not texto_curriculo or not texto_curriculo.strip():
-            return self._criar_resultado_erro("Texto do currículo está vazio")
+            return ResultadoAvaliacao.de_erro("Texto do currículo está vazio")
         
-        if not requisitos_vaga or not requisitos_vaga.strip():
-            return self._criar_resultado_erro("Requisitos da vaga não foram fornecidos")
+        if isinstance(requisitos_vaga, str):
+            if not requisitos_vaga.strip():
+                return ResultadoAvaliacao.de_erro("Requisitos da vaga não foram fornecidos")
+            requisitos_vaga = obter_perfil_vaga(requisitos_vaga)
         
-        # Pré-processamento do texto
-        texto_processado = self._preprocessar_texto(texto_curriculo)
-        requisitos_processados = self._preprocessar_texto(requisitos_vaga)
+        # Pré-processamento do texto (os requisitos já vêm normalizados no perfil da vaga)
+        with medir_etapa("avaliador.preprocessamento"):
+            texto_processado = self._preprocessar_texto(texto_curriculo)
+            contexto_processado = self._preprocessar_texto(contexto_candidato) if contexto_candidato else ""
         
         try:
             # Chama o Gemini para avaliação
-            resultado_bruto = self.gemini_client.avaliar_curriculo(
-                texto_processado, 
-                requisitos_processados
-            )
+            with medir_etapa("avaliador.gemini"):
+                resultado_bruto = self.gemini_client.avaliar_curriculo(
+                    texto_processado, 
+                    requisitos_vaga,
+                    callback_parcial=self._repassar_campo_parcial(callback_parcial),
+                    contexto_candidato=contexto_processado
+                )
             
-            # Processa e valida o resultado
-            resultado_processado = self._processar_resultado(resultado_bruto)
-            
-            return resultado_processado
+            # Valida a resposta uma única vez, já no modelo tipado
+            with medir_etapa("avaliador.processamento_resultado"):
+                return ResultadoAvaliacao.de_resposta_ia(resultado_bruto)
             
         except Exception as e:
-            return self._criar_resultado_erro(f"Erro durante avaliação: {str(e)}")
+            return ResultadoAvaliacao.de_erro(f"Erro durante avaliação: {str(e)}")
     
-    def _preprocessar_texto(self, texto: str) -> str:
-        # Pré-processa o texto removendo caracteres especiais
-        # Remove quebras de linha excessivas
-        texto = re.sub(r'\n+', '\n', texto)
+    def _repassar_campo_parcial(self, callback_parcial: Optional[Callable[[Dict[str, Any]], None]]):
+        # Converte cada campo recebido em streaming numa atualização parcial do resultado
+        if not callback_parcial:
+            return None
         
-        # Remove espaços excessivos
-        texto = re.sub(r'\s+', ' ', texto)
+        def repassar(campo: str, valor: Any):
+            if campo == "score":
+                if not isinstance(valor, (int, float)) or valor < 0 or valor > 100:
+                    return
+                callback_parcial({"score": int(valor), "classificacao": classificar_score(valor)})
+            else:
+                callback_parcial({campo: valor})
         
-        # Remove caracteres especiais problemáticos
-        texto = re.sub(r'[\x00-\x08\x0b\x0c\x0e-\x1f\x7f-\xff]', '', texto)
-        
-        return texto.strip()
+        return repassar
     
-    def _processar_resultado(self, resultado_bruto: Dict[str, Any]) -> Dict[str, Any]:
-        # Processa e valida o resultado do Gemini
-        # Verifica se houve erro na resposta
-        if "erro" in resultado_bruto:
-            return self._criar_resultado_erro(resultado_bruto["erro"])
-        
-        try:
-            # Valida e ajusta o score
-            score = resultado_bruto.get("score", 0)
-            if not isinstance(score, (int, float)) or score < 0 or score > 100:
-                score = 0
-            
-            # Processa pontos fortes
-            pontos_fortes = resultado_bruto.get("pontos_fortes", [])
-            if not isinstance(pontos_fortes, list):
-                pontos_fortes = []
-            pontos_fortes = [str(ponto).strip() for ponto in pontos_fortes if str(ponto).strip()]
-            
-            # Processa pontos fracos
-            pontos_fracos = resultado_bruto.get("pontos_fracos", [])
-            if not isinstance(pontos_fracos, list):
-                pontos_fracos = []
-            pontos_fracos = [str(ponto).strip() for ponto in pontos_fracos if str(ponto).strip()]
-            
-            # Processa avaliação detalhada
-            avaliacao_detalhada = resultado_bruto.get("avaliacao_detalhada", "")
-            if not isinstance(avaliacao_detalhada, str):
-                avaliacao_detalhada = "Avaliação não disponível"
-            
-            # Processa informações adicionais
-            nome_candidato = resultado_bruto.get("nome_candidato", "Não identificado")
-            principais_habilidades = resultado_bruto.get("principais_habilidades", [])
-            if not isinstance(principais_habilidades, list):
-                principais_habilidades = []
-            
-            # Determina classificação baseada no score
-            classificacao = self._obter_classificacao_score(score)
-            
-            return {
-                "sucesso": True,
-                "score": int(score),
-                "classificacao": classificacao,
-                "pontos_fortes": pontos_fortes[:5],  # Limita a 5 pontos
-                "pontos_fracos": pontos_fracos[:5],  # Limita a 5 pontos
-                "avaliacao_detalhada": avaliacao_detalhada,
-                "nome_candidato": nome_candidato,
-                "principais_habilidades": principais_habilidades[:10],  # Limita a 10 habilidades
-                "resumo": self._gerar_resumo_avaliacao(score, pontos_fortes, pontos_fracos)
-            }
-            
-        except Exception as e:
-            return self._criar_resultado_erro(f"Erro ao processar resultado: {str(e)}")
-    
-    def _obter_classificacao_score(self, score: float) -> str:
-        # Obtém classificação textual baseada no score
-        if score >= 90:
-            return "Excelente"
-        elif score >= 80:
-            return "Muito Bom"
-        elif score >= 70:
-            return "Bom"
-        elif score >= 60:
-            return "Regular"
-        elif score >= 50:
-            return "Abaixo da Média"
-        else:
-            return "Inadequado"
-    
-    def _gerar_resumo_avaliacao(self, score: int, pontos_fortes: list, pontos_fracos: list) -> str:
-        # Gera um resumo breve da avaliação
-        classificacao = self._obter_classificacao_score(score)
-        
-        resumo = f"Candidato com classificação {classificacao} ({score}/100). "
-        
-        if pontos_fortes:
-            resumo += f"Principais qualificações: {', '.join(pontos_fortes[:2])}. "
-        
-        if pontos_fracos:
-            resumo += f"Principais lacunas: {', '.join(pontos_fracos[:2])}."
-        
-        return resumo
-    
-    def _criar_resultado_erro(self, mensagem_erro: str) -> Dict[str, Any]:
-        # Cria um resultado de erro padronizado
-        return {
-            "sucesso": False,
-            "erro": mensagem_erro,
-            "score": 0,
-            "classificacao": "Erro",
-            "pontos_fortes": [],
-            "pontos_fracos": [],
-            "avaliacao_detalhada": f"Não foi possível processar a avaliação: {mensagem_erro}",
-            "nome_candidato": "Não identificado",
-            "principais_habilidades": [],
-            "resumo": f"Erro na avaliação: {mensagem_erro}"
-        }
+    def _preprocessar_texto(self, texto: str) -> str:
+        # Pré-processa o texto removendo espaços excessivos e caracteres de controle (preserva acentos)
+        return normalizar_texto_avaliacao(texto)
     
     def verificar_status_conexao(self) -> Dict[str, Any]:
         # Verifica o status da conexão com o Gemini
@@ -163,8 +86,16 @@ class Avaliador:
             "gemini_disponivel": self.gemini_client is not None
         }
     
-    def obter_estatisticas_avaliacao(self, resultados_historicos: list) -> Dict[str, Any]:
+    def obter_estatisticas_avaliacao(self, resultados_historicos: Optional[list] = None,
+                                     historico: Optional[HistoricoAvaliacoes] = None,
+                                     **filtros) -> Dict[str, Any]:
         # Gera estatísticas básicas a partir de avaliações históricas
+        # Com um histórico persistente, a agregação é feita pelo banco (filtros: vaga_hash, desde, ...)
+        if historico is not None:
+            if not historico.contar(**filtros):
+                return {"erro": "Nenhuma avaliação disponível"}
+            return historico.estatisticas(**filtros) or {"erro": "Nenhuma avaliação válida encontrada"}
+        
         if not resultados_historicos:
             return {"erro": "Nenhuma avaliação disponível"}
         
@@ -180,4 +111,4 @@ class Avaliador:
             "score_minimo": min(scores),
             "acima_70": len([s for s in scores if s >= 70]),
             "percentual_aprovacao": round((len([s for s in scores if s >= 70]) / len(scores)) * 100, 1)
-        }
\ No newline at end of file
+        }
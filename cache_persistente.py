@@ -0,0 +1,199 @@
+"""Cache persistente em disco para resultados das chamadas à IA"""
+
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+from typing import Dict, Any, Optional
+
+
+class CachePersistente:
+    """
+    Cache em SQLite endereçado por conteúdo.
+
+    As chaves são hashes SHA-256 do texto normalizado, da versão do template de
+    prompt, do modelo e da configuração de geração. Entradas expiram após o TTL
+    e, quando o limite de entradas é excedido, as menos acessadas recentemente
+    são removidas (LRU).
+    """
+
+    def __init__(self, caminho: str = ".cache_ia.sqlite3", ttl_segundos: int = 7 * 24 * 3600,
+                 max_entradas: int = 5000):
+        """
+        Inicializa o cache criando o banco se necessário.
+
+        Args:
+            caminho (str): Arquivo SQLite onde os resultados são gravados
+            ttl_segundos (int): Tempo de vida de cada entrada
+            max_entradas (int): Número máximo de entradas antes da remoção LRU
+        """
+        self.caminho = caminho
+        self.ttl_segundos = ttl_segundos
+        self.max_entradas = max(1, max_entradas)
+        self.acertos = 0
+        self.falhas = 0
+        self.remocoes = 0
+
+        self._lock = threading.Lock()
+        self._conexao = sqlite3.connect(caminho, check_same_thread=False)
+        self._conexao.execute("PRAGMA journal_mode=WAL")
+        self._conexao.execute("""
+            CREATE TABLE IF NOT EXISTS cache_ia (
+                chave TEXT PRIMARY KEY,
+                valor TEXT NOT NULL,
+                criado_em REAL NOT NULL,
+                ultimo_acesso REAL NOT NULL
+            )
+        """)
+        self._conexao.execute(
+            "CREATE INDEX IF NOT EXISTS idx_cache_ia_ultimo_acesso ON cache_ia (ultimo_acesso)"
+        )
+        self._conexao.commit()
+
+    @staticmethod
+    def gerar_chave(namespace: str, texto: str, versao_prompt: str, modelo: str,
+                    config: Dict[str, Any]) -> str:
+        """
+        Gera a chave de cache a partir do conteúdo da requisição.
+
+        Args:
+            namespace (str): Tipo da chamada (ex.: "extracao:habilidades", "avaliacao")
+            texto (str): Texto enviado à IA; espaços em branco são normalizados
+            versao_prompt (str): Versão do template de prompt
+            modelo (str): Nome do modelo
+            config (Dict): Parâmetros de geração
+
+        Returns:
+            str: Hash hexadecimal SHA-256
+        """
+        texto_normalizado = " ".join(texto.split())
+        partes = [
+            namespace,
+            versao_prompt,
+            modelo,
+            json.dumps(config, sort_keys=True, default=str),
+            texto_normalizado
+        ]
+        return hashlib.sha256("\x1f".join(partes).encode("utf-8")).hexdigest()
+
+    def obter(self, chave: str) -> Optional[Any]:
+        """
+        Busca um resultado no cache.
+
+        Returns:
+            Any: Valor armazenado, ou None se ausente ou expirado
+        """
+        agora = time.time()
+
+        with self._lock:
+            linha = self._conexao.execute(
+                "SELECT valor, criado_em FROM cache_ia WHERE chave = ?", (chave,)
+            ).fetchone()
+
+            if linha is None:
+                self.falhas += 1
+                return None
+
+            valor, criado_em = linha
+            if agora - criado_em > self.ttl_segundos:
+                self._conexao.execute("DELETE FROM cache_ia WHERE chave = ?", (chave,))
+                self._conexao.commit()
+                self.falhas += 1
+                return None
+
+            self._conexao.execute(
+                "UPDATE cache_ia SET ultimo_acesso = ? WHERE chave = ?", (agora, chave)
+            )
+            self._conexao.commit()
+            self.acertos += 1
+
+        return json.loads(valor)
+
+    def armazenar(self, chave: str, valor: Any):
+        """
+        Grava um resultado no cache, removendo as entradas mais antigas se necessário.
+        """
+        agora = time.time()
+        valor_serializado = json.dumps(valor, ensure_ascii=False)
+
+        with self._lock:
+            self._conexao.execute(
+                "INSERT OR REPLACE INTO cache_ia (chave, valor, criado_em, ultimo_acesso) VALUES (?, ?, ?, ?)",
+                (chave, valor_serializado, agora, agora)
+            )
+
+            total = self._conexao.execute("SELECT COUNT(*) FROM cache_ia").fetchone()[0]
+            excesso = total - self.max_entradas
+            if excesso > 0:
+                self._conexao.execute(
+                    "DELETE FROM cache_ia WHERE chave IN "
+                    "(SELECT chave FROM cache_ia ORDER BY ultimo_acesso ASC LIMIT ?)",
+                    (excesso,)
+                )
+                self.remocoes += excesso
+
+            self._conexao.commit()
+
+    def limpar(self):
+        """Remove todas as entradas do cache."""
+        with self._lock:
+            self._conexao.execute("DELETE FROM cache_ia")
+            self._conexao.commit()
+
+    def estatisticas(self) -> Dict[str, Any]:
+        """
+        Retorna contadores de uso do cache.
+
+        Returns:
+            Dict: Acertos, falhas, taxa de acerto, entradas e remoções LRU
+        """
+        with self._lock:
+            entradas = self._conexao.execute("SELECT COUNT(*) FROM cache_ia").fetchone()[0]
+
+        consultas = self.acertos + self.falhas
+        return {
+            "acertos": self.acertos,
+            "falhas": self.falhas,
+            "taxa_acerto": round((self.acertos / consultas) * 100, 1) if consultas else 0.0,
+            "entradas": entradas,
+            "max_entradas": self.max_entradas,
+            "remocoes_lru": self.remocoes,
+            "ttl_horas": round(self.ttl_segundos / 3600, 1),
+            "caminho": self.caminho
+        }
+
+
+_cache_padrao = None
+_cache_padrao_lock = threading.Lock()
+
+
+def obter_cache_padrao() -> Optional[CachePersistente]:
+    """
+    Retorna o cache compartilhado pelo processo, configurado pelo .env.
+
+    Variáveis: CACHE_IA_ATIVO (1/0), CACHE_IA_CAMINHO, CACHE_IA_TTL_HORAS e
+    CACHE_IA_MAX_ENTRADAS.
+
+    Returns:
+        CachePersistente: Instância compartilhada, ou None se o cache estiver desativado
+    """
+    global _cache_padrao
+
+    if os.getenv('CACHE_IA_ATIVO', '1') == '0':
+        return None
+
+    with _cache_padrao_lock:
+        if _cache_padrao is None:
+            try:
+                _cache_padrao = CachePersistente(
+                    caminho=os.getenv('CACHE_IA_CAMINHO', '.cache_ia.sqlite3'),
+                    ttl_segundos=int(float(os.getenv('CACHE_IA_TTL_HORAS', '168')) * 3600),
+                    max_entradas=int(os.getenv('CACHE_IA_MAX_ENTRADAS', '5000'))
+                )
+            except (sqlite3.Error, ValueError) as e:
+                print(f"⚠️ Cache persistente indisponível: {e}")
+                return None
+
+        return _cache_padrao
@@ -0,0 +1,292 @@
+"""Registro de clientes Gemini compartilhados pelo processo"""
+
+import os
+import time
+import threading
+from contextlib import contextmanager
+from typing import Dict, Any, Optional, Iterator
+from dotenv import load_dotenv
+from google import genai
+from google.genai import types
+from limitador_taxa import LimitadorTaxa, PoliticaRetentativa
+from uso_tokens import registrar_resposta
+from rastreamento import medir_etapa
+
+_ambiente_carregado = False
+_ambiente_lock = threading.Lock()
+
+
+def carregar_ambiente():
+    """
+    Carrega o .env uma única vez por processo.
+    """
+    global _ambiente_carregado
+
+    with _ambiente_lock:
+        if not _ambiente_carregado:
+            load_dotenv()
+            _ambiente_carregado = True
+
+
+class ClienteGemini:
+    """
+    Cliente Gemini compartilhado entre extrator e avaliador.
+
+    Mantém um único genai.Client (e, com ele, um único pool de conexões HTTP
+    com keep-alive), de modo que currículos seguintes reaproveitam conexões já
+    abertas em vez de refazer o handshake TLS. Um semáforo limita quantas
+    requisições ficam em voo ao mesmo tempo, somando todas as threads.
+
+    Antes de cada envio a requisição passa pelo limitador de taxa (RPM/TPM,
+    com prioridade para chamadas interativas); erros transitórios (429, 5xx,
+    falhas de rede) são repetidos com backoff exponencial antes de chegarem
+    ao chamador, que só então recorre ao fallback local.
+    """
+
+    def __init__(self, api_key: str, max_requisicoes_simultaneas: int = 8,
+                 max_conexoes: Optional[int] = None,
+                 limitador: Optional[LimitadorTaxa] = None,
+                 politica_retentativa: Optional[PoliticaRetentativa] = None):
+        """
+        Args:
+            api_key (str): Chave da API Gemini
+            max_requisicoes_simultaneas (int): Limite de requisições em voo no processo
+            max_conexoes (int): Tamanho do pool de conexões HTTP (padrão: igual ao limite de requisições)
+            limitador (LimitadorTaxa): Limitador de RPM/TPM (padrão: 60 RPM, 1M TPM)
+            politica_retentativa (PoliticaRetentativa): Retentativas de erros transitórios
+        """
+        self.max_requisicoes_simultaneas = max(1, max_requisicoes_simultaneas)
+        self.max_conexoes = max(self.max_requisicoes_simultaneas, max_conexoes or 0)
+        self.client = self._criar_client(api_key)
+        self.limitador = limitador or LimitadorTaxa()
+        self.politica_retentativa = politica_retentativa or PoliticaRetentativa()
+
+        self._semaforo = threading.BoundedSemaphore(self.max_requisicoes_simultaneas)
+        self._lock = threading.Lock()
+        self._em_voo = 0
+        self._total_requisicoes = 0
+        self._retentativas = 0
+
+    def _criar_client(self, api_key: str) -> genai.Client:
+        """
+        Cria o genai.Client com pool de conexões dimensionado para o limite de
+        requisições simultâneas, quando a versão do SDK permite configurá-lo.
+        """
+        try:
+            import httpx
+
+            limites = httpx.Limits(
+                max_connections=self.max_conexoes,
+                max_keepalive_connections=self.max_conexoes,
+                keepalive_expiry=60
+            )
+            http_options = types.HttpOptions(client_args={"limits": limites})
+            return genai.Client(api_key=api_key, http_options=http_options)
+        except (ImportError, TypeError, ValueError) as e:
+            # SDKs antigos não aceitam client_args; o pool padrão do SDK continua compartilhado
+            print(f"⚠️ Pool de conexões personalizado indisponível, usando o padrão do SDK: {e}")
+            return genai.Client(api_key=api_key)
+
+    @staticmethod
+    def estimar_tokens(prompt: str, parametros_geracao: Dict[str, Any]) -> int:
+        """
+        Estimativa conservadora de tokens para a reserva no limitador:
+        ~4 caracteres por token de entrada mais o teto de tokens de saída.
+        """
+        return len(prompt) // 4 + int(parametros_geracao.get("max_output_tokens", 0))
+
+    def gerar_conteudo(self, modelo: str, prompt: str, parametros_geracao: Dict[str, Any],
+                       etapa: str = "geral"):
+        """
+        Envia uma requisição generate_content respeitando cotas, prioridade e
+        o limite de requisições em voo, com retentativas em erros transitórios.
+
+        Args:
+            modelo (str): Nome do modelo
+            prompt (str): Conteúdo enviado
+            parametros_geracao (Dict): Parâmetros de GenerateContentConfig
+            etapa (str): Identificação da chamada na contabilização de tokens
+
+        Returns:
+            Resposta do SDK (com .text)
+
+        Raises:
+            Exception: Erro não transitório, ou o último erro após esgotar as tentativas
+        """
+        politica = self.politica_retentativa
+        tokens_reservados = self.estimar_tokens(prompt, parametros_geracao)
+
+        for tentativa in range(politica.max_tentativas):
+            with medir_etapa("gemini.fila_limitador"):
+                self.limitador.adquirir(tokens_reservados)
+
+            try:
+                with medir_etapa("gemini.requisicao", etapa=etapa, tentativa=tentativa + 1):
+                    response = self._enviar(modelo, prompt, parametros_geracao)
+            except Exception as e:
+                # A tentativa falhou: devolve a reserva antes do backoff para não drenar o TPM
+                self.limitador.ajustar_tokens(tokens_reservados, 0)
+                if not self._preparar_retentativa(e, tentativa):
+                    raise
+                continue
+
+            self._registrar_conclusao(etapa, response, prompt, tokens_reservados)
+            return response
+
+    def gerar_conteudo_stream(self, modelo: str, prompt: str, parametros_geracao: Dict[str, Any],
+                              etapa: str = "geral") -> Iterator[str]:
+        """
+        Versão em streaming de gerar_conteudo (generate_content_stream): devolve
+        os pedaços de texto à medida que o modelo os gera.
+
+        Erros transitórios só são repetidos enquanto nenhum pedaço foi
+        entregue; depois disso o chamador já consumiu parte da resposta e o
+        erro é propagado. A vaga no semáforo fica ocupada até o fim da leitura.
+
+        Yields:
+            str: Pedaços do texto da resposta
+        """
+        politica = self.politica_retentativa
+        tokens_reservados = self.estimar_tokens(prompt, parametros_geracao)
+
+        for tentativa in range(politica.max_tentativas):
+            with medir_etapa("gemini.fila_limitador"):
+                self.limitador.adquirir(tokens_reservados)
+
+            ultimo_pedaco = None
+            entregou_texto = False
+            try:
+                with medir_etapa("gemini.requisicao_stream", etapa=etapa, tentativa=tentativa + 1), \
+                        self._requisicao_em_voo():
+                    for pedaco in self.client.models.generate_content_stream(
+                        model=modelo,
+                        contents=prompt,
+                        config=types.GenerateContentConfig(**parametros_geracao)
+                    ):
+                        ultimo_pedaco = pedaco
+                        texto = getattr(pedaco, "text", None)
+                        if texto:
+                            entregou_texto = True
+                            yield texto
+            except Exception as e:
+                if entregou_texto:
+                    raise
+                self.limitador.ajustar_tokens(tokens_reservados, 0)
+                if not self._preparar_retentativa(e, tentativa):
+                    raise
+                continue
+
+            # O usage_metadata acumulado chega no último pedaço
+            self._registrar_conclusao(etapa, ultimo_pedaco, prompt, tokens_reservados)
+            return
+
+    def _preparar_retentativa(self, erro: Exception, tentativa: int) -> bool:
+        """
+        Decide se o erro deve ser repetido e, se sim, aguarda o backoff.
+
+        Returns:
+            bool: True se o chamador deve tentar novamente
+        """
+        politica = self.politica_retentativa
+        if tentativa + 1 >= politica.max_tentativas or not politica.eh_retentavel(erro):
+            return False
+
+        espera = politica.calcular_espera(tentativa, erro)
+        if politica.obter_codigo_http(erro) == 429:
+            self.limitador.registrar_limite_excedido(espera)
+
+        with self._lock:
+            self._retentativas += 1
+        print(f"⚠️ Erro transitório na API Gemini ({erro}); nova tentativa em {espera:.1f}s")
+        time.sleep(espera)
+        return True
+
+    def _registrar_conclusao(self, etapa: str, response, prompt: str, tokens_reservados: int):
+        self.limitador.registrar_sucesso()
+        registrar_resposta(etapa, response, prompt)
+
+        uso = getattr(response, "usage_metadata", None)
+        tokens_reais = getattr(uso, "total_token_count", None)
+        if isinstance(tokens_reais, int):
+            self.limitador.ajustar_tokens(tokens_reservados, tokens_reais)
+
+    @contextmanager
+    def _requisicao_em_voo(self):
+        with self._semaforo:
+            with self._lock:
+                self._em_voo += 1
+                self._total_requisicoes += 1
+            try:
+                yield
+            finally:
+                with self._lock:
+                    self._em_voo -= 1
+
+    def _enviar(self, modelo: str, prompt: str, parametros_geracao: Dict[str, Any]):
+        with self._requisicao_em_voo():
+            return self.client.models.generate_content(
+                model=modelo,
+                contents=prompt,
+                config=types.GenerateContentConfig(**parametros_geracao)
+            )
+
+    def estatisticas(self) -> Dict[str, Any]:
+        """
+        Retorna o uso atual do cliente.
+
+        Returns:
+            Dict: Requisições em voo, limite, total enviadas, retentativas e limitador
+        """
+        with self._lock:
+            estatisticas = {
+                "requisicoes_em_voo": self._em_voo,
+                "max_requisicoes_simultaneas": self.max_requisicoes_simultaneas,
+                "max_conexoes": self.max_conexoes,
+                "total_requisicoes": self._total_requisicoes,
+                "retentativas": self._retentativas
+            }
+        estatisticas["limitador"] = self.limitador.estatisticas()
+        return estatisticas
+
+
+_clientes: Dict[str, ClienteGemini] = {}
+_clientes_lock = threading.Lock()
+
+
+def obter_cliente_gemini() -> ClienteGemini:
+    """
+    Retorna o cliente Gemini compartilhado pelo processo, criando-o na primeira chamada.
+
+    Variáveis: GEMINI_API_KEY (obrigatória), GEMINI_MAX_REQUISICOES_SIMULTANEAS
+    (padrão: 8), GEMINI_MAX_CONEXOES, GEMINI_LIMITE_RPM (padrão: 60),
+    GEMINI_LIMITE_TPM (padrão: 1.000.000), GEMINI_MAX_TENTATIVAS (padrão: 4)
+    e GEMINI_BACKOFF_MAXIMO_SEGUNDOS (padrão: 30).
+
+    Raises:
+        ValueError: Se GEMINI_API_KEY não estiver configurada
+    """
+    carregar_ambiente()
+    api_key = os.getenv('GEMINI_API_KEY')
+
+    if not api_key:
+        raise ValueError("GEMINI_API_KEY não encontrada no arquivo .env")
+
+    with _clientes_lock:
+        cliente = _clientes.get(api_key)
+        if cliente is None:
+            max_conexoes = os.getenv('GEMINI_MAX_CONEXOES')
+            cliente = ClienteGemini(
+                api_key,
+                max_requisicoes_simultaneas=int(os.getenv('GEMINI_MAX_REQUISICOES_SIMULTANEAS', '8')),
+                max_conexoes=int(max_conexoes) if max_conexoes else None,
+                limitador=LimitadorTaxa(
+                    requisicoes_por_minuto=float(os.getenv('GEMINI_LIMITE_RPM', '60')),
+                    tokens_por_minuto=float(os.getenv('GEMINI_LIMITE_TPM', '1000000'))
+                ),
+                politica_retentativa=PoliticaRetentativa(
+                    max_tentativas=int(os.getenv('GEMINI_MAX_TENTATIVAS', '4')),
+                    espera_maxima=float(os.getenv('GEMINI_BACKOFF_MAXIMO_SEGUNDOS', '30'))
+                )
+            )
+            _clientes[api_key] = cliente
+        return cliente
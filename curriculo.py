@@ -1,22 +1,51 @@
-import PyPDF2
-import docx
+from parser_documentos import extrair_texto_pdf, extrair_texto_docx, LIMITE_CARACTERES_PADRAO
+from padroes_texto import (
+    EMAIL_REGEX, TELEFONE_REGEX, TELEFONE_COMPLETO_REGEX, LINKEDIN_REGEX, GITHUB_REGEX
+)
+from taxonomia_habilidades import obter_taxonomia_padrao
+from rastreamento import medir_etapa
 from typing import Optional, Dict, Any
-import tempfile
-import os
 import re
 
 class Curriculo:
     """Classe responsável pela extração dos dados do currículo"""
     
-    def __init__(self, arquivo_upload):
+    def __init__(self, arquivo_upload, parser_documentos=None,
+                 limite_caracteres: Optional[int] = LIMITE_CARACTERES_PADRAO,
+                 extrator_ia=None, usar_ia: bool = True):
+        """
+        Args:
+            arquivo_upload: Arquivo enviado (name, getvalue())
+            parser_documentos (ParserDocumentos): Pool de processos opcional para a
+                extração de texto; sem ele, a extração roda na thread atual
+            limite_caracteres (int): Máximo de caracteres lidos do documento na
+                extração local (None = documento inteiro)
+            extrator_ia (ExtratorInteligente): Extrator compartilhado entre currículos;
+                se omitido, um novo extrator é criado
+            usar_ia (bool): Com False, os dados estruturados vêm só da extração
+                local (regex), sem chamadas à IA
+        """
         self.arquivo = arquivo_upload
         self.nome_arquivo = arquivo_upload.name if arquivo_upload else None
         self.tipo_arquivo = self._identificar_tipo_arquivo()
+        self.parser_documentos = parser_documentos
+        self.limite_caracteres = limite_caracteres
         self.texto_extraido = None
         self.dados_estruturados = None
         self.metadados = {}
+        self.estatisticas_documento = {}
         
         # Inicializa o extrator inteligente se disponível
+        if not usar_ia:
+            self.extrator_ia = None
+            self.usar_ia = False
+            return
+        
+        if extrator_ia is not None:
+            self.extrator_ia = extrator_ia
+            self.usar_ia = True
+            return
+        
         try:
             from extrator_inteligente import ExtratorInteligente
             self.extrator_ia = ExtratorInteligente()
@@ -26,8 +55,14 @@ class Curriculo:
             self.extrator_ia = None
             self.usar_ia = False
     
-    def extrair_texto(self) -> Dict[str, Any]:
-        """Extrai texto e dados estruturados do currículo"""
+    def extrair_texto(self, callback_progresso=None) -> Dict[str, Any]:
+        """
+        Extrai texto e dados estruturados do currículo.
+        
+        Args:
+            callback_progresso (Callable): Repassado ao extrator de IA, que o chama
+                a cada passada concluída
+        """
         if not self.arquivo:
             return {
                 "sucesso": False,
@@ -36,15 +71,27 @@ class Curriculo:
         
         try:
             # 1. Extração de texto básica
-            if self.tipo_arquivo == 'pdf':
-                self.texto_extraido = self._extrair_texto_pdf()
-            elif self.tipo_arquivo == 'docx':
-                self.texto_extraido = self._extrair_texto_docx()
-            else:
-                return {
-                    "sucesso": False,
-                    "erro": f"Tipo de arquivo não suportado: {self.tipo_arquivo}"
-                }
+            with medir_etapa("curriculo.texto", tipo_arquivo=self.tipo_arquivo):
+                if self.parser_documentos and self.tipo_arquivo in ('pdf', 'docx'):
+                    resultado_parser = self.parser_documentos.extrair(
+                        self.tipo_arquivo, self._obter_fonte_documento(para_processo=True)
+                    )
+                    if not resultado_parser["sucesso"]:
+                        return {
+                            "sucesso": False,
+                            "erro": f"Erro ao extrair dados do {self.tipo_arquivo.upper()}: {resultado_parser['erro']}"
+                        }
+                    self.texto_extraido = resultado_parser["texto"]
+                    self.estatisticas_documento = resultado_parser["estatisticas"]
+                elif self.tipo_arquivo == 'pdf':
+                    self.texto_extraido = self._extrair_texto_pdf()
+                elif self.tipo_arquivo == 'docx':
+                    self.texto_extraido = self._extrair_texto_docx()
+                else:
+                    return {
+                        "sucesso": False,
+                        "erro": f"Tipo de arquivo não suportado: {self.tipo_arquivo}"
+                    }
             
             # 2. Valida se conseguiu extrair texto
             if not self.texto_extraido or len(self.texto_extraido.strip()) < 10:
@@ -54,13 +101,18 @@ class Curriculo:
                 }
             
             # 3. Extração de metadados básicos
-            self._extrair_metadados()
+            with medir_etapa("curriculo.metadados"):
+                self._extrair_metadados()
+            self.metadados['estatisticas_documento'] = self.estatisticas_documento
             
             # 4. Extração inteligente com IA (se disponível)
             if self.usar_ia and self.extrator_ia:
                 try:
                     print("🤖 Iniciando extração inteligente com IA...")
-                    self.dados_estruturados = self.extrator_ia.extrair_dados_completos(self.texto_extraido)
+                    with medir_etapa("curriculo.extracao_ia"):
+                        self.dados_estruturados = self.extrator_ia.extrair_dados_completos(
+                            self.texto_extraido, callback_progresso
+                        )
                     print("✅ Extração inteligente concluída com sucesso!")
                 except Exception as e:
                     print(f"⚠️ Falha na extração inteligente: {e}")
@@ -75,6 +127,7 @@ class Curriculo:
                 "texto": self.texto_extraido,
                 "dados_estruturados": self.dados_estruturados,
                 "metadados": self.metadados,
+                "estatisticas_documento": self.estatisticas_documento,
                 "metodo_extracao": "IA" if self.usar_ia else "REGEX"
             }
             
@@ -96,16 +149,11 @@ class Curriculo:
         
         texto = self.texto_extraido
         
-        # Extração de dados básicos com regex melhorado
-        email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-        telefone_pattern = r'(\(?\d{2}\)?[\s-]?\d{4,5}[\s-]?\d{4})'
-        linkedin_pattern = r'(?:linkedin\.com/in/|linkedin\.com/profile/)([A-Za-z0-9-_]+)'
-        github_pattern = r'(?:github\.com/)([A-Za-z0-9-_]+)'
-        
-        emails = re.findall(email_pattern, texto)
-        telefones = re.findall(telefone_pattern, texto)
-        linkedin = re.findall(linkedin_pattern, texto, re.IGNORECASE)
-        github = re.findall(github_pattern, texto, re.IGNORECASE)
+        # Extração de dados básicos com regex pré-compiladas
+        emails = EMAIL_REGEX.findall(texto)
+        telefones = TELEFONE_REGEX.findall(texto)
+        linkedin = LINKEDIN_REGEX.findall(texto)
+        github = GITHUB_REGEX.findall(texto)
         
         # Extração de nome (melhorada)
         nome = self._extrair_nome_candidato(texto)
@@ -172,28 +220,16 @@ class Curriculo:
     
     def _extrair_tecnologias_basicas(self, texto: str) -> Dict[str, list]:
         """
-        Extrai tecnologias mencionadas usando lista pré-definida.
-        """
-        texto_lower = texto.lower()
-        
-        linguagens = [
-            'python', 'javascript', 'java', 'php', 'c++', 'c#', 'ruby', 'go', 
-            'typescript', 'kotlin', 'swift', 'scala', 'rust', 'r', 'matlab'
-        ]
-        
-        frameworks = [
-            'react', 'angular', 'vue', 'django', 'flask', 'spring', 'laravel',
-            'express', 'next.js', 'nuxt', 'bootstrap', 'tailwind', 'fastapi'
-        ]
+        Extrai tecnologias mencionadas usando a taxonomia de habilidades.
         
-        ferramentas = [
-            'git', 'docker', 'kubernetes', 'jenkins', 'aws', 'azure', 'gcp',
-            'mongodb', 'postgresql', 'mysql', 'redis', 'elasticsearch', 'nginx'
-        ]
+        Bancos de dados, cloud e DevOps estão na categoria "ferramentas";
+        aliases (ex.: "k8s") já vêm resolvidos para o nome canônico.
+        """
+        encontrados = obter_taxonomia_padrao().extrair(texto, ("linguagens", "frameworks", "ferramentas"))
         
-        linguagens_encontradas = [tech for tech in linguagens if tech in texto_lower]
-        frameworks_encontrados = [tech for tech in frameworks if tech in texto_lower]
-        ferramentas_encontradas = [tech for tech in ferramentas if tech in texto_lower]
+        linguagens_encontradas = encontrados["linguagens"]
+        frameworks_encontrados = encontrados["frameworks"]
+        ferramentas_encontradas = encontrados["ferramentas"]
         
         return {
             "linguagens": linguagens_encontradas,
@@ -320,6 +356,27 @@ class Curriculo:
         else:
             return None
     
+    def _obter_fonte_documento(self, para_processo: bool = False):
+        """
+        Retorna a fonte de leitura do documento sem gravar arquivos temporários.
+        
+        Arquivos em disco (modo lote) são lidos por caminho e mapeados em memória
+        pelo parser. Uploads do Streamlit já são fluxos em memória e são lidos
+        diretamente; para o pool de processos, que precisa de dados serializáveis,
+        envia-se o conteúdo em bytes.
+        
+        Args:
+            para_processo (bool): Se a fonte será enviada a outro processo
+        """
+        caminho = getattr(self.arquivo, 'caminho', None)
+        if caminho:
+            return caminho
+        
+        if not para_processo and hasattr(self.arquivo, 'seek') and hasattr(self.arquivo, 'read'):
+            return self.arquivo
+        
+        return self.arquivo.getvalue()
+    
     def _extrair_texto_pdf(self) -> str:
         """
         Extrai texto de arquivo PDF usando PyPDF2.
@@ -327,32 +384,11 @@ class Curriculo:
         Returns:
             str: Texto extraído do PDF
         """
-        texto_completo = ""
-        
-        # Salva o arquivo temporariamente para leitura
-        with tempfile.NamedTemporaryFile(delete=False, suffix='.pdf') as temp_file:
-            temp_file.write(self.arquivo.getvalue())
-            temp_path = temp_file.name
-        
-        try:
-            with open(temp_path, 'rb') as arquivo_pdf:
-                reader = PyPDF2.PdfReader(arquivo_pdf)
-                
-                for page_num, page in enumerate(reader.pages):
-                    try:
-                        texto_pagina = page.extract_text()
-                        if texto_pagina.strip():
-                            texto_completo += texto_pagina + "\n"
-                    except Exception as e:
-                        print(f"Erro ao extrair texto da página {page_num + 1}: {e}")
-                        continue
-        
-        finally:
-            # Remove arquivo temporário
-            if os.path.exists(temp_path):
-                os.unlink(temp_path)
-        
-        return texto_completo.strip()
+        resultado = extrair_texto_pdf(
+            self._obter_fonte_documento(), self.limite_caracteres
+        )
+        self.estatisticas_documento = resultado["estatisticas"]
+        return resultado["texto"]
     
     def _extrair_texto_docx(self) -> str:
         """
@@ -361,34 +397,11 @@ class Curriculo:
         Returns:
             str: Texto extraído do DOCX
         """
-        texto_completo = ""
-        
-        # Salva o arquivo temporariamente para leitura
-        with tempfile.NamedTemporaryFile(delete=False, suffix='.docx') as temp_file:
-            temp_file.write(self.arquivo.getvalue())
-            temp_path = temp_file.name
-        
-        try:
-            doc = docx.Document(temp_path)
-            
-            # Extrai texto de todos os parágrafos
-            for paragrafo in doc.paragraphs:
-                if paragrafo.text.strip():
-                    texto_completo += paragrafo.text + "\n"
-            
-            # Extrai texto de tabelas se existirem
-            for tabela in doc.tables:
-                for linha in tabela.rows:
-                    for celula in linha.cells:
-                        if celula.text.strip():
-                            texto_completo += celula.text + "\n"
-        
-        finally:
-            # Remove arquivo temporário
-            if os.path.exists(temp_path):
-                os.unlink(temp_path)
-        
-        return texto_completo.strip()
+        resultado = extrair_texto_docx(
+            self._obter_fonte_documento(), self.limite_caracteres
+        )
+        self.estatisticas_documento = resultado["estatisticas"]
+        return resultado["texto"]
     
     def _extrair_metadados(self):
         """
@@ -397,15 +410,11 @@ class Curriculo:
         if not self.texto_extraido:
             return
         
-        import re
-        
         # Buscar email
-        email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-        emails = re.findall(email_pattern, self.texto_extraido)
+        emails = EMAIL_REGEX.findall(self.texto_extraido)
         
         # Buscar telefone
-        telefone_pattern = r'(\(?\d{2}\)?[\s-]?\d{4,5}[\s-]?\d{4})|(\+?\d{2}[\s-]?\(?\d{2}\)?[\s-]?\d{4,5}[\s-]?\d{4})'
-        telefones = re.findall(telefone_pattern, self.texto_extraido)
+        telefones = TELEFONE_COMPLETO_REGEX.findall(self.texto_extraido)
         
         # Buscar possível nome (primeira linha que não é email/telefone)
         linhas = self.texto_extraido.split('\n')
@@ -439,22 +448,9 @@ class Curriculo:
         if not self.texto_extraido:
             return []
         
-        # Tecnologias e habilidades comuns
-        tecnologias = [
-            'python', 'javascript', 'java', 'c++', 'c#', 'php', 'ruby', 'go', 'rust',
-            'html', 'css', 'react', 'angular', 'vue', 'node', 'express', 'django', 
-            'flask', 'spring', 'laravel', 'sql', 'mysql', 'postgresql', 'mongodb',
-            'docker', 'kubernetes', 'aws', 'azure', 'gcp', 'git', 'github', 'gitlab',
-            'linux', 'windows', 'mac', 'android', 'ios', 'flutter', 'react native',
-            'machine learning', 'ai', 'data science', 'excel', 'power bi', 'tableau'
-        ]
-        
-        texto_lower = self.texto_extraido.lower()
-        encontradas = []
-        
-        for tech in tecnologias:
-            if tech in texto_lower:
-                encontradas.append(tech.title())
+        # Habilidades da taxonomia, pelo nome de exibição (ex.: "k8s" -> "Kubernetes")
+        taxonomia = obter_taxonomia_padrao()
+        encontradas = [taxonomia.nome_exibicao(chave) for chave in taxonomia.extrair_lista(self.texto_extraido)]
         
         return encontradas[:10]  # Retorna no máximo 10
     
@@ -493,8 +489,11 @@ class Curriculo:
         if not self.tipo_arquivo:
             return {"valido": False, "erro": f"Tipo de arquivo não suportado: {self.nome_arquivo}"}
         
-        # Verifica tamanho do arquivo (max 10MB)
-        tamanho_mb = len(self.arquivo.getvalue()) / (1024 * 1024)
+        # Verifica tamanho do arquivo (max 10MB) sem ler o conteúdo quando possível
+        tamanho_bytes = getattr(self.arquivo, 'size', None)
+        if tamanho_bytes is None:
+            tamanho_bytes = len(self.arquivo.getvalue())
+        tamanho_mb = tamanho_bytes / (1024 * 1024)
         if tamanho_mb > 10:
             return {"valido": False, "erro": f"Arquivo muito grande: {tamanho_mb:.1f}MB (máximo: 10MB)"}
         
@@ -0,0 +1,227 @@
+"""Detecção de currículos quase duplicados com MinHash e LSH"""
+
+import os
+import re
+import zlib
+import hashlib
+import threading
+import unicodedata
+from dataclasses import dataclass, field
+from typing import Dict, Any, List, Optional, Tuple
+import numpy as np
+from modelos import _DATACLASS_SLOTS
+
+# Primo de Mersenne 2^31 - 1: (a * x + b) cabe em int64 para x, a, b < PRIMO
+PRIMO_MINHASH = (1 << 31) - 1
+
+PALAVRA_REGEX = re.compile(r'\w+')
+
+
+def _palavras(texto: str) -> List[str]:
+    texto = unicodedata.normalize("NFKD", texto.lower()).encode("ascii", "ignore").decode("ascii")
+    return PALAVRA_REGEX.findall(texto)
+
+
+@dataclass(**_DATACLASS_SLOTS)
+class AssinaturaCurriculo:
+    """
+    Impressão digital de um currículo e o que já foi calculado para ele: os
+    dados estruturados extraídos pela IA e as avaliações por vaga (hash).
+    """
+
+    id_documento: str
+    hash_exato: str
+    minhash: np.ndarray
+    dados_estruturados: Optional[Dict[str, Any]] = None
+    avaliacoes: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+
+
+class IndiceDuplicatas:
+    """
+    Índice LSH sobre assinaturas MinHash de shingles de palavras.
+
+    A assinatura de K permutações é dividida em bandas; dois currículos caem
+    no mesmo balde de alguma banda com alta probabilidade quando a
+    similaridade de Jaccard é alta. A busca só compara a assinatura com os
+    candidatos desses baldes, sem percorrer o índice inteiro.
+    """
+
+    def __init__(self, limiar: float = 0.85, num_permutacoes: int = 128, bandas: int = 16,
+                 tamanho_shingle: int = 5, semente: int = 1):
+        """
+        Args:
+            limiar (float): Similaridade de Jaccard estimada mínima para considerar duplicata
+            num_permutacoes (int): Tamanho da assinatura MinHash
+            bandas (int): Bandas do LSH (num_permutacoes deve ser múltiplo);
+                16 bandas de 8 linhas separam bem pares acima de ~0,7
+            tamanho_shingle (int): Palavras por shingle
+            semente (int): Semente das permutações (fixa, para assinaturas estáveis)
+        """
+        if num_permutacoes % bandas:
+            raise ValueError("num_permutacoes deve ser múltiplo de bandas")
+
+        self.limiar = limiar
+        self.num_permutacoes = num_permutacoes
+        self.bandas = bandas
+        self.linhas_por_banda = num_permutacoes // bandas
+        self.tamanho_shingle = tamanho_shingle
+
+        gerador = np.random.default_rng(semente)
+        self._a = gerador.integers(1, PRIMO_MINHASH, size=num_permutacoes, dtype=np.int64)
+        self._b = gerador.integers(0, PRIMO_MINHASH, size=num_permutacoes, dtype=np.int64)
+
+        self._assinaturas: Dict[str, AssinaturaCurriculo] = {}
+        self._por_hash_exato: Dict[str, str] = {}
+        self._baldes: List[Dict[bytes, set]] = [{} for _ in range(bandas)]
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._assinaturas)
+
+    def assinar(self, texto: str) -> Tuple[str, np.ndarray]:
+        """
+        Returns:
+            Tuple: Hash do texto normalizado (duplicata exata) e assinatura MinHash
+        """
+        palavras = _palavras(texto or "")
+        hash_exato = hashlib.sha256(" ".join(palavras).encode("utf-8")).hexdigest()
+
+        tamanho = min(self.tamanho_shingle, len(palavras)) or 1
+        shingles = {" ".join(palavras[i:i + tamanho]) for i in range(max(1, len(palavras) - tamanho + 1))}
+        valores = np.fromiter(
+            (zlib.crc32(shingle.encode("utf-8")) % PRIMO_MINHASH for shingle in shingles),
+            dtype=np.int64, count=len(shingles)
+        )
+
+        # Permutações x shingles de uma vez; o mínimo de cada linha é a assinatura
+        minhash = ((self._a[:, None] * valores[None, :] + self._b[:, None]) % PRIMO_MINHASH).min(axis=1)
+        return hash_exato, minhash
+
+    def _chaves_bandas(self, minhash: np.ndarray) -> List[bytes]:
+        return [minhash[banda * self.linhas_por_banda:(banda + 1) * self.linhas_por_banda].tobytes()
+                for banda in range(self.bandas)]
+
+    def _buscar_sem_lock(self, hash_exato: str, minhash: np.ndarray) -> Optional[Tuple[AssinaturaCurriculo, float]]:
+        id_exato = self._por_hash_exato.get(hash_exato)
+        if id_exato is not None:
+            return self._assinaturas[id_exato], 1.0
+
+        candidatos = set()
+        for banda, chave in enumerate(self._chaves_bandas(minhash)):
+            candidatos.update(self._baldes[banda].get(chave, ()))
+
+        melhor, melhor_similaridade = None, 0.0
+        for id_documento in candidatos:
+            registro = self._assinaturas[id_documento]
+            similaridade = float(np.mean(registro.minhash == minhash))
+            if similaridade > melhor_similaridade:
+                melhor, melhor_similaridade = registro, similaridade
+
+        if melhor is None or melhor_similaridade < self.limiar:
+            return None
+        return melhor, melhor_similaridade
+
+    def _remover_sem_lock(self, id_documento: str):
+        registro = self._assinaturas.pop(id_documento, None)
+        if registro is None:
+            return
+
+        if self._por_hash_exato.get(registro.hash_exato) == id_documento:
+            del self._por_hash_exato[registro.hash_exato]
+        for banda, chave in enumerate(self._chaves_bandas(registro.minhash)):
+            balde = self._baldes[banda].get(chave)
+            if balde is not None:
+                balde.discard(id_documento)
+                if not balde:
+                    del self._baldes[banda][chave]
+
+    def verificar_e_adicionar(self, id_documento: str, texto: str) -> Optional[Dict[str, Any]]:
+        """
+        Procura uma duplicata do texto e indexa o currículo.
+
+        Um currículo com o mesmo id e o mesmo conteúdo é a própria duplicata
+        (reenvio do arquivo); com conteúdo diferente, é substituído.
+
+        Returns:
+            Dict: id_documento, similaridade, dados_estruturados e avaliacoes da
+                duplicata mais próxima, ou None se o currículo é inédito
+        """
+        hash_exato, minhash = self.assinar(texto)
+
+        with self._lock:
+            encontrado = self._buscar_sem_lock(hash_exato, minhash)
+            duplicata = None
+            if encontrado is not None:
+                registro, similaridade = encontrado
+                duplicata = {
+                    "id_documento": registro.id_documento,
+                    "similaridade": round(similaridade, 3),
+                    "dados_estruturados": registro.dados_estruturados,
+                    "avaliacoes": dict(registro.avaliacoes)
+                }
+
+            anterior = self._assinaturas.get(id_documento)
+            if anterior is not None and anterior.hash_exato == hash_exato:
+                return duplicata
+
+            self._remover_sem_lock(id_documento)
+            self._assinaturas[id_documento] = AssinaturaCurriculo(id_documento, hash_exato, minhash)
+            self._por_hash_exato.setdefault(hash_exato, id_documento)
+            for banda, chave in enumerate(self._chaves_bandas(minhash)):
+                self._baldes[banda].setdefault(chave, set()).add(id_documento)
+
+        return duplicata
+
+    def registrar_dados(self, id_documento: str, dados_estruturados: Dict[str, Any]):
+        """Guarda os dados extraídos pela IA para reaproveitar em duplicatas."""
+        with self._lock:
+            registro = self._assinaturas.get(id_documento)
+            if registro is not None:
+                registro.dados_estruturados = dados_estruturados
+
+    def registrar_avaliacao(self, id_documento: str, vaga_hash: str, resultado: Dict[str, Any]):
+        """Guarda a avaliação do currículo para a vaga, reaproveitada em duplicatas."""
+        with self._lock:
+            registro = self._assinaturas.get(id_documento)
+            if registro is not None:
+                registro.avaliacoes[vaga_hash] = resultado
+
+    def estatisticas(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"curriculos": len(self._assinaturas), "limiar": self.limiar}
+
+    def limpar(self):
+        with self._lock:
+            self._assinaturas.clear()
+            self._por_hash_exato.clear()
+            self._baldes = [{} for _ in range(self.bandas)]
+
+
+_indice_padrao = None
+_indice_padrao_lock = threading.Lock()
+
+
+def obter_indice_duplicatas_padrao() -> Optional[IndiceDuplicatas]:
+    """
+    Retorna o índice de duplicatas compartilhado pelo processo, configurado pelo .env.
+
+    Variável: DEDUPLICACAO_LIMIAR (similaridade mínima, padrão 0.85; 0 desativa).
+
+    Returns:
+        IndiceDuplicatas: Índice compartilhado, ou None se desativado
+    """
+    global _indice_padrao
+
+    with _indice_padrao_lock:
+        if _indice_padrao is None:
+            try:
+                limiar = float(os.getenv('DEDUPLICACAO_LIMIAR', '0.85'))
+            except ValueError:
+                print("⚠️ DEDUPLICACAO_LIMIAR inválido, usando 0.85")
+                limiar = 0.85
+
+            if limiar <= 0:
+                return None
+            _indice_padrao = IndiceDuplicatas(limiar=min(1.0, limiar))
+
+        return _indice_padrao
@@ -0,0 +1,279 @@
+"""Esquemas das respostas estruturadas pedidas ao Gemini e validação do JSON recebido"""
+
+import json
+from typing import Dict, Any, Optional, Iterable
+
+# Os esquemas seguem o subconjunto de OpenAPI aceito em response_schema.
+# property_ordering fixa a ordem dos campos na resposta, o que mantém o
+# score em primeiro lugar no streaming da avaliação.
+
+
+def _texto(descricao: Optional[str] = None) -> Dict[str, Any]:
+    esquema = {"type": "STRING"}
+    if descricao:
+        esquema["description"] = descricao
+    return esquema
+
+
+def _inteiro(nulo: bool = False) -> Dict[str, Any]:
+    return {"type": "INTEGER", "nullable": True} if nulo else {"type": "INTEGER"}
+
+
+def _numero(nulo: bool = False) -> Dict[str, Any]:
+    return {"type": "NUMBER", "nullable": True} if nulo else {"type": "NUMBER"}
+
+
+def _booleano() -> Dict[str, Any]:
+    return {"type": "BOOLEAN"}
+
+
+def _lista(itens: Dict[str, Any]) -> Dict[str, Any]:
+    return {"type": "ARRAY", "items": itens}
+
+
+def _objeto(propriedades: Dict[str, Dict[str, Any]], opcionais: Iterable[str] = ()) -> Dict[str, Any]:
+    """Objeto com todas as propriedades obrigatórias, exceto as opcionais."""
+    opcionais = set(opcionais)
+    return {
+        "type": "OBJECT",
+        "properties": propriedades,
+        "required": [campo for campo in propriedades if campo not in opcionais],
+        "property_ordering": list(propriedades)
+    }
+
+
+NAO_IDENTIFICADO = "Use \"Não identificado\" se a informação não constar no currículo"
+
+ESQUEMA_DADOS_BASICOS = _objeto({
+    "nome_completo": _texto(NAO_IDENTIFICADO),
+    "email": _texto(NAO_IDENTIFICADO),
+    "telefone": _texto(NAO_IDENTIFICADO),
+    "endereco": _texto("Cidade, Estado ou \"Não identificado\""),
+    "linkedin": _texto(NAO_IDENTIFICADO),
+    "github": _texto(NAO_IDENTIFICADO),
+    "site_pessoal": _texto(NAO_IDENTIFICADO),
+    "idade_estimada": _inteiro(nulo=True),
+    "nacionalidade": _texto(NAO_IDENTIFICADO)
+}, opcionais=("idade_estimada",))
+
+ESQUEMA_EXPERIENCIAS = _objeto({
+    "experiencias": _lista(_objeto({
+        "empresa": _texto(),
+        "cargo": _texto(),
+        "periodo": _texto("MM/AAAA - MM/AAAA ou atual"),
+        "duracao_meses": _inteiro(nulo=True),
+        "principais_responsabilidades": _lista(_texto()),
+        "tecnologias_utilizadas": _lista(_texto()),
+        "conquistas_quantificadas": _lista(_texto()),
+        "nivel_senioridade": _texto("Junior, Pleno, Senior ou Lead")
+    }, opcionais=("duracao_meses",))),
+    "tempo_total_experiencia_anos": _numero(),
+    "areas_de_atuacao": _lista(_texto()),
+    "tipos_empresa": _lista(_texto()),
+    "progressao_carreira": _texto("Crescente, Estável ou Lateral")
+})
+
+ESQUEMA_HABILIDADES = _objeto({
+    "linguagens_programacao": _lista(_texto()),
+    "frameworks_bibliotecas": _lista(_texto()),
+    "bancos_dados": _lista(_texto()),
+    "ferramentas_devops": _lista(_texto()),
+    "cloud_platforms": _lista(_texto()),
+    "metodologias": _lista(_texto()),
+    "soft_skills": _lista(_texto()),
+    "idiomas": _lista(_objeto({
+        "idioma": _texto(),
+        "nivel": _texto("Avançado, Intermediário ou Básico")
+    })),
+    "certificacoes_tecnicas": _lista(_texto()),
+    "nivel_tecnico_geral": _texto("Junior, Pleno, Senior ou Especialista"),
+    "especializacoes": _lista(_texto())
+})
+
+ESQUEMA_FORMACAO = _objeto({
+    "formacao_superior": _lista(_objeto({
+        "curso": _texto(),
+        "instituicao": _texto(),
+        "periodo": _texto(),
+        "status": _texto("Completo ou Cursando"),
+        "nivel": _texto("Graduação, Pós-graduação, MBA, Mestrado ou Doutorado")
+    })),
+    "certificacoes": _lista(_objeto({
+        "nome": _texto(),
+        "instituicao": _texto(),
+        "ano_obtencao": _texto(),
+        "validade": _texto("Ano de validade ou N/A")
+    })),
+    "cursos_complementares": _lista(_objeto({
+        "nome": _texto(),
+        "instituicao": _texto(),
+        "carga_horaria": _texto(),
+        "ano": _texto()
+    })),
+    "nivel_educacional": _texto(),
+    "area_formacao": _texto(),
+    "educacao_continuada": _booleano()
+})
+
+ESQUEMA_PROJETOS = _objeto({
+    "projetos_destaque": _lista(_objeto({
+        "nome": _texto(),
+        "descricao": _texto(),
+        "tecnologias": _lista(_texto()),
+        "periodo": _texto(),
+        "resultado_impacto": _texto(),
+        "papel": _texto()
+    })),
+    "conquistas_quantificadas": _lista(_texto()),
+    "reconhecimentos": _lista(_texto()),
+    "contribuicoes_open_source": _lista(_objeto({
+        "projeto": _texto(),
+        "descricao": _texto(),
+        "url": _texto()
+    })),
+    "publicacoes_artigos": _lista(_texto()),
+    "palestras_eventos": _lista(_texto())
+})
+
+ESQUEMA_CONSOLIDADO = _objeto({
+    "dados_pessoais": ESQUEMA_DADOS_BASICOS,
+    "experiencia_profissional": ESQUEMA_EXPERIENCIAS,
+    "habilidades_competencias": ESQUEMA_HABILIDADES,
+    "formacao_educacao": ESQUEMA_FORMACAO,
+    "projetos_conquistas": ESQUEMA_PROJETOS
+})
+
+# Tipo de extração (passada) -> esquema da resposta
+ESQUEMAS_EXTRACAO = {
+    "dados_basicos": ESQUEMA_DADOS_BASICOS,
+    "experiencias": ESQUEMA_EXPERIENCIAS,
+    "habilidades": ESQUEMA_HABILIDADES,
+    "formacao": ESQUEMA_FORMACAO,
+    "projetos": ESQUEMA_PROJETOS,
+    "consolidada": ESQUEMA_CONSOLIDADO
+}
+
+ESQUEMA_AVALIACAO = _objeto({
+    "score": _inteiro(),
+    "score_detalhado": _objeto({
+        "tecnico": _inteiro(),
+        "experiencia": _inteiro(),
+        "formacao": _inteiro(),
+        "comportamental": _inteiro()
+    }),
+    "pontos_fortes": _lista(_texto()),
+    "pontos_fracos": _lista(_texto()),
+    "avaliacao_detalhada": _texto(),
+    "nome_candidato": _texto(),
+    "principais_habilidades": _lista(_texto()),
+    "email_candidato": _texto(),
+    "telefone_candidato": _texto(),
+    "experiencia_anos": _numero(nulo=True),
+    "nivel_senioridade": _texto(),
+    "recomendacao_contratacao": _texto(),
+    "compatibilidade_vaga": _inteiro(),
+    "risk_assessment": _texto(),
+    "proximos_passos": _lista(_texto())
+}, opcionais=("experiencia_anos",))
+
+
+def configuracao_json(esquema: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Parâmetros de geração que restringem a resposta a JSON no formato do esquema.
+    """
+    return {
+        "response_mime_type": "application/json",
+        "response_schema": esquema
+    }
+
+
+def validar_resposta(dados: Any, esquema: Dict[str, Any], caminho: str = "resposta") -> Any:
+    """
+    Confere o JSON decodificado contra o esquema, numa única passada.
+
+    Campos fora do esquema são mantidos como vieram; inteiros enviados como
+    número com parte decimal zero (ex.: 75.0) são convertidos.
+
+    Returns:
+        Os dados validados
+
+    Raises:
+        ValueError: Tipo divergente ou campo obrigatório ausente, indicando o caminho
+    """
+    if dados is None:
+        if esquema.get("nullable"):
+            return None
+        raise ValueError(f"{caminho}: valor ausente")
+
+    tipo = esquema["type"]
+
+    if tipo == "OBJECT":
+        if not isinstance(dados, dict):
+            raise ValueError(f"{caminho}: esperado objeto")
+        faltando = [campo for campo in esquema.get("required", []) if campo not in dados]
+        if faltando:
+            raise ValueError(f"{caminho}: campos obrigatórios ausentes: {', '.join(faltando)}")
+
+        propriedades = esquema.get("properties", {})
+        return {
+            campo: validar_resposta(valor, propriedades[campo], f"{caminho}.{campo}")
+            if campo in propriedades else valor
+            for campo, valor in dados.items()
+        }
+
+    if tipo == "ARRAY":
+        if not isinstance(dados, list):
+            raise ValueError(f"{caminho}: esperado lista")
+        return [validar_resposta(item, esquema["items"], f"{caminho}[{indice}]")
+                for indice, item in enumerate(dados)]
+
+    if tipo == "STRING":
+        if not isinstance(dados, str):
+            raise ValueError(f"{caminho}: esperado texto")
+        return dados
+
+    if tipo == "BOOLEAN":
+        if not isinstance(dados, bool):
+            raise ValueError(f"{caminho}: esperado booleano")
+        return dados
+
+    if isinstance(dados, bool) or not isinstance(dados, (int, float)):
+        raise ValueError(f"{caminho}: esperado número")
+
+    if tipo == "INTEGER":
+        if isinstance(dados, float):
+            if not dados.is_integer():
+                raise ValueError(f"{caminho}: esperado inteiro")
+            return int(dados)
+
+    return dados
+
+
+def decodificar_resposta(texto: str) -> Dict[str, Any]:
+    """
+    Decodifica a resposta em modo JSON sem validar os campos.
+
+    Raises:
+        ValueError: Resposta vazia, JSON inválido ou que não seja um objeto
+    """
+    if not texto or not texto.strip():
+        raise ValueError("Resposta vazia da API Gemini")
+
+    try:
+        dados = json.loads(texto)
+    except json.JSONDecodeError as e:
+        raise ValueError(f"Resposta JSON inválida: {e}") from e
+
+    if not isinstance(dados, dict):
+        raise ValueError("resposta: esperado objeto")
+    return dados
+
+
+def interpretar_resposta(texto: str, esquema: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Decodifica a resposta em modo JSON e valida contra o esquema.
+
+    Raises:
+        ValueError: Resposta vazia, JSON inválido ou fora do esquema
+    """
+    return validar_resposta(decodificar_resposta(texto), esquema)
@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+Execução em lote pela linha de comando, sem Streamlit.
+
+Exemplos:
+    python executar_lote.py curriculos/ --requisitos vaga.txt
+    python executar_lote.py "curriculos/**/*.pdf" --requisitos vaga.txt --workers 8 \\
+        --jsonl resultados.jsonl --csv ranking.csv
+    python executar_lote.py curriculos/ --requisitos vaga.txt --cascata --limiar-cascata 60 --top-k 20
+"""
+
+import os
+import sys
+import csv
+import json
+import argparse
+from datetime import datetime
+
+
+def _criar_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description="Avalia em lote currículos PDF/DOCX contra os requisitos de uma vaga."
+    )
+    parser.add_argument(
+        "origem", nargs="+",
+        help="Pasta, arquivo ZIP, padrão glob (entre aspas) ou arquivos de currículo"
+    )
+    parser.add_argument(
+        "-r", "--requisitos", required=True,
+        help="Arquivo de texto com os requisitos da vaga"
+    )
+    parser.add_argument(
+        "-w", "--workers", type=int, default=4,
+        help="Número de currículos processados em paralelo (padrão: 4)"
+    )
+    parser.add_argument(
+        "-p", "--processos", type=int, default=None,
+        help="Processos para extração de texto dos PDF/DOCX (padrão: número de CPUs)"
+    )
+    parser.add_argument(
+        "--timeout-documento", type=float, default=60,
+        help="Tempo máximo, em segundos, para extrair o texto de um documento (padrão: 60)"
+    )
+    parser.add_argument(
+        "--jsonl",
+        help="Arquivo JSONL com o resultado completo de cada currículo "
+             "(padrão: resultados_lote_<data>.jsonl)"
+    )
+    parser.add_argument(
+        "--csv",
+        help="Arquivo CSV com uma linha resumida por currículo"
+    )
+    parser.add_argument(
+        "--cascata", action="store_true",
+        help="Triagem local (sem IA) de todos os currículos antes da avaliação com IA"
+    )
+    parser.add_argument(
+        "--limiar-cascata", type=int, default=None,
+        help="Compatibilidade local mínima para seguir à IA no modo cascata (padrão: 50)"
+    )
+    parser.add_argument(
+        "--top-k", type=int, default=None,
+        help="No modo cascata, envia à IA os K melhores da triagem mesmo abaixo do limiar"
+    )
+    return parser
+
+
+def _ler_requisitos(caminho: str) -> str:
+    with open(caminho, "r", encoding="utf-8") as arquivo:
+        return arquivo.read()
+
+
+def main(argv=None) -> int:
+    """
+    Ponto de entrada da linha de comando.
+
+    Returns:
+        int: Código de saída (0 se ao menos um currículo foi avaliado)
+    """
+    args = _criar_parser().parse_args(argv)
+
+    try:
+        requisitos_vaga = _ler_requisitos(args.requisitos)
+    except OSError as e:
+        print(f"❌ Não foi possível ler os requisitos: {e}", file=sys.stderr)
+        return 2
+
+    if len(requisitos_vaga.strip()) < 20:
+        print("❌ Requisitos da vaga muito curtos ou vazios (mínimo: 20 caracteres)", file=sys.stderr)
+        return 2
+
+    from arquivo_local import coletar_arquivos
+    from sistema import SistemaRecrutamento
+    from uso_tokens import RegistroUsoTokens
+
+    arquivos = coletar_arquivos(args.origem)
+    if not arquivos:
+        print("❌ Nenhum currículo PDF/DOCX encontrado", file=sys.stderr)
+        return 2
+
+    caminho_jsonl = args.jsonl
+    if not caminho_jsonl and not args.csv:
+        caminho_jsonl = f"resultados_lote_{datetime.now().strftime('%Y%m%d_%H%M%S')}.jsonl"
+
+    sistema = SistemaRecrutamento()
+    status = sistema.obter_status_sistema()
+    if not status.get("gemini_conectado"):
+        print("⚠️ Gemini não conectado: as avaliações usarão o fallback local", file=sys.stderr)
+
+    total = len(arquivos)
+    print(f"🚀 Avaliando {total} currículo(s) com {args.workers} worker(s)", file=sys.stderr)
+
+    arquivo_jsonl = open(caminho_jsonl, "w", encoding="utf-8") if caminho_jsonl else None
+    arquivo_csv = open(args.csv, "w", encoding="utf-8-sig", newline="") if args.csv else None
+    escritor_csv = None
+    concluidos = 0
+    sucessos = 0
+    registro_uso = RegistroUsoTokens()
+
+    try:
+        limiar_cascata = args.limiar_cascata
+        if limiar_cascata is None:
+            limiar_cascata = sistema.LIMIAR_CASCATA_PADRAO
+
+        for resultado in sistema.processar_lote_iter(arquivos, requisitos_vaga, args.workers,
+                                                     args.processos, args.timeout_documento,
+                                                     registro_uso=registro_uso,
+                                                     modo_cascata=args.cascata,
+                                                     limiar_cascata=limiar_cascata,
+                                                     top_k_cascata=args.top_k):
+            concluidos += 1
+            sucessos += 1 if resultado["sucesso"] else 0
+
+            # Grava cada resultado assim que fica pronto para não perder progresso
+            if arquivo_jsonl:
+                arquivo_jsonl.write(json.dumps(resultado, ensure_ascii=False, default=str) + "\n")
+                arquivo_jsonl.flush()
+
+            if arquivo_csv:
+                linha = sistema.resumir_resultado_lote(resultado)
+                if escritor_csv is None:
+                    escritor_csv = csv.DictWriter(arquivo_csv, fieldnames=list(linha.keys()))
+                    escritor_csv.writeheader()
+                escritor_csv.writerow(linha)
+                arquivo_csv.flush()
+
+            if resultado["sucesso"] and resultado.get("nivel_cascata") == sistema.NIVEL_TRIAGEM_LOCAL:
+                detalhe = f"parou na triagem local (compatibilidade {resultado['score_triagem']})"
+            elif resultado["sucesso"]:
+                detalhe = f"score {resultado['resultado'].get('score', 0)}"
+            else:
+                detalhe = f"erro: {resultado.get('erro', 'desconhecido')}"
+            print(f"[{concluidos}/{total}] {resultado['nome_arquivo']} - {detalhe}", file=sys.stderr)
+
+    except KeyboardInterrupt:
+        print("\n⚠️ Interrompido: resultados já concluídos foram gravados", file=sys.stderr)
+        return 130
+
+    finally:
+        if arquivo_jsonl:
+            arquivo_jsonl.close()
+        if arquivo_csv:
+            arquivo_csv.close()
+
+    print(f"✅ {sucessos}/{total} currículo(s) avaliado(s)", file=sys.stderr)
+    
+    uso = registro_uso.para_dict()
+    totais = uso["total"]
+    print(f"🔢 Tokens: {totais['tokens_entrada']} de entrada, {totais['tokens_saida']} de saída "
+          f"({totais['tokens_total'] // max(1, concluidos)} por currículo; "
+          f"{totais['respostas_cache']} resposta(s) do cache)", file=sys.stderr)
+    if uso["custo_estimado_usd"] is not None:
+        print(f"💲 Custo estimado: US$ {uso['custo_estimado_usd']:.4f}", file=sys.stderr)
+    for caminho in (caminho_jsonl, args.csv):
+        if caminho:
+            print(f"📄 Resultados em: {os.path.abspath(caminho)}", file=sys.stderr)
+
+    return 0 if sucessos else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
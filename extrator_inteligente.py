@@ -2,58 +2,112 @@
 """Extrator Inteligente de Dados de Currículos usando IA"""
 
 import os
-import json
 import re
-from typing import Dict, Any, List, Optional
-from dotenv import load_dotenv
-from google import genai
-from google.genai import types
+import contextvars
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, Any, List, Optional, Callable, Tuple
+from clientes_gemini import carregar_ambiente, obter_cliente_gemini
+from cache_persistente import CachePersistente, obter_cache_padrao
+from uso_tokens import registrar_resposta_cache
+from rastreamento import medir_etapa
+from padroes_texto import EMAIL_REGEX, TELEFONE_REGEX, obter_motor_padrao
+from esquemas_resposta import (
+    ESQUEMAS_EXTRACAO, configuracao_json, decodificar_resposta, interpretar_resposta, validar_resposta
+)
 
 class ExtratorInteligente:
     
-    def __init__(self):
-        load_dotenv()
-        api_key = os.getenv('GEMINI_API_KEY')
+    MODELO_IA = "gemini-2.0-flash-exp"
+    
+    # Incrementar ao alterar qualquer prompt de extração para invalidar o cache persistente
+    VERSAO_PROMPT = "extracao-v1"
+    
+    MODOS_EXECUCAO = ("sequencial", "concorrente")
+    ESTRATEGIAS = ("cinco_passadas", "consolidada")
+    
+    # Seção da resposta consolidada -> tipo de extração da passada equivalente
+    SECOES_CONSOLIDADAS = {
+        "dados_pessoais": "dados_basicos",
+        "experiencia_profissional": "experiencias",
+        "habilidades_competencias": "habilidades",
+        "formacao_educacao": "formacao",
+        "projetos_conquistas": "projetos"
+    }
+    
+    # Descrição de cada passada nos eventos de progresso
+    DESCRICOES_PASSADAS = {
+        "dados_basicos": "Dados pessoais",
+        "experiencias": "Experiência profissional",
+        "habilidades": "Habilidades e competências",
+        "formacao": "Formação e certificações",
+        "projetos": "Projetos e conquistas",
+        "consolidada": "Extração consolidada"
+    }
+    
+    def __init__(self, modo_execucao: str = "concorrente", max_workers: int = 5,
+                 estrategia: Optional[str] = None):
+        """
+        Inicializa o extrator.
+        
+        Args:
+            modo_execucao (str): "sequencial" executa as cinco passadas uma após a outra;
+                "concorrente" dispara as passadas em paralelo num pool de threads limitado
+            max_workers (int): Número máximo de passadas simultâneas no modo concorrente
+            estrategia (str): "cinco_passadas" faz uma requisição por seção;
+                "consolidada" pede as cinco seções numa única requisição. Se omitida,
+                usa ESTRATEGIA_EXTRACAO do .env (padrão: "cinco_passadas")
+        """
+        carregar_ambiente()
         
-        if not api_key:
-            raise ValueError("GEMINI_API_KEY não encontrada no arquivo .env")
+        if estrategia is None:
+            estrategia = os.getenv('ESTRATEGIA_EXTRACAO', 'cinco_passadas')
         
-        self.client = genai.Client(api_key=api_key)
-        self.dados_extraidos_cache = {}
+        if modo_execucao not in self.MODOS_EXECUCAO:
+            raise ValueError(f"Modo de execução inválido: {modo_execucao}")
+        
+        if estrategia not in self.ESTRATEGIAS:
+            raise ValueError(f"Estratégia de extração inválida: {estrategia}")
+        
+        self.modo_execucao = modo_execucao
+        self.estrategia = estrategia
+        self.max_workers = max(1, max_workers)
+        
+        # Cliente compartilhado pelo processo (conexões reaproveitadas entre currículos)
+        self.cliente_gemini = obter_cliente_gemini()
+        self.cache_persistente = obter_cache_padrao()
     
-    def extrair_dados_completos(self, texto_curriculo: str) -> Dict[str, Any]:
+    def extrair_dados_completos(self, texto_curriculo: str,
+                                callback_progresso: Optional[Callable[[Dict[str, Any]], None]] = None) -> Dict[str, Any]:
         """
         Extrai todos os dados possíveis do currículo usando IA avançada.
         
         Args:
             texto_curriculo (str): Texto completo do currículo
+            callback_progresso (Callable): Chamado, na thread que chamou este método,
+                a cada passada concluída com {"etapa", "descricao", "concluidas", "total"}
             
         Returns:
             Dict: Dados estruturados extraídos com máxima completude
         """
         try:
-            # Primeira passada: Extração de dados básicos estruturados
-            dados_basicos = self._extrair_dados_basicos(texto_curriculo)
-            
-            # Segunda passada: Extração de experiências detalhadas
-            experiencias = self._extrair_experiencias_detalhadas(texto_curriculo)
-            
-            # Terceira passada: Extração de habilidades e competências
-            habilidades = self._extrair_habilidades_completas(texto_curriculo)
-            
-            # Quarta passada: Extração de formação e certificações
-            formacao = self._extrair_formacao_certificacoes(texto_curriculo)
-            
-            # Quinta passada: Análise de projetos e conquistas
-            projetos = self._extrair_projetos_conquistas(texto_curriculo)
+            # Executa as cinco passadas (em série ou em paralelo) ou a requisição única
+            if self.estrategia == "consolidada":
+                resultados = self._executar_consolidada(texto_curriculo, callback_progresso)
+            else:
+                resultados = self._executar_passadas(texto_curriculo, callback_progresso)
             
             # Combina todos os resultados
             resultado_completo = self._combinar_resultados(
-                dados_basicos, experiencias, habilidades, formacao, projetos
+                resultados["dados_basicos"],
+                resultados["experiencias"],
+                resultados["habilidades"],
+                resultados["formacao"],
+                resultados["projetos"]
             )
             
             # Validação e enriquecimento final
-            resultado_validado = self._validar_e_enriquecer(resultado_completo, texto_curriculo)
+            with medir_etapa("extrator.validacao"):
+                resultado_validado = self._validar_e_enriquecer(resultado_completo, texto_curriculo)
             
             return resultado_validado
             
@@ -61,6 +115,216 @@ class ExtratorInteligente:
             # Em caso de falha, retorna extração básica usando regex
             return self._extracao_fallback(texto_curriculo, str(e))
     
+    def _obter_passadas(self) -> List[Tuple[str, Callable[[str], Dict[str, Any]]]]:
+        """
+        Retorna as cinco passadas de extração na ordem original, com o tipo de cada uma.
+        """
+        return [
+            ("dados_basicos", self._extrair_dados_basicos),
+            ("experiencias", self._extrair_experiencias_detalhadas),
+            ("habilidades", self._extrair_habilidades_completas),
+            ("formacao", self._extrair_formacao_certificacoes),
+            ("projetos", self._extrair_projetos_conquistas)
+        ]
+    
+    def _notificar_passada(self, callback_progresso: Optional[Callable[[Dict[str, Any]], None]],
+                           tipo: str, concluidas: int, total: int):
+        """Informa ao callback a conclusão de uma passada; erros do callback não afetam a extração."""
+        if not callback_progresso:
+            return
+        
+        try:
+            callback_progresso({
+                "etapa": f"extrator.{tipo}",
+                "descricao": f"{self.DESCRICOES_PASSADAS.get(tipo, tipo)} extraído(s)",
+                "concluidas": concluidas,
+                "total": total
+            })
+        except Exception as e:
+            print(f"⚠️ Erro no callback de progresso: {e}")
+    
+    def _executar_passadas(self, texto: str,
+                           callback_progresso: Optional[Callable[[Dict[str, Any]], None]] = None) -> Dict[str, Dict[str, Any]]:
+        """
+        Executa as passadas de extração conforme o modo configurado.
+        
+        No modo concorrente, cada passada é submetida a um pool de threads limitado
+        por max_workers e os resultados são coletados à medida que terminam. Uma
+        passada que falhar recebe o fallback do seu tipo sem afetar as demais.
+        O callback de progresso é sempre chamado na thread de quem chamou.
+        
+        Returns:
+            Dict: Resultado de cada passada indexado pelo tipo de extração
+        """
+        passadas = self._obter_passadas()
+        total = len(passadas)
+        
+        if self.modo_execucao == "sequencial":
+            resultados = {}
+            for tipo, metodo in passadas:
+                resultados[tipo] = self._executar_passada(tipo, metodo, texto)
+                self._notificar_passada(callback_progresso, tipo, len(resultados), total)
+            return resultados
+        
+        resultados = {}
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(passadas))) as executor:
+            # Cada passada roda numa cópia do contexto atual para herdar a prioridade das requisições
+            futuros = {
+                executor.submit(contextvars.copy_context().run, self._executar_passada, tipo, metodo, texto): tipo
+                for tipo, metodo in passadas
+            }
+            
+            for futuro in as_completed(futuros):
+                tipo = futuros[futuro]
+                try:
+                    resultados[tipo] = futuro.result()
+                except Exception as e:
+                    print(f"Erro na extração {tipo}: {e}")
+                    resultados[tipo] = self._resultado_fallback_por_tipo(tipo)
+                
+                self._notificar_passada(callback_progresso, tipo, len(resultados), total)
+        
+        return resultados
+    
+    def _executar_passada(self, tipo: str, metodo: Callable[[str], Dict[str, Any]],
+                          texto: str) -> Dict[str, Any]:
+        """Executa uma passada cronometrada no rastreamento ativo."""
+        with medir_etapa(f"extrator.{tipo}"):
+            return metodo(texto)
+    
+    def _executar_consolidada(self, texto: str,
+                              callback_progresso: Optional[Callable[[Dict[str, Any]], None]] = None) -> Dict[str, Dict[str, Any]]:
+        """
+        Extrai as cinco seções numa única requisição.
+        
+        Cada seção é validada contra o esquema da passada equivalente; só as
+        ausentes ou inválidas recebem o fallback do tipo, mantendo o mesmo
+        formato da estratégia de cinco passadas.
+        
+        Returns:
+            Dict: Resultado de cada seção indexado pelo tipo de extração
+        """
+        with medir_etapa("extrator.consolidada"):
+            resposta = self._extrair_consolidado(texto)
+        self._notificar_passada(callback_progresso, "consolidada", 1, 1)
+        
+        resultados = {}
+        for secao, tipo in self.SECOES_CONSOLIDADAS.items():
+            try:
+                resultados[tipo] = validar_resposta(resposta.get(secao), ESQUEMAS_EXTRACAO[tipo], secao)
+            except ValueError as e:
+                print(f"Seção {secao} inválida na extração consolidada ({e}), usando fallback")
+                resultados[tipo] = self._resultado_fallback_por_tipo(tipo)
+        
+        return resultados
+    
+    def _extrair_consolidado(self, texto: str) -> Dict[str, Any]:
+        """
+        Passada única: extrai todas as seções do currículo numa só resposta.
+        """
+        prompt = f"""
+Você é um especialista em análise de currículos e RH. Extraia TODOS os dados deste currículo com MÁXIMA PRECISÃO, organizados nas cinco seções abaixo.
+
+CURRÍCULO:
+{texto[:3000]}
+
+INSTRUÇÕES CRÍTICAS:
+1. Seja EXTREMAMENTE preciso - não invente informações
+2. Se não encontrar algo, use "Não identificado" ou lista vazia
+3. Liste TODAS as experiências, habilidades, formações, certificações e projetos
+4. Identifique períodos, tecnologias utilizadas e conquistas quantificadas
+5. Calcule o tempo total de experiência em anos
+6. Preencha SEMPRE as cinco seções, mesmo que com valores vazios
+
+RESPOSTA EM JSON PURO (SEM MARKDOWN):
+{{
+    "dados_pessoais": {{
+        "nome_completo": "Nome completo identificado ou Não identificado",
+        "email": "email@exemplo.com ou Não identificado",
+        "telefone": "(11) 99999-9999 ou Não identificado",
+        "endereco": "Cidade, Estado ou Não identificado",
+        "linkedin": "URL do LinkedIn ou Não identificado",
+        "github": "URL do GitHub ou Não identificado",
+        "site_pessoal": "URL do site ou Não identificado",
+        "idade_estimada": 25,
+        "nacionalidade": "Brasileira ou Não identificado"
+    }},
+    "experiencia_profissional": {{
+        "experiencias": [
+            {{
+                "empresa": "Nome da empresa",
+                "cargo": "Título do cargo",
+                "periodo": "MM/AAAA - MM/AAAA ou atual",
+                "duracao_meses": 24,
+                "principais_responsabilidades": ["Responsabilidade 1"],
+                "tecnologias_utilizadas": ["Python", "AWS"],
+                "conquistas_quantificadas": ["Aumentou vendas em 20%"],
+                "nivel_senioridade": "Junior/Pleno/Senior/Lead"
+            }}
+        ],
+        "tempo_total_experiencia_anos": 5.5,
+        "areas_de_atuacao": ["Desenvolvimento"],
+        "tipos_empresa": ["Startup", "Multinacional"],
+        "progressao_carreira": "Crescente/Estável/Lateral"
+    }},
+    "habilidades_competencias": {{
+        "linguagens_programacao": ["Python", "JavaScript"],
+        "frameworks_bibliotecas": ["React", "Django"],
+        "bancos_dados": ["PostgreSQL"],
+        "ferramentas_devops": ["Docker"],
+        "cloud_platforms": ["AWS"],
+        "metodologias": ["Scrum"],
+        "soft_skills": ["Liderança"],
+        "idiomas": [{{"idioma": "Inglês", "nivel": "Avançado/Intermediário/Básico"}}],
+        "certificacoes_tecnicas": ["AWS Solutions Architect"],
+        "nivel_tecnico_geral": "Junior/Pleno/Senior/Especialista",
+        "especializacoes": ["Machine Learning"]
+    }},
+    "formacao_educacao": {{
+        "formacao_superior": [
+            {{
+                "curso": "Ciência da Computação",
+                "instituicao": "Universidade X",
+                "periodo": "2018-2022",
+                "status": "Completo/Cursando",
+                "nivel": "Graduação/Pós-graduação/MBA/Mestrado/Doutorado"
+            }}
+        ],
+        "certificacoes": [
+            {{"nome": "AWS Solutions Architect", "instituicao": "Amazon", "ano_obtencao": "2023", "validade": "2026 ou N/A"}}
+        ],
+        "cursos_complementares": [
+            {{"nome": "Machine Learning", "instituicao": "Coursera", "carga_horaria": "40h", "ano": "2023"}}
+        ],
+        "nivel_educacional": "Ensino Superior/Pós-graduação/Mestrado/Doutorado",
+        "area_formacao": "Tecnologia/Engenharia/Administração",
+        "educacao_continuada": true
+    }},
+    "projetos_conquistas": {{
+        "projetos_destaque": [
+            {{
+                "nome": "Sistema de E-commerce",
+                "descricao": "Plataforma completa de vendas online",
+                "tecnologias": ["Python", "React"],
+                "periodo": "6 meses",
+                "resultado_impacto": "Aumentou vendas em 30%",
+                "papel": "Desenvolvedor Full Stack"
+            }}
+        ],
+        "conquistas_quantificadas": ["Reduziu tempo de processamento em 40%"],
+        "reconhecimentos": ["Melhor projeto inovador - Hackathon 2022"],
+        "contribuicoes_open_source": [
+            {{"projeto": "Nome do projeto", "descricao": "Contribuição realizada", "url": "GitHub URL"}}
+        ],
+        "publicacoes_artigos": ["Artigo sobre IA"],
+        "palestras_eventos": ["Tech Talk sobre Python"]
+    }}
+}}
+"""
+        
+        # A resposta única carrega as cinco seções, por isso precisa de mais tokens de saída
+        return self._fazer_requisicao_ia(prompt, "consolidada", max_output_tokens=8192)
+    
     def _extrair_dados_basicos(self, texto: str) -> Dict[str, Any]:
         """
         Primeira passada: extrai dados básicos de identificação.
@@ -273,49 +537,54 @@ RESPOSTA EM JSON PURO:
         
         return self._fazer_requisicao_ia(prompt, "projetos")
     
-    def _fazer_requisicao_ia(self, prompt: str, tipo_extracao: str) -> Dict[str, Any]:
+    def _fazer_requisicao_ia(self, prompt: str, tipo_extracao: str,
+                             max_output_tokens: int = 2048) -> Dict[str, Any]:
         """
         Executa requisição para a IA com tratamento de erros.
-        """
+        
+        Respostas válidas são gravadas no cache persistente, endereçado pelo
+        prompt (que contém o texto do currículo), versão do template, modelo e
+        configuração de geração. Fallbacks nunca são armazenados.
+        """
+        parametros_geracao = {
+            "temperature": 0.1,  # Baixa temperatura para máxima precisão
+            "top_p": 0.8,
+            "top_k": 40,
+            "max_output_tokens": max_output_tokens,
+            # Saída restrita ao esquema da passada: a resposta já chega como JSON válido
+            **configuracao_json(ESQUEMAS_EXTRACAO[tipo_extracao])
+        }
+        
+        chave_cache = None
+        if self.cache_persistente:
+            chave_cache = CachePersistente.gerar_chave(
+                f"extracao:{tipo_extracao}", prompt, self.VERSAO_PROMPT,
+                self.MODELO_IA, parametros_geracao
+            )
+            resultado_cache = self.cache_persistente.obter(chave_cache)
+            if resultado_cache is not None:
+                registrar_resposta_cache(f"extracao:{tipo_extracao}")
+                return resultado_cache
+        
         try:
-            response = self.client.models.generate_content(
-                model="gemini-2.0-flash-exp",
-                contents=prompt,
-                config=types.GenerateContentConfig(
-                    temperature=0.1,  # Baixa temperatura para máxima precisão
-                    top_p=0.8,
-                    top_k=40,
-                    max_output_tokens=2048
-                )
+            response = self.cliente_gemini.gerar_conteudo(
+                self.MODELO_IA, prompt, parametros_geracao, etapa=f"extracao:{tipo_extracao}"
             )
             
-            if not response or not response.text:
-                raise ValueError("Resposta vazia da API")
-            
-            # Extrai JSON da resposta
-            response_text = response.text.strip()
-            
-            # Remove markdown se presente
-            if "```json" in response_text:
-                json_start = response_text.find("```json") + 7
-                json_end = response_text.find("```", json_start)
-                response_text = response_text[json_start:json_end].strip()
-            elif "```" in response_text:
-                json_start = response_text.find("```") + 3
-                json_end = response_text.find("```", json_start)
-                response_text = response_text[json_start:json_end].strip()
-            
-            # Parse JSON
-            resultado = json.loads(response_text)
+            texto_resposta = response.text if response else None
+            if tipo_extracao == "consolidada":
+                # As seções são validadas uma a uma em _executar_consolidada: um campo
+                # inválido numa seção não deve descartar as outras quatro
+                resultado = decodificar_resposta(texto_resposta)
+            else:
+                resultado = interpretar_resposta(texto_resposta, ESQUEMAS_EXTRACAO[tipo_extracao])
             
             # Cache do resultado
-            self.dados_extraidos_cache[tipo_extracao] = resultado
+            if chave_cache:
+                self.cache_persistente.armazenar(chave_cache, resultado)
             
             return resultado
             
-        except json.JSONDecodeError as e:
-            print(f"Erro JSON na extração {tipo_extracao}: {e}")
-            return self._resultado_fallback_por_tipo(tipo_extracao)
         except Exception as e:
             print(f"Erro na extração {tipo_extracao}: {e}")
             return self._resultado_fallback_por_tipo(tipo_extracao)
@@ -332,7 +601,8 @@ RESPOSTA EM JSON PURO:
             "formacao_educacao": formacao,
             "projetos_conquistas": projetos,
             "timestamp_extracao": "2025-09-10T" + str(hash(str(dados_basicos)))[-6:],
-            "qualidade_extracao": "IA_COMPLETA"
+            "qualidade_extracao": "IA_COMPLETA",
+            "estrategia_extracao": self.estrategia
         }
     
     def _validar_e_enriquecer(self, resultado: Dict[str, Any], texto_original: str) -> Dict[str, Any]:
@@ -365,11 +635,8 @@ RESPOSTA EM JSON PURO:
         Extração de fallback usando regex quando a IA falha.
         """
         # Extração básica usando regex
-        email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-        telefone_pattern = r'(\(?\d{2}\)?[\s-]?\d{4,5}[\s-]?\d{4})'
-        
-        emails = re.findall(email_pattern, texto)
-        telefones = re.findall(telefone_pattern, texto)
+        emails = EMAIL_REGEX.findall(texto)
+        telefones = TELEFONE_REGEX.findall(texto)
         
         # Nome (primeira linha limpa)
         linhas = texto.split('\n')
@@ -475,20 +742,25 @@ RESPOSTA EM JSON PURO:
         linguagens = habilidades.get("linguagens_programacao", [])
         frameworks = habilidades.get("frameworks_bibliotecas", [])
         
+        motor = obter_motor_padrao()
+        em_frameworks = motor.buscar(" ".join(map(str, frameworks)), ("especialidade_frontend",))
+        em_linguagens = motor.buscar(" ".join(map(str, linguagens)), ("especialidade_backend",))
+        em_habilidades = motor.buscar(str(habilidades), ("especialidade_devops", "especialidade_dados"))
+        
         # Frontend
-        if any(tech in str(frameworks).lower() for tech in ['react', 'angular', 'vue', 'next']):
+        if em_frameworks["especialidade_frontend"]:
             especialidades.append("Frontend")
         
         # Backend
-        if any(tech in str(linguagens).lower() for tech in ['python', 'java', 'node', 'php']):
+        if em_linguagens["especialidade_backend"]:
             especialidades.append("Backend")
         
         # DevOps/Cloud
-        if any(tech in str(habilidades).lower() for tech in ['docker', 'kubernetes', 'aws', 'azure']):
+        if em_habilidades["especialidade_devops"]:
             especialidades.append("DevOps/Cloud")
         
         # Data Science/ML
-        if any(tech in str(habilidades).lower() for tech in ['machine learning', 'tensorflow', 'pandas', 'sql']):
+        if em_habilidades["especialidade_dados"]:
             especialidades.append("Data Science")
         
         return especialidades[:3]  # Limita a 3 especialidades principais
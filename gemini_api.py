@@ -1,72 +1,98 @@
-import os
-from dotenv import load_dotenv
-from google import genai
-from google.genai import types
-import json
+from contextlib import closing
+from clientes_gemini import obter_cliente_gemini
+from uso_tokens import registrar_resposta_cache
+from json_incremental import AnalisadorJSONIncremental
+from esquemas_resposta import ESQUEMA_AVALIACAO, configuracao_json, interpretar_resposta, validar_resposta
+from cache_persistente import CachePersistente, obter_cache_padrao
+from padroes_texto import EMAIL_REGEX, TELEFONE_REGEX
+from taxonomia_habilidades import obter_taxonomia_padrao
+from perfil_vaga import PerfilVaga, obter_perfil_vaga
 
 class GeminiClient:
     """Cliente para integração com a API Gemini"""
     
+    MODELO_IA = "gemini-2.0-flash-exp" # MAIS BARATO, DEIXA ASSIM, FUNCIONA IGUAL
+    
+    # Incrementar ao alterar o prompt de avaliação para invalidar o cache persistente
+    VERSAO_PROMPT = "avaliacao-v3"
+    
     def __init__(self):
-        """Inicializa o cliente Gemini carregando a chave da API"""
-        load_dotenv()
-        api_key = os.getenv('GEMINI_API_KEY')
-        
-        if not api_key:
-            raise ValueError("GEMINI_API_KEY não encontrada no arquivo .env")
-        
-        self.client = genai.Client(api_key=api_key)
+        """Inicializa o cliente Gemini usando o cliente compartilhado do processo"""
+        self.cliente_gemini = obter_cliente_gemini()
+        self.cache_persistente = obter_cache_padrao()
     
-    def avaliar_curriculo(self, texto_curriculo, requisitos_vaga):
-        # Avalia um currículo contra os requisitos da vaga
+    def avaliar_curriculo(self, texto_curriculo, requisitos_vaga, callback_parcial=None, contexto_candidato=""):
+        # Avalia um currículo contra os requisitos da vaga (texto ou PerfilVaga já compilado)
+        # Com callback_parcial, a resposta é lida em streaming e cada campo é repassado ao chegar
+        perfil_vaga = self._obter_perfil(requisitos_vaga)
         try:
-            prompt = self._construir_prompt(texto_curriculo, requisitos_vaga)
+            prompt = self._construir_prompt(texto_curriculo, perfil_vaga, contexto_candidato)
             
-            response = self.client.models.generate_content(
-                model="gemini-2.0-flash-exp", # MAIS BARATO, DEIXA ASSIM, FUNCIONA IGUAL
-                contents=prompt,
-                config=types.GenerateContentConfig(
-                    temperature=0.3,
-                    top_p=0.8,
-                    top_k=40,
-                    max_output_tokens=2048
-                )
-            )
+            parametros_geracao = {
+                "temperature": 0.3,
+                "top_p": 0.8,
+                "top_k": 40,
+                "max_output_tokens": 2048,
+                # Saída restrita ao esquema da avaliação, com o score como primeiro campo
+                **configuracao_json(ESQUEMA_AVALIACAO)
+            }
             
-            # Verifica se a resposta existe
-            if not response or not response.text:
-                raise ValueError("Resposta vazia da API Gemini")
+            # Reaproveita avaliações já feitas para o mesmo currículo e vaga
+            chave_cache = None
+            if self.cache_persistente:
+                chave_cache = CachePersistente.gerar_chave(
+                    "avaliacao", prompt, self.VERSAO_PROMPT, self.MODELO_IA, parametros_geracao
+                )
+                resultado_cache = self.cache_persistente.obter(chave_cache)
+                if resultado_cache is not None:
+                    registrar_resposta_cache("avaliacao")
+                    return resultado_cache
             
-            # Extrai apenas o JSON da resposta
-            response_text = response.text.strip()
+            if callback_parcial:
+                resultado = self._avaliar_em_streaming(prompt, parametros_geracao, callback_parcial)
+            else:
+                response = self.cliente_gemini.gerar_conteudo(
+                    self.MODELO_IA, prompt, parametros_geracao, etapa="avaliacao"
+                )
+                
+                resultado = interpretar_resposta(response.text if response else None, ESQUEMA_AVALIACAO)
             
-            # Se a resposta contém markdown, extrai o JSON
-            if "```json" in response_text:
-                json_start = response_text.find("```json") + 7
-                json_end = response_text.find("```", json_start)
-                response_text = response_text[json_start:json_end].strip()
-            elif "```" in response_text:
-                json_start = response_text.find("```") + 3
-                json_end = response_text.find("```", json_start)
-                response_text = response_text[json_start:json_end].strip()
+            if chave_cache:
+                self.cache_persistente.armazenar(chave_cache, resultado)
             
-            # Parse da resposta JSON
-            try:
-                resultado = json.loads(response_text)
-                return resultado
-            except json.JSONDecodeError:
-                # Se falhar, tenta extrair JSON usando regex
-                import re
-                json_match = re.search(r'\{.*\}', response_text, re.DOTALL)
-                if json_match:
-                    resultado = json.loads(json_match.group())
-                    return resultado
-                else:
-                    raise ValueError(f"Não foi possível extrair JSON válido da resposta: {response_text[:200]}...")
+            return resultado
             
         except Exception as e:
             # Em caso de erro, retorna avaliação básica baseada em palavras-chave
-            return self._avaliar_basico_fallback(texto_curriculo, requisitos_vaga, str(e))
+            return self._avaliar_basico_fallback(texto_curriculo, perfil_vaga.texto_normalizado, str(e))
+    
+    def _avaliar_em_streaming(self, prompt, parametros_geracao, callback_parcial):
+        """
+        Solicita a avaliação em streaming, repassando cada campo de primeiro
+        nível (score, pontos_fortes, ...) ao callback assim que chega completo.
+        
+        Args:
+            prompt (str): Prompt de avaliação
+            parametros_geracao (dict): Parâmetros de geração
+            callback_parcial (Callable): Recebe (campo, valor) a cada campo concluído
+            
+        Returns:
+            dict: Avaliação completa
+        """
+        analisador = AnalisadorJSONIncremental()
+        
+        with closing(self.cliente_gemini.gerar_conteudo_stream(
+            self.MODELO_IA, prompt, parametros_geracao, etapa="avaliacao"
+        )) as pedacos:
+            # A leitura continua após o fechamento do JSON para registrar o uso de tokens
+            for pedaco in pedacos:
+                for campo, valor in analisador.alimentar(pedaco):
+                    try:
+                        callback_parcial(campo, valor)
+                    except Exception as e:
+                        print(f"⚠️ Erro no callback de resultado parcial: {e}")
+        
+        return validar_resposta(analisador.finalizar(), ESQUEMA_AVALIACAO)
     
     def _avaliar_basico_fallback(self, curriculo, requisitos, erro_original):
         """
@@ -93,22 +119,22 @@ class GeminiClient:
                     break
         
         # Extrai email
-        email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-        emails = re.findall(email_pattern, curriculo)
+        emails = EMAIL_REGEX.findall(curriculo)
         email_candidato = emails[0] if emails else "Não identificado"
         
         # Extrai telefone
-        telefone_pattern = r'(\(?\d{2}\)?[\s-]?\d{4,5}[\s-]?\d{4})'
-        telefones = re.findall(telefone_pattern, curriculo)
+        telefones = TELEFONE_REGEX.findall(curriculo)
         telefone_candidato = telefones[0] if telefones else "Não identificado"
         
         # Análise básica de palavras-chave
         curriculo_lower = curriculo.lower()
         requisitos_lower = requisitos.lower()
         
-        # Tecnologias comuns
-        tecnologias = ['python', 'javascript', 'java', 'sql', 'html', 'css', 'react', 'angular', 'node']
-        habilidades_encontradas = [tech for tech in tecnologias if tech in curriculo_lower]
+        # Habilidades reconhecidas pela taxonomia
+        taxonomia = obter_taxonomia_padrao()
+        habilidades_encontradas = [
+            taxonomia.nome_exibicao(chave) for chave in taxonomia.extrair_lista(curriculo)
+        ]
         
         # Score básico baseado em correspondência de palavras
         palavras_req = set(requisitos_lower.split())
@@ -137,13 +163,14 @@ class GeminiClient:
             "aviso_fallback": True
         }
     
-    def _construir_prompt(self, curriculo, requisitos):
+    def _construir_prompt(self, curriculo, requisitos, contexto_candidato=""):
         """
         Constrói o prompt avançado para análise detalhada de currículo.
         
         Args:
             curriculo (str): Texto do currículo
-            requisitos (str): Requisitos da vaga
+            requisitos (str | PerfilVaga): Requisitos da vaga
+            contexto_candidato (str): Dados estruturados já extraídos do currículo
             
         Returns:
             str: Prompt formatado para o Gemini com análise granular
@@ -161,6 +188,7 @@ CURRÍCULO DO CANDIDATO:
 
 REQUISITOS DA VAGA ESTRUTURADOS:
 {requisitos_estruturados}
+{contexto_candidato}
 
 METODOLOGIA DE AVALIAÇÃO AVANÇADA:
 
@@ -256,24 +284,16 @@ RESPONDA EXCLUSIVAMENTE EM JSON VÁLIDO, SEM TEXTO ADICIONAL."""
         Estrutura os requisitos da vaga para melhor análise pela IA.
         
         Args:
-            requisitos (str): Texto dos requisitos
+            requisitos (str | PerfilVaga): Texto dos requisitos ou perfil já compilado
             
         Returns:
             str: Requisitos estruturados
         """
-        return f"""
-REQUISITOS ORIGINAIS:
-{requisitos}
-
-CATEGORIZAÇÃO AUTOMÁTICA PARA ANÁLISE:
-• TECNOLOGIAS: Identifique linguagens, frameworks, ferramentas específicas
-• EXPERIÊNCIA: Anos mínimos, tipo de projetos, senioridade
-• FORMAÇÃO: Graduação, especializações, certificações
-• SOFT SKILLS: Competências comportamentais mencionadas
-• RESPONSABILIDADES: Atividades e entregas esperadas
-
-PESO DOS CRITÉRIOS:
-• Requisitos marcados como "obrigatório/essencial" = peso 3
-• Requisitos marcados como "desejável" = peso 2  
-• Requisitos não especificados = peso 1
-"""
\ No newline at end of file
+        return self._obter_perfil(requisitos).bloco_requisitos
+    
+    @staticmethod
+    def _obter_perfil(requisitos):
+        # Aceita o texto da vaga ou o perfil já compilado (reaproveitado entre candidatos)
+        if isinstance(requisitos, PerfilVaga):
+            return requisitos
+        return obter_perfil_vaga(requisitos)
\ No newline at end of file
@@ -0,0 +1,229 @@
+"""Histórico persistente das avaliações em SQLite"""
+
+import os
+import json
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Dict, Any, List, Optional, Tuple
+from modelos import ResultadoAvaliacao
+from perfil_vaga import PerfilVaga
+
+# Colunas devolvidas nas listagens (o resultado completo fica fora para manter as páginas leves)
+COLUNAS_LISTAGEM = ("id", "timestamp", "nome_arquivo", "nome_candidato", "email_candidato",
+                    "score", "classificacao", "sucesso", "vaga_hash", "vaga_resumo")
+
+
+class HistoricoAvaliacoes:
+    """
+    Histórico de avaliações em SQLite, com índices por candidato, vaga, score
+    e data. Listagens são paginadas e as estatísticas são calculadas pelo
+    próprio banco, sem carregar o histórico inteiro em memória.
+    """
+
+    def __init__(self, caminho: str = ".historico_avaliacoes.sqlite3"):
+        """
+        Args:
+            caminho (str): Arquivo SQLite (":memory:" mantém o histórico só no processo)
+        """
+        self.caminho = caminho
+
+        self._lock = threading.Lock()
+        self._conexao = sqlite3.connect(caminho, check_same_thread=False)
+        self._conexao.row_factory = sqlite3.Row
+        if caminho != ":memory:":
+            self._conexao.execute("PRAGMA journal_mode=WAL")
+        self._conexao.execute("""
+            CREATE TABLE IF NOT EXISTS avaliacoes (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                timestamp TEXT NOT NULL,
+                nome_arquivo TEXT NOT NULL,
+                nome_candidato TEXT NOT NULL,
+                email_candidato TEXT,
+                vaga_hash TEXT NOT NULL,
+                vaga_resumo TEXT,
+                score INTEGER NOT NULL,
+                classificacao TEXT NOT NULL,
+                sucesso INTEGER NOT NULL,
+                resultado TEXT
+            )
+        """)
+        for coluna in ("vaga_hash", "score", "timestamp"):
+            self._conexao.execute(
+                f"CREATE INDEX IF NOT EXISTS idx_avaliacoes_{coluna} ON avaliacoes ({coluna})"
+            )
+        # O LIKE do SQLite não diferencia maiúsculas; só um índice NOCASE atende a busca por prefixo
+        self._conexao.execute("DROP INDEX IF EXISTS idx_avaliacoes_nome_candidato")
+        self._conexao.execute(
+            "CREATE INDEX IF NOT EXISTS idx_avaliacoes_nome_candidato_nocase "
+            "ON avaliacoes (nome_candidato COLLATE NOCASE)"
+        )
+        self._conexao.commit()
+
+    def registrar(self, resultado: ResultadoAvaliacao, nome_arquivo: str, perfil_vaga: PerfilVaga,
+                  resultado_serializado: Optional[Dict[str, Any]] = None) -> int:
+        """
+        Grava uma avaliação.
+
+        Args:
+            resultado (ResultadoAvaliacao): Resultado da avaliação
+            nome_arquivo (str): Arquivo do currículo
+            perfil_vaga (PerfilVaga): Vaga avaliada (identificada pelo hash do conteúdo)
+            resultado_serializado (Dict): para_dict() já calculado, se disponível
+
+        Returns:
+            int: Identificador do registro
+        """
+        if resultado_serializado is None:
+            resultado_serializado = resultado.para_dict()
+
+        with self._lock:
+            cursor = self._conexao.execute(
+                "INSERT INTO avaliacoes (timestamp, nome_arquivo, nome_candidato, email_candidato, "
+                "vaga_hash, vaga_resumo, score, classificacao, sucesso, resultado) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    datetime.now().isoformat(),
+                    nome_arquivo,
+                    resultado.candidato.nome,
+                    resultado.candidato.email,
+                    perfil_vaga.hash,
+                    perfil_vaga.resumo,
+                    resultado.score,
+                    resultado.classificacao,
+                    int(resultado.sucesso),
+                    json.dumps(resultado_serializado, ensure_ascii=False, default=str)
+                )
+            )
+            self._conexao.commit()
+            return cursor.lastrowid
+
+    @staticmethod
+    def _filtros(vaga_hash: Optional[str] = None, nome_candidato: Optional[str] = None,
+                 score_minimo: Optional[int] = None, desde: Optional[str] = None,
+                 apenas_sucesso: bool = False) -> Tuple[str, list]:
+        condicoes, parametros = [], []
+        if vaga_hash:
+            condicoes.append("vaga_hash = ?")
+            parametros.append(vaga_hash)
+        if nome_candidato:
+            # Prefixo, para aproveitar o índice NOCASE de nome_candidato
+            condicoes.append("nome_candidato LIKE ?")
+            parametros.append(nome_candidato.replace("%", "").replace("_", "") + "%")
+        if score_minimo is not None:
+            condicoes.append("score >= ?")
+            parametros.append(score_minimo)
+        if desde:
+            condicoes.append("timestamp >= ?")
+            parametros.append(desde)
+        if apenas_sucesso:
+            condicoes.append("sucesso = 1")
+
+        return (" WHERE " + " AND ".join(condicoes)) if condicoes else "", parametros
+
+    def listar(self, pagina: int = 1, tamanho_pagina: int = 50, **filtros) -> List[Dict[str, Any]]:
+        """
+        Lista avaliações da mais recente para a mais antiga.
+
+        Args:
+            pagina (int): Página, a partir de 1
+            tamanho_pagina (int): Registros por página
+            **filtros: vaga_hash, nome_candidato (prefixo), score_minimo, desde (ISO 8601)
+
+        Returns:
+            List[Dict]: Registros da página, sem o resultado completo
+        """
+        where, parametros = self._filtros(**filtros)
+        tamanho_pagina = max(1, tamanho_pagina)
+        deslocamento = (max(1, pagina) - 1) * tamanho_pagina
+
+        with self._lock:
+            linhas = self._conexao.execute(
+                f"SELECT {', '.join(COLUNAS_LISTAGEM)} FROM avaliacoes{where} "
+                "ORDER BY timestamp DESC, id DESC LIMIT ? OFFSET ?",
+                parametros + [tamanho_pagina, deslocamento]
+            ).fetchall()
+
+        return [dict(linha) for linha in linhas]
+
+    def contar(self, **filtros) -> int:
+        where, parametros = self._filtros(**filtros)
+        with self._lock:
+            return self._conexao.execute(f"SELECT COUNT(*) FROM avaliacoes{where}", parametros).fetchone()[0]
+
+    def obter(self, id_avaliacao: int) -> Optional[Dict[str, Any]]:
+        """
+        Returns:
+            Dict: Resultado completo gravado para a avaliação, ou None se não existir
+        """
+        with self._lock:
+            linha = self._conexao.execute(
+                "SELECT resultado FROM avaliacoes WHERE id = ?", (id_avaliacao,)
+            ).fetchone()
+
+        if linha is None or linha["resultado"] is None:
+            return None
+        return json.loads(linha["resultado"])
+
+    def estatisticas(self, limiar_aprovacao: int = 70, **filtros) -> Dict[str, Any]:
+        """
+        Agrega as avaliações bem-sucedidas no banco.
+
+        Returns:
+            Dict: Total, score médio/máximo/mínimo e aprovações (score >= limiar);
+                vazio se não houver avaliações
+        """
+        where, parametros = self._filtros(apenas_sucesso=True, **filtros)
+
+        with self._lock:
+            linha = self._conexao.execute(
+                "SELECT COUNT(*) AS total, AVG(score) AS media, MAX(score) AS maximo, "
+                f"MIN(score) AS minimo, SUM(score >= ?) AS aprovados FROM avaliacoes{where}",
+                [limiar_aprovacao] + parametros
+            ).fetchone()
+
+        if not linha["total"]:
+            return {}
+
+        return {
+            "total_avaliacoes": linha["total"],
+            "score_medio": round(linha["media"], 1),
+            "score_maximo": linha["maximo"],
+            "score_minimo": linha["minimo"],
+            "acima_70": linha["aprovados"],
+            "percentual_aprovacao": round((linha["aprovados"] / linha["total"]) * 100, 1)
+        }
+
+    def limpar(self):
+        """Remove todas as avaliações."""
+        with self._lock:
+            self._conexao.execute("DELETE FROM avaliacoes")
+            self._conexao.commit()
+
+
+_historico_padrao = None
+_historico_padrao_lock = threading.Lock()
+
+
+def obter_historico_padrao() -> HistoricoAvaliacoes:
+    """
+    Retorna o histórico compartilhado pelo processo, configurado pelo .env.
+
+    Variáveis: HISTORICO_PERSISTENTE (1/0; com 0 o histórico fica só em
+    memória) e HISTORICO_CAMINHO.
+    """
+    global _historico_padrao
+
+    with _historico_padrao_lock:
+        if _historico_padrao is None:
+            caminho = ":memory:"
+            if os.getenv('HISTORICO_PERSISTENTE', '1') != '0':
+                caminho = os.getenv('HISTORICO_CAMINHO', '.historico_avaliacoes.sqlite3')
+
+            try:
+                _historico_padrao = HistoricoAvaliacoes(caminho)
+            except sqlite3.Error as e:
+                print(f"⚠️ Histórico persistente indisponível, usando memória: {e}")
+                _historico_padrao = HistoricoAvaliacoes(":memory:")
+
+        return _historico_padrao
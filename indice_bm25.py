@@ -0,0 +1,256 @@
+"""Índice invertido com ranking BM25 para pré-selecionar currículos sem chamar a IA"""
+
+import re
+import math
+import heapq
+import threading
+import unicodedata
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Dict, Any, List, Optional, Iterable
+from modelos import _DATACLASS_SLOTS
+from perfil_vaga import PerfilVaga
+from taxonomia_habilidades import obter_taxonomia_padrao
+
+TOKEN_REGEX = re.compile(r'[a-z0-9][a-z0-9+#.]*[a-z0-9+#]|[a-z0-9]')
+
+# Habilidades da taxonomia entram no índice como um termo próprio, pela chave
+# canônica: "k8s" no currículo e "Kubernetes" na vaga caem no mesmo termo
+PREFIXO_HABILIDADE = "hab:"
+
+PALAVRAS_VAZIAS = frozenset("""
+a o as os um uma uns umas de do da dos das em no na nos nas por para com sem
+e ou que se ao aos sua seu suas seus como mais ser ter nao sim sobre entre ate
+the an and or of to in on for with at by from is are be as this that
+""".split())
+
+VALORES_IGNORADOS = frozenset({"nao identificado", "n/a", "a definir"})
+
+# Estrutura de anúncio de vaga: presente em quase todo texto de vaga, não diz o que
+# se procura no candidato e casaria com currículos por "pretensão salarial" e afins
+PALAVRAS_ANUNCIO_VAGA = frozenset("""
+vaga vagas requisito requisitos obrigatorio obrigatoria obrigatorios obrigatorias
+desejavel desejaveis diferencial diferenciais essencial essenciais necessario necessaria
+salario salarial remuneracao pretensao beneficio beneficios clt pj contratacao
+enviar envie curriculo interessados candidatar local horario
+""".split())
+
+
+def _remover_acentos(texto: str) -> str:
+    return unicodedata.normalize("NFKD", texto).encode("ascii", "ignore").decode("ascii")
+
+
+def tokenizar(texto: str) -> List[str]:
+    """
+    Termos do texto em minúsculas e sem acentos, sem palavras vazias. Mantém
+    símbolos de nomes técnicos ("c++", "c#", "node.js").
+    """
+    if not texto:
+        return []
+    return [termo for termo in TOKEN_REGEX.findall(_remover_acentos(texto.lower()))
+            if termo not in PALAVRAS_VAZIAS]
+
+
+def _textos_dados_estruturados(dados: Any) -> Iterable[str]:
+    """Valores textuais dos dados estruturados (cargos, tecnologias, cursos...)."""
+    if isinstance(dados, str):
+        if _remover_acentos(dados.lower()).strip() not in VALORES_IGNORADOS:
+            yield dados
+    elif isinstance(dados, dict):
+        for valor in dados.values():
+            yield from _textos_dados_estruturados(valor)
+    elif isinstance(dados, list):
+        for item in dados:
+            yield from _textos_dados_estruturados(item)
+
+
+@dataclass(**_DATACLASS_SLOTS)
+class DocumentoIndexado:
+    """Currículo guardado no índice, pronto para ser avaliado sem nova extração."""
+
+    id_documento: str
+    texto: str
+    dados_estruturados: Dict[str, Any] = field(default_factory=dict)
+    frequencias: Dict[str, int] = field(default_factory=dict)
+    comprimento: int = 0
+
+    @property
+    def nome_candidato(self) -> str:
+        dados_pessoais = self.dados_estruturados.get("dados_pessoais") or {}
+        return dados_pessoais.get("nome_completo") or "Não identificado"
+
+
+class IndiceBM25:
+    """
+    Índice invertido (termo -> documento -> frequência) atualizado a cada
+    currículo processado. A consulta percorre apenas as listas dos termos da
+    vaga e devolve os K melhores por BM25, em milissegundos mesmo com
+    milhares de currículos.
+    """
+
+    def __init__(self, k1: float = 1.5, b: float = 0.75):
+        """
+        Args:
+            k1 (float): Saturação da frequência do termo
+            b (float): Normalização pelo tamanho do documento
+        """
+        self.k1 = k1
+        self.b = b
+
+        self._documentos: Dict[str, DocumentoIndexado] = {}
+        self._postings: Dict[str, Dict[str, int]] = {}
+        self._comprimento_total = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._documentos)
+
+    def __contains__(self, id_documento: str) -> bool:
+        return id_documento in self._documentos
+
+    @staticmethod
+    def _termos_documento(texto: str, dados_estruturados: Dict[str, Any]) -> List[str]:
+        partes = [texto, *_textos_dados_estruturados(dados_estruturados or {})]
+        conteudo = "\n".join(partes)
+
+        habilidades = obter_taxonomia_padrao().extrair_lista(conteudo)
+        return tokenizar(conteudo) + [PREFIXO_HABILIDADE + chave for chave in habilidades]
+
+    def adicionar(self, id_documento: str, texto: str, dados_estruturados: Optional[Dict[str, Any]] = None):
+        """
+        Indexa um currículo; um documento com o mesmo id é substituído.
+
+        Args:
+            id_documento (str): Identificador do currículo (nome do arquivo)
+            texto (str): Texto extraído do currículo
+            dados_estruturados (Dict): Dados estruturados da extração, também indexados
+        """
+        dados_estruturados = dados_estruturados or {}
+        frequencias = dict(Counter(self._termos_documento(texto, dados_estruturados)))
+        documento = DocumentoIndexado(
+            id_documento=id_documento,
+            texto=texto,
+            dados_estruturados=dados_estruturados,
+            frequencias=frequencias,
+            comprimento=sum(frequencias.values())
+        )
+
+        with self._lock:
+            self._remover_sem_lock(id_documento)
+            self._documentos[id_documento] = documento
+            self._comprimento_total += documento.comprimento
+            for termo, frequencia in frequencias.items():
+                self._postings.setdefault(termo, {})[id_documento] = frequencia
+
+    def remover(self, id_documento: str) -> bool:
+        with self._lock:
+            return self._remover_sem_lock(id_documento)
+
+    def _remover_sem_lock(self, id_documento: str) -> bool:
+        documento = self._documentos.pop(id_documento, None)
+        if documento is None:
+            return False
+
+        self._comprimento_total -= documento.comprimento
+        for termo in documento.frequencias:
+            postings = self._postings.get(termo)
+            if postings is not None:
+                postings.pop(id_documento, None)
+                if not postings:
+                    del self._postings[termo]
+        return True
+
+    def obter(self, id_documento: str) -> Optional[DocumentoIndexado]:
+        with self._lock:
+            return self._documentos.get(id_documento)
+
+    @staticmethod
+    def termos_consulta(perfil_vaga: PerfilVaga) -> Dict[str, float]:
+        """
+        Termos da vaga com peso: palavras do texto valem 1 por ocorrência e as
+        habilidades reconhecidas valem o peso do requisito (obrigatória 3, desejável 2).
+        Números, letras soltas e o vocabulário do anúncio ("salário", "obrigatório")
+        ficam fora das palavras do texto.
+        """
+        palavras = [
+            termo for termo in tokenizar(perfil_vaga.texto_original)
+            if len(termo) > 1 and termo not in PALAVRAS_ANUNCIO_VAGA
+            and not termo.replace(".", "").replace(",", "").isdigit()
+        ]
+        pesos = {termo: float(quantidade) for termo, quantidade in Counter(palavras).items()}
+        for chave, peso in perfil_vaga.pesos_habilidades.items():
+            pesos[PREFIXO_HABILIDADE + chave] = peso
+        return pesos
+
+    def buscar(self, termos: Dict[str, float], k: int = 10) -> List[Dict[str, Any]]:
+        """
+        Ranqueia os documentos pelos termos ponderados.
+
+        Args:
+            termos (Dict): Termo -> peso na consulta (ver termos_consulta)
+            k (int): Quantidade de documentos devolvidos
+
+        Returns:
+            List[Dict]: id_documento, nome_candidato e pontuacao_bm25, da maior para a menor
+        """
+        with self._lock:
+            total_documentos = len(self._documentos)
+            if not total_documentos or k <= 0:
+                return []
+
+            comprimento_medio = self._comprimento_total / total_documentos or 1.0
+            pontuacoes: Dict[str, float] = {}
+
+            for termo, peso in termos.items():
+                postings = self._postings.get(termo)
+                if not postings:
+                    continue
+
+                idf = math.log(1 + (total_documentos - len(postings) + 0.5) / (len(postings) + 0.5))
+                for id_documento, frequencia in postings.items():
+                    comprimento = self._documentos[id_documento].comprimento
+                    normalizacao = self.k1 * (1 - self.b + self.b * comprimento / comprimento_medio)
+                    pontuacoes[id_documento] = pontuacoes.get(id_documento, 0.0) + (
+                        peso * idf * frequencia * (self.k1 + 1) / (frequencia + normalizacao)
+                    )
+
+            melhores = heapq.nlargest(k, pontuacoes.items(), key=lambda item: item[1])
+            return [
+                {
+                    "id_documento": id_documento,
+                    "nome_candidato": self._documentos[id_documento].nome_candidato,
+                    "pontuacao_bm25": round(pontuacao, 4)
+                }
+                for id_documento, pontuacao in melhores
+            ]
+
+    def estatisticas(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "documentos": len(self._documentos),
+                "termos": len(self._postings),
+                "comprimento_medio": round(self._comprimento_total / len(self._documentos), 1)
+                if self._documentos else 0
+            }
+
+    def limpar(self):
+        with self._lock:
+            self._documentos.clear()
+            self._postings.clear()
+            self._comprimento_total = 0
+
+
+_indice_padrao = None
+_indice_padrao_lock = threading.Lock()
+
+
+def obter_indice_padrao() -> IndiceBM25:
+    """
+    Retorna o índice de currículos compartilhado pelo processo.
+    """
+    global _indice_padrao
+
+    with _indice_padrao_lock:
+        if _indice_padrao is None:
+            _indice_padrao = IndiceBM25()
+        return _indice_padrao
@@ -2,7 +2,6 @@ import streamlit as st
 import pandas as pd
 from sistema import SistemaRecrutamento
 from io import StringIO
-import time
 from datetime import datetime
 
 class InterfaceStreamlit:
@@ -80,7 +79,11 @@ class InterfaceStreamlit:
         self._renderizar_botao_analise()
         
         # Área de resultados
-        if 'resultado_avaliacao' in st.session_state and st.session_state.resultado_avaliacao:
+        if st.session_state.get('modo_lote'):
+            if st.session_state.get('resultado_lote'):
+                st.markdown("---")
+                self._renderizar_resultados_lote()
+        elif 'resultado_avaliacao' in st.session_state and st.session_state.resultado_avaliacao:
             st.markdown("---")
             self._renderizar_resultados()
     
@@ -90,6 +93,16 @@ class InterfaceStreamlit:
         """
         st.subheader("📤 Upload do Currículo")
         
+        modo_lote = st.checkbox(
+            "📦 Modo lote (vários currículos ou arquivo ZIP)",
+            key="modo_lote",
+            help="Avalia todos os currículos enviados contra a mesma vaga e gera um ranking"
+        )
+        
+        if modo_lote:
+            self._renderizar_upload_lote()
+            return
+        
         arquivo_upload = st.file_uploader(
             "Selecione o arquivo do currículo:",
             type=['pdf', 'docx'],
@@ -116,6 +129,45 @@ class InterfaceStreamlit:
             if 'arquivo_curriculo' in st.session_state:
                 del st.session_state.arquivo_curriculo
     
+    def _renderizar_upload_lote(self):
+        """
+        Renderiza o upload de vários currículos para o modo lote.
+        """
+        arquivos_upload = st.file_uploader(
+            "Selecione os currículos:",
+            type=['pdf', 'docx', 'zip'],
+            help="Formatos aceitos: PDF, DOCX ou um ZIP com vários currículos (máximo 10MB por currículo)",
+            accept_multiple_files=True
+        )
+        
+        if arquivos_upload:
+            st.session_state.arquivos_lote = arquivos_upload
+            tamanho_mb = sum(len(a.getvalue()) for a in arquivos_upload) / (1024 * 1024)
+            st.success(f"✅ **{len(arquivos_upload)} arquivo(s) carregado(s)** ({tamanho_mb:.2f} MB no total)")
+        elif 'arquivos_lote' in st.session_state:
+            del st.session_state.arquivos_lote
+        
+        modo_cascata = st.checkbox(
+            "🪜 Modo cascata (triagem local antes da IA)",
+            key="modo_cascata",
+            help="Ranqueia todos os currículos por compatibilidade com a vaga sem usar a IA; "
+                 "só os aprovados na triagem são extraídos e avaliados pela IA"
+        )
+        
+        if modo_cascata:
+            col1, col2 = st.columns(2)
+            col1.slider(
+                "Compatibilidade mínima para a IA",
+                min_value=0, max_value=100,
+                value=self.sistema.LIMIAR_CASCATA_PADRAO,
+                key="limiar_cascata"
+            )
+            col2.number_input(
+                "Sempre enviar os K melhores (0 = desativado)",
+                min_value=0, value=0, step=1,
+                key="top_k_cascata"
+            )
+    
     def _renderizar_secao_requisitos(self):
         """
         Renderiza a seção simplificada de requisitos da vaga.
@@ -174,9 +226,12 @@ O que é um diferencial:
         """
         st.markdown("<br>", unsafe_allow_html=True)
         
+        modo_lote = st.session_state.get('modo_lote', False)
+        chave_arquivos = 'arquivos_lote' if modo_lote else 'arquivo_curriculo'
+        
         # Verifica se pode executar análise
         pode_analisar = (
-            'arquivo_curriculo' in st.session_state and 
+            chave_arquivos in st.session_state and 
             'requisitos_vaga' in st.session_state and 
             st.session_state.requisitos_vaga and
             len(st.session_state.requisitos_vaga.strip()) >= 20
@@ -185,13 +240,16 @@ O que é um diferencial:
         col1, col2, col3 = st.columns([1, 2, 1])
         with col2:
             if st.button(
-                "🧠 **ANALISAR CURRÍCULO**", 
+                "🧠 **ANALISAR LOTE**" if modo_lote else "🧠 **ANALISAR CURRÍCULO**", 
                 disabled=not pode_analisar,
                 type="primary",
                 use_container_width=True,
                 help="Clique para iniciar a análise inteligente do currículo"
             ):
-                self._executar_analise()
+                if modo_lote:
+                    self._executar_analise_lote()
+                else:
+                    self._executar_analise()
         
         if not pode_analisar:
             st.warning("⚠️ Para analisar, carregue um currículo e preencha os requisitos da vaga.")
@@ -203,40 +261,31 @@ O que é um diferencial:
         # Barra de progresso e mensagens de status
         progress_bar = st.progress(0)
         status_text = st.empty()
+        resultado_parcial_area = st.empty()
         
-        try:
-            # Etapa 1: Inicializando
-            status_text.text("🔄 Inicializando análise...")
-            time.sleep(0.5)
-            progress_bar.progress(20)
-            
-            # Etapa 2: Extraindo texto
-            status_text.text("📄 Extraindo texto do currículo...")
-            time.sleep(1)
-            progress_bar.progress(40)
+        def atualizar_progresso(evento):
+            # Chamado na thread do script pelo próprio processamento
+            progress_bar.progress(min(100, int(evento["progresso"])))
+            status_text.text(evento["descricao"])
             
-            # Etapa 3: Processando com IA
-            status_text.text("🧠 Analisando com inteligência artificial...")
-            time.sleep(1)
-            progress_bar.progress(60)
-            
-            # Executa o processamento real
+            # Score e classificação aparecem assim que chegam do streaming
+            parcial = evento.get("resultado_parcial", {})
+            if "score" in parcial:
+                resultado_parcial_area.metric(
+                    "Score preliminar", f"{parcial['score']}/100", parcial["classificacao"]
+                )
+        
+        try:
             resultado = self.sistema.processar_curriculo(
                 st.session_state.arquivo_curriculo,
-                st.session_state.requisitos_vaga
+                st.session_state.requisitos_vaga,
+                callback_progresso=atualizar_progresso
             )
             
-            progress_bar.progress(80)
-            status_text.text("📊 Processando resultados...")
-            time.sleep(0.5)
-            
-            progress_bar.progress(100)
-            status_text.text("✅ Análise concluída!")
-            time.sleep(0.5)
-            
             # Remove elementos de progresso
             progress_bar.empty()
             status_text.empty()
+            resultado_parcial_area.empty()
             
             # Verifica resultado
             if resultado["sucesso"]:
@@ -248,11 +297,97 @@ O que é um diferencial:
                 if 'etapa' in resultado:
                     st.info(f"Etapa com problema: {resultado['etapa']}")
         
+        except Exception as e:
+            progress_bar.empty()
+            status_text.empty()
+            resultado_parcial_area.empty()
+            st.error(f"❌ **Erro inesperado:** {str(e)}")
+    
+    def _executar_analise_lote(self):
+        """
+        Executa a análise em lote exibindo cada candidato assim que é avaliado.
+        """
+        progress_bar = st.progress(0)
+        status_text = st.empty()
+        tabela_parcial = st.empty()
+        
+        try:
+            requisitos = st.session_state.requisitos_vaga
+            concluidos = []
+            
+            # Expande ZIPs antes de começar para saber o total do lote
+            from arquivo_local import coletar_arquivos
+            arquivos = coletar_arquivos(st.session_state.arquivos_lote)
+            total = len(arquivos)
+            
+            if not total:
+                st.error("❌ Nenhum currículo PDF/DOCX encontrado nos arquivos enviados.")
+                return
+            
+            status_text.text(f"🧠 Analisando {total} currículo(s)...")
+            
+            from uso_tokens import RegistroUsoTokens
+            registro_uso = RegistroUsoTokens()
+            
+            modo_cascata = st.session_state.get('modo_cascata', False)
+            resultados_lote = self.sistema.processar_lote_iter(
+                arquivos, requisitos, registro_uso=registro_uso,
+                modo_cascata=modo_cascata,
+                limiar_cascata=st.session_state.get('limiar_cascata', self.sistema.LIMIAR_CASCATA_PADRAO),
+                top_k_cascata=st.session_state.get('top_k_cascata') or None
+            )
+            
+            for resultado in resultados_lote:
+                concluidos.append(resultado)
+                progress_bar.progress(len(concluidos) / total)
+                status_text.text(f"📄 {len(concluidos)}/{total} concluído(s) — último: {resultado['nome_arquivo']}")
+                tabela_parcial.dataframe(self.sistema.gerar_ranking(concluidos), use_container_width=True)
+            
+            progress_bar.empty()
+            status_text.empty()
+            tabela_parcial.empty()
+            
+            st.session_state.resultado_lote = {
+                "resultados": concluidos,
+                "ranking": self.sistema.gerar_ranking(concluidos),
+                "uso_tokens": registro_uso.para_dict()
+            }
+            st.rerun()
+        
         except Exception as e:
             progress_bar.empty()
             status_text.empty()
             st.error(f"❌ **Erro inesperado:** {str(e)}")
     
+    def _renderizar_resultados_lote(self):
+        """
+        Renderiza o ranking final do lote com opção de exportação.
+        """
+        st.subheader("🏆 Ranking de Candidatos")
+        
+        resultado_lote = st.session_state.resultado_lote
+        ranking = resultado_lote["ranking"]
+        falhas = sum(1 for r in resultado_lote["resultados"] if not r["sucesso"])
+        
+        uso_tokens = resultado_lote.get("uso_tokens", {}).get("total", {})
+        
+        col1, col2, col3, col4 = st.columns(4)
+        col1.metric("Currículos", len(resultado_lote["resultados"]))
+        col2.metric("Avaliados pela IA", self.sistema.contar_avaliados_ia(resultado_lote["resultados"]))
+        col3.metric("Falhas", falhas)
+        col4.metric("Tokens consumidos", f"{uso_tokens.get('tokens_total', 0):,}".replace(",", "."))
+        
+        st.dataframe(ranking, use_container_width=True, hide_index=True)
+        
+        csv_buffer = StringIO()
+        ranking.to_csv(csv_buffer, index=False, encoding='utf-8-sig')
+        st.download_button(
+            label="⬇️ Download do Ranking (CSV)",
+            data=csv_buffer.getvalue(),
+            file_name=f"ranking_candidatos_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
+            mime="text/csv"
+        )
+    
     def _renderizar_resultados(self):
         """
         Renderiza os resultados avançados da avaliação com análise completa.
@@ -506,6 +641,11 @@ O que é um diferencial:
         # Informações técnicas adicionais
         if resultado.get("aviso_fallback"):
             st.warning("⚠️ Esta avaliação foi realizada com sistema de backup devido a falha na API principal.")
+        
+        if resultado.get("duplicata_de"):
+            st.info(f"🧬 Currículo quase idêntico a **{resultado['duplicata_de']}** "
+                    f"(similaridade {resultado.get('similaridade_duplicata', 0):.0%}): "
+                    "a avaliação já feita para esta vaga foi reaproveitada.")
     
     def _renderizar_acoes_finais(self, resultado):
         """
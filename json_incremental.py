@@ -0,0 +1,122 @@
+"""Leitura incremental de um objeto JSON recebido em partes (streaming)"""
+
+import json
+from typing import Dict, Any, List, Tuple
+
+
+class AnalisadorJSONIncremental:
+    """
+    Recebe o texto de um objeto JSON em pedaços e devolve cada campo de
+    primeiro nível assim que o valor dele estiver completo.
+
+    Um campo só é considerado completo quando aparece o delimitador seguinte
+    (vírgula ou fechamento do objeto) fora de strings: assim um número no fim
+    do buffer ("score": 7) não é emitido antes de se saber se é 7 ou 75, e
+    objetos/listas aninhados só saem inteiros. Texto antes da primeira chave
+    (ex.: uma cerca ```json) é ignorado.
+
+    Cada caractere é examinado e cada campo é decodificado uma única vez,
+    independentemente de como a resposta foi fatiada.
+
+    Uso:
+        analisador = AnalisadorJSONIncremental()
+        for pedaco in resposta:
+            for campo, valor in analisador.alimentar(pedaco):
+                ...
+        resultado = analisador.finalizar()
+    """
+
+    def __init__(self):
+        self._texto = ""
+        self._posicao = 0
+        self._profundidade = 0
+        self._em_string = False
+        self._escape = False
+        self._inicio_objeto = -1
+        self._inicio_campo = -1
+        self._fim_objeto = -1
+        self.campos: Dict[str, Any] = {}
+
+    @property
+    def concluido(self) -> bool:
+        """Indica se o objeto de primeiro nível já foi fechado."""
+        return self._fim_objeto >= 0
+
+    def alimentar(self, pedaco: str) -> List[Tuple[str, Any]]:
+        """
+        Acrescenta um pedaço do texto.
+
+        Returns:
+            List: Pares (campo, valor) que ficaram completos com este pedaço
+        """
+        if not pedaco or self.concluido:
+            return []
+
+        self._texto += pedaco
+
+        novos = []
+        texto = self._texto
+        for indice in range(self._posicao, len(texto)):
+            caractere = texto[indice]
+
+            if self._em_string:
+                if self._escape:
+                    self._escape = False
+                elif caractere == "\\":
+                    self._escape = True
+                elif caractere == '"':
+                    self._em_string = False
+                continue
+
+            if self._inicio_objeto < 0:
+                if caractere == "{":
+                    self._inicio_objeto = indice
+                    self._inicio_campo = indice + 1
+                    self._profundidade = 1
+                continue
+
+            if caractere == '"':
+                self._em_string = True
+            elif caractere in "{[":
+                self._profundidade += 1
+            elif caractere in "}]":
+                self._profundidade -= 1
+                if self._profundidade == 0:
+                    novos.extend(self._decodificar_campo(texto[self._inicio_campo:indice]))
+                    self._fim_objeto = indice
+                    self._posicao = indice + 1
+                    return novos
+            elif caractere == "," and self._profundidade == 1:
+                novos.extend(self._decodificar_campo(texto[self._inicio_campo:indice]))
+                self._inicio_campo = indice + 1
+
+        self._posicao = len(texto)
+        return novos
+
+    def _decodificar_campo(self, trecho: str) -> List[Tuple[str, Any]]:
+        if not trecho.strip():
+            return []
+
+        try:
+            campo = json.loads("{" + trecho + "}")
+        except json.JSONDecodeError:
+            # Campo malformado: fica de fora dos parciais e o erro aparece em finalizar()
+            return []
+
+        self.campos.update(campo)
+        return list(campo.items())
+
+    def finalizar(self) -> Dict[str, Any]:
+        """
+        Decodifica o objeto completo.
+
+        Raises:
+            ValueError: Se o texto terminou antes de o objeto ser fechado ou não é JSON válido
+        """
+        if not self.concluido:
+            raise ValueError(f"Resposta JSON incompleta: {self._texto[:200]}...")
+
+        try:
+            return json.loads(self._texto[self._inicio_objeto:self._fim_objeto + 1])
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Resposta JSON inválida: {e}") from e
@@ -0,0 +1,254 @@
+"""Limitador de taxa adaptativo e retentativas para as chamadas à IA"""
+
+import re
+import time
+import heapq
+import random
+import itertools
+import threading
+import contextvars
+from contextlib import contextmanager
+from typing import Dict, Any, Optional
+
+# Menor valor = maior prioridade
+PRIORIDADE_INTERATIVA = 0
+PRIORIDADE_LOTE = 10
+
+_prioridade_atual = contextvars.ContextVar("prioridade_requisicoes_ia", default=PRIORIDADE_INTERATIVA)
+
+
+@contextmanager
+def prioridade_requisicoes(prioridade: int):
+    """
+    Define a prioridade das requisições à IA feitas dentro do bloco.
+
+    A prioridade vale para o contexto atual (contextvars); threads de pools
+    internos só a herdam se forem submetidas com contextvars.copy_context().
+    """
+    token = _prioridade_atual.set(prioridade)
+    try:
+        yield
+    finally:
+        _prioridade_atual.reset(token)
+
+
+def obter_prioridade_atual() -> int:
+    return _prioridade_atual.get()
+
+
+class BaldeTokens:
+    """
+    Balde de fichas (token bucket): enche continuamente até a capacidade e
+    cada uso retira fichas; sem fichas suficientes, é preciso esperar.
+    """
+
+    def __init__(self, capacidade: float, reposicao_por_segundo: float):
+        self.capacidade = capacidade
+        self.reposicao_por_segundo = reposicao_por_segundo
+        self.disponivel = capacidade
+        self._atualizado_em = time.monotonic()
+
+    def _repor(self, agora: float):
+        decorrido = agora - self._atualizado_em
+        if decorrido > 0:
+            self.disponivel = min(self.capacidade, self.disponivel + decorrido * self.reposicao_por_segundo)
+            self._atualizado_em = agora
+
+    def tempo_ate_disponivel(self, quantidade: float, agora: float) -> float:
+        """
+        Segundos até haver fichas suficientes (0 se já houver).
+        """
+        self._repor(agora)
+        quantidade = min(quantidade, self.capacidade)
+        if self.disponivel >= quantidade:
+            return 0.0
+        return (quantidade - self.disponivel) / self.reposicao_por_segundo
+
+    def consumir(self, quantidade: float):
+        self.disponivel -= min(quantidade, self.capacidade)
+
+    def devolver(self, quantidade: float):
+        self.disponivel = min(self.capacidade, self.disponivel + quantidade)
+
+    def limitar_acumulo(self, maximo: float, agora: float):
+        """Descarta fichas acumuladas acima de um máximo."""
+        self._repor(agora)
+        self.disponivel = min(self.disponivel, maximo)
+
+
+class LimitadorTaxa:
+    """
+    Limita requisições por minuto (RPM) e tokens por minuto (TPM) com fila de prioridade.
+
+    Cada chamada aguarda a vez numa fila ordenada por prioridade e ordem de
+    chegada: requisições interativas passam à frente das de lote. A taxa é
+    adaptativa: ao receber 429 o limitador pausa todas as chamadas e reduz a
+    vazão pela metade; a cada sucesso ela volta a subir gradualmente até o
+    limite configurado.
+    """
+
+    FATOR_MINIMO = 0.1
+    INCREMENTO_FATOR = 0.05
+
+    def __init__(self, requisicoes_por_minuto: float = 60, tokens_por_minuto: float = 1_000_000):
+        """
+        Args:
+            requisicoes_por_minuto (float): Cota de requisições por minuto do provedor
+            tokens_por_minuto (float): Cota de tokens (entrada + saída) por minuto
+        """
+        self.requisicoes_por_minuto = max(1.0, requisicoes_por_minuto)
+        self.tokens_por_minuto = max(1.0, tokens_por_minuto)
+        self._requisicoes = BaldeTokens(self.requisicoes_por_minuto, self.requisicoes_por_minuto / 60)
+        self._tokens = BaldeTokens(self.tokens_por_minuto, self.tokens_por_minuto / 60)
+
+        self._condicao = threading.Condition()
+        self._fila = []
+        self._sequencia = itertools.count()
+        self._fator = 1.0
+        self._pausado_ate = 0.0
+        self._limites_excedidos = 0
+
+    def adquirir(self, tokens_estimados: int = 0, prioridade: Optional[int] = None):
+        """
+        Bloqueia até a requisição caber nas cotas e ser a próxima da fila.
+
+        Args:
+            tokens_estimados (int): Tokens que a requisição deve consumir
+            prioridade (int): Prioridade da requisição (padrão: a do contexto atual)
+        """
+        if prioridade is None:
+            prioridade = obter_prioridade_atual()
+        senha = (prioridade, next(self._sequencia))
+
+        with self._condicao:
+            heapq.heappush(self._fila, senha)
+            try:
+                while True:
+                    if self._fila[0] != senha:
+                        self._condicao.wait()
+                        continue
+
+                    agora = time.monotonic()
+                    espera = max(
+                        self._pausado_ate - agora,
+                        self._requisicoes.tempo_ate_disponivel(1, agora),
+                        self._tokens.tempo_ate_disponivel(tokens_estimados, agora)
+                    )
+                    if espera <= 0:
+                        self._requisicoes.consumir(1)
+                        self._tokens.consumir(tokens_estimados)
+                        return
+
+                    # Acorda antes se chegar alguém com prioridade maior ou houver devolução
+                    self._condicao.wait(espera)
+            finally:
+                self._fila.remove(senha)
+                heapq.heapify(self._fila)
+                self._condicao.notify_all()
+
+    def ajustar_tokens(self, tokens_reservados: int, tokens_reais: int):
+        """
+        Corrige a reserva de tokens pelo consumo informado na resposta.
+        """
+        with self._condicao:
+            diferenca = tokens_reservados - tokens_reais
+            if diferenca > 0:
+                self._tokens.devolver(diferenca)
+            else:
+                self._tokens.consumir(-diferenca)
+            self._condicao.notify_all()
+
+    def _aplicar_fator(self):
+        self._requisicoes.reposicao_por_segundo = self.requisicoes_por_minuto * self._fator / 60
+        self._tokens.reposicao_por_segundo = self.tokens_por_minuto * self._fator / 60
+
+    def registrar_sucesso(self):
+        """Recupera gradualmente a vazão após uma redução."""
+        with self._condicao:
+            if self._fator < 1.0:
+                self._fator = min(1.0, self._fator + self.INCREMENTO_FATOR)
+                self._aplicar_fator()
+
+    def registrar_limite_excedido(self, pausa_segundos: float):
+        """
+        Reage a um 429: pausa todas as chamadas e reduz a vazão pela metade.
+        """
+        with self._condicao:
+            self._limites_excedidos += 1
+            self._fator = max(self.FATOR_MINIMO, self._fator / 2)
+            self._aplicar_fator()
+
+            agora = time.monotonic()
+            self._pausado_ate = max(self._pausado_ate, agora + pausa_segundos)
+            # Descarta o acúmulo para não disparar uma rajada ao fim da pausa
+            self._requisicoes.limitar_acumulo(1, agora)
+            self._condicao.notify_all()
+
+    def estatisticas(self) -> Dict[str, Any]:
+        with self._condicao:
+            return {
+                "limite_rpm": self.requisicoes_por_minuto,
+                "limite_tpm": self.tokens_por_minuto,
+                "vazao_atual_percentual": round(self._fator * 100),
+                "requisicoes_na_fila": len(self._fila),
+                "limites_excedidos": self._limites_excedidos
+            }
+
+
+class PoliticaRetentativa:
+    """
+    Backoff exponencial com jitter para erros transitórios (429, 5xx, rede).
+    """
+
+    CODIGOS_RETENTAVEIS = {408, 429, 500, 502, 503, 504}
+    ERROS_REDE = ("Timeout", "ConnectError", "ConnectionError", "RemoteProtocolError", "ReadError")
+
+    def __init__(self, max_tentativas: int = 4, espera_base: float = 1.0, espera_maxima: float = 30.0):
+        """
+        Args:
+            max_tentativas (int): Total de tentativas, incluindo a primeira
+            espera_base (float): Espera da primeira retentativa, em segundos
+            espera_maxima (float): Teto da espera entre tentativas
+        """
+        self.max_tentativas = max(1, max_tentativas)
+        self.espera_base = espera_base
+        self.espera_maxima = espera_maxima
+
+    @staticmethod
+    def obter_codigo_http(erro: Exception) -> Optional[int]:
+        for atributo in ("code", "status_code"):
+            codigo = getattr(erro, atributo, None)
+            if isinstance(codigo, int):
+                return codigo
+
+        resposta = getattr(erro, "response", None)
+        codigo = getattr(resposta, "status_code", None)
+        return codigo if isinstance(codigo, int) else None
+
+    def eh_retentavel(self, erro: Exception) -> bool:
+        codigo = self.obter_codigo_http(erro)
+        if codigo is not None:
+            return codigo in self.CODIGOS_RETENTAVEIS
+
+        if isinstance(erro, (TimeoutError, ConnectionError)):
+            return True
+        return any(nome in type(erro).__name__ for nome in self.ERROS_REDE)
+
+    def calcular_espera(self, tentativa: int, erro: Optional[Exception] = None) -> float:
+        """
+        Espera antes da próxima tentativa (entre metade e o total do teto
+        exponencial, sorteada para dessincronizar as threads), respeitando o
+        retryDelay sugerido pelo provedor quando presente no erro.
+
+        Args:
+            tentativa (int): Número da tentativa que falhou (0 = primeira)
+        """
+        teto = min(self.espera_maxima, self.espera_base * (2 ** tentativa))
+        espera = random.uniform(teto / 2, teto)
+
+        if erro is not None:
+            sugerida = re.search(r"retry_?delay['\"]?\s*[:=]\s*['\"]?(\d+(?:\.\d+)?)s", str(erro), re.IGNORECASE)
+            if sugerida:
+                espera = max(espera, min(float(sugerida.group(1)), self.espera_maxima))
+
+        return espera
@@ -0,0 +1,114 @@
+"""Compatibilidade de vários candidatos com a vaga em operações vetorizadas (NumPy)"""
+
+from typing import Dict, List, Optional, Sequence, Iterable
+import numpy as np
+from perfil_vaga import PerfilVaga
+from taxonomia_habilidades import obter_taxonomia_padrao
+
+# Palavras que somam bônus à compatibilidade quando aparecem no currículo
+PALAVRAS_EXPERIENCIA = ('anos', 'experiência', 'projeto', 'desenvolvimento', 'gestão')
+BONUS_POR_PALAVRA = 2
+
+# Compatibilidade atribuída quando a vaga não cita habilidades conhecidas
+COMPATIBILIDADE_SEM_HABILIDADES = 70
+
+
+def matriz_presenca(conjuntos: Sequence[Iterable[str]], vocabulario: Sequence[str]) -> np.ndarray:
+    """
+    Matriz N x M com 1 onde o candidato i possui o termo j do vocabulário.
+
+    Args:
+        conjuntos: Termos de cada candidato (ex.: chaves canônicas da taxonomia)
+        vocabulario: Termos das colunas, na ordem desejada
+    """
+    indice = {termo: coluna for coluna, termo in enumerate(vocabulario)}
+    linhas, colunas = [], []
+    for linha, termos in enumerate(conjuntos):
+        for termo in set(termos):
+            coluna = indice.get(termo)
+            if coluna is not None:
+                linhas.append(linha)
+                colunas.append(coluna)
+
+    matriz = np.zeros((len(conjuntos), len(vocabulario)), dtype=np.float64)
+    matriz[linhas, colunas] = 1.0
+    return matriz
+
+
+class MatrizCompatibilidade:
+    """
+    Candidatos x habilidades da vaga: a cobertura, a cobertura ponderada pelo
+    peso de cada requisito e o bônus de experiência saem de produtos e somas
+    de matrizes, de uma vez para todo o lote.
+    """
+
+    def __init__(self, perfil_vaga: PerfilVaga):
+        self.perfil_vaga = perfil_vaga
+        self.vocabulario: List[str] = list(perfil_vaga.pesos_habilidades)
+        self.pesos = np.array([perfil_vaga.pesos_habilidades[chave] for chave in self.vocabulario],
+                              dtype=np.float64)
+
+    def calcular(self, habilidades_candidatos: Sequence[Iterable[str]],
+                 textos: Optional[Sequence[str]] = None) -> Dict[str, np.ndarray]:
+        """
+        Args:
+            habilidades_candidatos: Chaves canônicas encontradas em cada currículo
+            textos: Textos dos currículos, para o bônus de experiência (opcional)
+
+        Returns:
+            Dict: Vetores de tamanho N com cobertura e cobertura_ponderada (0-100),
+                bonus e compatibilidade (inteiro, 0-100, como _calcular_compatibilidade)
+        """
+        total = len(habilidades_candidatos)
+        presenca = matriz_presenca(habilidades_candidatos, self.vocabulario)
+
+        if textos is not None:
+            palavras = np.array([
+                [palavra in texto for palavra in PALAVRAS_EXPERIENCIA]
+                for texto in (texto.lower() for texto in textos)
+            ], dtype=np.float64).reshape(total, len(PALAVRAS_EXPERIENCIA))
+            bonus = palavras.sum(axis=1) * BONUS_POR_PALAVRA
+        else:
+            bonus = np.zeros(total, dtype=np.float64)
+
+        if not self.vocabulario:
+            return {
+                "cobertura": np.zeros(total, dtype=np.float64),
+                "cobertura_ponderada": np.zeros(total, dtype=np.float64),
+                "bonus": bonus,
+                "compatibilidade": np.full(total, COMPATIBILIDADE_SEM_HABILIDADES, dtype=np.int64)
+            }
+
+        cobertura = presenca.mean(axis=1) * 100
+        cobertura_ponderada = presenca @ self.pesos / self.pesos.sum() * 100
+        compatibilidade = np.minimum(100, np.floor(cobertura_ponderada + bonus)).astype(np.int64)
+
+        return {
+            "cobertura": cobertura,
+            "cobertura_ponderada": cobertura_ponderada,
+            "bonus": bonus,
+            "compatibilidade": compatibilidade
+        }
+
+    @staticmethod
+    def ranquear(metricas: Dict[str, np.ndarray]) -> np.ndarray:
+        """
+        Args:
+            metricas (Dict): Retorno de calcular()
+
+        Returns:
+            np.ndarray: Índices dos candidatos da maior para a menor compatibilidade
+                (empates pela cobertura ponderada, depois pela ordem original)
+        """
+        compatibilidade = metricas["compatibilidade"]
+        return np.lexsort((np.arange(len(compatibilidade)),
+                           -metricas["cobertura_ponderada"], -compatibilidade))
+
+
+def calcular_compatibilidades(textos: Sequence[str], perfil_vaga: PerfilVaga) -> np.ndarray:
+    """
+    Compatibilidade (0-100) de cada texto de currículo com a vaga.
+    """
+    taxonomia = obter_taxonomia_padrao()
+    habilidades = [taxonomia.extrair_lista(texto) for texto in textos]
+    return MatrizCompatibilidade(perfil_vaga).calcular(habilidades, textos)["compatibilidade"]
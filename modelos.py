@@ -0,0 +1,304 @@
+"""Modelos tipados do perfil do candidato e do resultado da avaliação"""
+
+import sys
+from dataclasses import dataclass, field, fields
+from typing import Dict, Any, List, Optional, Union
+
+# slots=True (Python 3.10+) elimina o __dict__ de cada instância, o que pesa
+# quando um lote mantém milhares de resultados em memória
+_DATACLASS_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+NAO_IDENTIFICADO = "Não identificado"
+
+LIMITE_PONTOS = 5
+LIMITE_HABILIDADES = 10
+
+
+def classificar_score(score: float) -> str:
+    """Classificação textual do score (0-100)."""
+    if score >= 90:
+        return "Excepcional"
+    elif score >= 80:
+        return "Muito Bom"
+    elif score >= 70:
+        return "Bom"
+    elif score >= 60:
+        return "Regular"
+    elif score >= 50:
+        return "Inadequado"
+    else:
+        return "Rejeitado"
+
+
+def _lista_textos(valor: Any, limite: Optional[int] = None) -> List[str]:
+    if not isinstance(valor, list):
+        return []
+    textos = [str(item).strip() for item in valor if str(item).strip()]
+    return textos[:limite] if limite else textos
+
+
+def _texto(valor: Any, padrao: str) -> str:
+    return valor if isinstance(valor, str) and valor.strip() else padrao
+
+
+def _identificado(valor: Any) -> bool:
+    return isinstance(valor, str) and valor.strip() != "" and valor != NAO_IDENTIFICADO
+
+
+@dataclass(**_DATACLASS_SLOTS)
+class PerfilCandidato:
+    """
+    Dados do candidato: os básicos vêm da avaliação e os demais, opcionais
+    (None = não disponível), dos dados estruturados da extração.
+    """
+
+    nome: str = NAO_IDENTIFICADO
+    email: str = NAO_IDENTIFICADO
+    telefone: str = NAO_IDENTIFICADO
+    experiencia_anos: Union[float, str] = NAO_IDENTIFICADO
+    nivel_senioridade: str = "A definir"
+    principais_habilidades: List[str] = field(default_factory=list)
+
+    linkedin: Optional[str] = None
+    github: Optional[str] = None
+    endereco: Optional[str] = None
+    experiencias_detalhadas: Optional[List[Dict[str, Any]]] = None
+    areas_atuacao: Optional[List[str]] = None
+    progressao_carreira: Optional[str] = None
+    linguagens_programacao: Optional[List[str]] = None
+    frameworks_bibliotecas: Optional[List[str]] = None
+    ferramentas_devops: Optional[List[str]] = None
+    cloud_platforms: Optional[List[str]] = None
+    soft_skills_identificadas: Optional[List[str]] = None
+    idiomas: Optional[List[Dict[str, Any]]] = None
+    formacao_superior: Optional[List[Dict[str, Any]]] = None
+    certificacoes_tecnicas: Optional[List[Dict[str, Any]]] = None
+    cursos_complementares: Optional[List[Dict[str, Any]]] = None
+    nivel_educacional: Optional[str] = None
+    area_formacao: Optional[str] = None
+    projetos_destaque: Optional[List[Dict[str, Any]]] = None
+    conquistas_quantificadas: Optional[List[str]] = None
+    reconhecimentos: Optional[List[str]] = None
+    contribuicoes_open_source: Optional[List[Dict[str, Any]]] = None
+    score_completude_dados: Optional[int] = None
+    areas_especialidade: Optional[List[str]] = None
+    pontos_fortes_ia: Optional[List[str]] = None
+    gaps_identificados: Optional[List[str]] = None
+    qualidade_extracao_dados: Optional[str] = None
+    metodo_extracao_usado: Optional[str] = None
+
+    def aplicar_dados_estruturados(self, dados_estruturados: Dict[str, Any]):
+        """
+        Completa o perfil com os dados estruturados do extrator, que têm
+        precedência sobre os dados básicos informados pela avaliação.
+        """
+        dados_pessoais = dados_estruturados.get("dados_pessoais", {})
+        if _identificado(dados_pessoais.get("nome_completo")):
+            self.nome = dados_pessoais["nome_completo"]
+        if _identificado(dados_pessoais.get("email")):
+            self.email = dados_pessoais["email"]
+        if _identificado(dados_pessoais.get("telefone")):
+            self.telefone = dados_pessoais["telefone"]
+
+        self.linkedin = dados_pessoais.get("linkedin", NAO_IDENTIFICADO)
+        self.github = dados_pessoais.get("github", NAO_IDENTIFICADO)
+        self.endereco = dados_pessoais.get("endereco", NAO_IDENTIFICADO)
+
+        experiencia = dados_estruturados.get("experiencia_profissional", {})
+        anos = experiencia.get("tempo_total_experiencia_anos")
+        if anos:
+            self.experiencia_anos = anos
+        self.experiencias_detalhadas = experiencia.get("experiencias", [])
+        self.areas_atuacao = experiencia.get("areas_de_atuacao", [])
+        self.progressao_carreira = experiencia.get("progressao_carreira", NAO_IDENTIFICADO)
+
+        habilidades = dados_estruturados.get("habilidades_competencias", {})
+        if habilidades:
+            self.linguagens_programacao = habilidades.get("linguagens_programacao", [])
+            self.frameworks_bibliotecas = habilidades.get("frameworks_bibliotecas", [])
+            self.ferramentas_devops = habilidades.get("ferramentas_devops", [])
+            self.cloud_platforms = habilidades.get("cloud_platforms", [])
+            self.soft_skills_identificadas = habilidades.get("soft_skills", [])
+            self.idiomas = habilidades.get("idiomas", [])
+            self.principais_habilidades = (
+                habilidades.get("linguagens_programacao", [])[:3] +
+                habilidades.get("frameworks_bibliotecas", [])[:2] +
+                habilidades.get("especializacoes", [])[:2]
+            )[:5]
+
+        formacao = dados_estruturados.get("formacao_educacao", {})
+        if formacao:
+            self.formacao_superior = formacao.get("formacao_superior", [])
+            self.certificacoes_tecnicas = formacao.get("certificacoes", [])
+            self.cursos_complementares = formacao.get("cursos_complementares", [])
+            self.nivel_educacional = formacao.get("nivel_educacional", NAO_IDENTIFICADO)
+            self.area_formacao = formacao.get("area_formacao", NAO_IDENTIFICADO)
+
+        projetos = dados_estruturados.get("projetos_conquistas", {})
+        if projetos:
+            self.projetos_destaque = projetos.get("projetos_destaque", [])
+            self.conquistas_quantificadas = projetos.get("conquistas_quantificadas", [])
+            self.reconhecimentos = projetos.get("reconhecimentos", [])
+            self.contribuicoes_open_source = projetos.get("contribuicoes_open_source", [])
+
+        metricas = dados_estruturados.get("metricas_calculadas", {})
+        if metricas:
+            self.score_completude_dados = metricas.get("score_completude", 0)
+            self.nivel_senioridade = metricas.get("nivel_senioridade_calculado", "A definir")
+            self.areas_especialidade = metricas.get("areas_especialidade", [])
+            self.pontos_fortes_ia = metricas.get("pontos_fortes_identificados", [])
+            self.gaps_identificados = metricas.get("gaps_identificados", [])
+
+        qualidade = dados_estruturados.get("qualidade_extracao", "N/A")
+        self.qualidade_extracao_dados = qualidade
+        self.metodo_extracao_usado = "IA_AVANCADA" if "IA" in qualidade else "REGEX_BASICA"
+
+        # O tempo total de experiência extraído define a senioridade
+        if anos:
+            if anos >= 8:
+                self.nivel_senioridade = "Especialista"
+            elif anos >= 5:
+                self.nivel_senioridade = "Senior"
+            elif anos >= 2:
+                self.nivel_senioridade = "Pleno"
+            else:
+                self.nivel_senioridade = "Junior"
+
+    def para_dict(self) -> Dict[str, Any]:
+        """Campos com as chaves usadas no resultado; opcionais ausentes ficam de fora."""
+        dados = {}
+        for atributo, chave in _CHAVES_PERFIL:
+            valor = getattr(self, atributo)
+            if valor is not None:
+                dados[chave] = valor
+        return dados
+
+
+# Atributos do perfil cujo nome no resultado leva o sufixo "_candidato"
+_CHAVES_RENOMEADAS = {
+    "nome": "nome_candidato",
+    "email": "email_candidato",
+    "telefone": "telefone_candidato",
+    "linkedin": "linkedin_candidato",
+    "github": "github_candidato",
+    "endereco": "endereco_candidato"
+}
+_CHAVES_PERFIL = tuple(
+    (campo.name, _CHAVES_RENOMEADAS.get(campo.name, campo.name)) for campo in fields(PerfilCandidato)
+)
+
+
+@dataclass(**_DATACLASS_SLOTS)
+class ResultadoAvaliacao:
+    """
+    Resultado da avaliação de um currículo.
+
+    É criado já validado (de_resposta_ia ou de_erro), enriquecido pelo
+    sistema e convertido em dicionário uma única vez com para_dict().
+    """
+
+    score: int = 0
+    classificacao: str = classificar_score(0)
+    pontos_fortes: List[str] = field(default_factory=list)
+    pontos_fracos: List[str] = field(default_factory=list)
+    avaliacao_detalhada: str = "Avaliação não disponível"
+    resumo: str = ""
+    score_detalhado: Dict[str, int] = field(default_factory=dict)
+    recomendacao_contratacao: Optional[str] = None
+    risk_assessment: Optional[str] = None
+    proximos_passos: List[str] = field(default_factory=list)
+    compatibilidade_vaga: Optional[int] = None
+    sugestoes_melhoria: List[str] = field(default_factory=list)
+    aviso_fallback: bool = False
+    erro: Optional[str] = None
+    arquivo_original: Optional[str] = None
+    timestamp_avaliacao: Optional[str] = None
+    candidato: PerfilCandidato = field(default_factory=PerfilCandidato)
+
+    @property
+    def sucesso(self) -> bool:
+        return self.erro is None
+
+    @classmethod
+    def de_resposta_ia(cls, dados: Dict[str, Any]) -> "ResultadoAvaliacao":
+        """
+        Ponto único de validação da resposta da IA: score entre 0 e 100,
+        listas de textos limpas e limitadas e valores padrão nos campos ausentes.
+        """
+        if "erro" in dados:
+            return cls.de_erro(str(dados["erro"]))
+
+        score = dados.get("score", 0)
+        if isinstance(score, bool) or not isinstance(score, (int, float)) or not 0 <= score <= 100:
+            score = 0
+        score = int(score)
+
+        experiencia_anos = dados.get("experiencia_anos")
+        if isinstance(experiencia_anos, bool) or not isinstance(experiencia_anos, (int, float, str)):
+            experiencia_anos = NAO_IDENTIFICADO
+
+        score_detalhado = dados.get("score_detalhado", {})
+        if not isinstance(score_detalhado, dict):
+            score_detalhado = {}
+
+        resultado = cls(
+            score=score,
+            classificacao=classificar_score(score),
+            pontos_fortes=_lista_textos(dados.get("pontos_fortes"), LIMITE_PONTOS),
+            pontos_fracos=_lista_textos(dados.get("pontos_fracos"), LIMITE_PONTOS),
+            avaliacao_detalhada=_texto(dados.get("avaliacao_detalhada"), "Avaliação não disponível"),
+            score_detalhado={
+                criterio: int(valor) for criterio, valor in score_detalhado.items()
+                if isinstance(valor, (int, float)) and not isinstance(valor, bool)
+            },
+            recomendacao_contratacao=dados.get("recomendacao_contratacao"),
+            risk_assessment=dados.get("risk_assessment"),
+            proximos_passos=_lista_textos(dados.get("proximos_passos")),
+            aviso_fallback=bool(dados.get("aviso_fallback", False)),
+            candidato=PerfilCandidato(
+                nome=_texto(dados.get("nome_candidato"), NAO_IDENTIFICADO),
+                email=_texto(dados.get("email_candidato"), NAO_IDENTIFICADO),
+                telefone=_texto(dados.get("telefone_candidato"), NAO_IDENTIFICADO),
+                experiencia_anos=experiencia_anos,
+                nivel_senioridade=_texto(dados.get("nivel_senioridade"), "A definir"),
+                principais_habilidades=_lista_textos(dados.get("principais_habilidades"), LIMITE_HABILIDADES)
+            )
+        )
+        resultado.resumo = resultado._gerar_resumo()
+        return resultado
+
+    @classmethod
+    def de_erro(cls, mensagem_erro: str) -> "ResultadoAvaliacao":
+        return cls(
+            classificacao="Erro",
+            avaliacao_detalhada=f"Não foi possível processar a avaliação: {mensagem_erro}",
+            resumo=f"Erro na avaliação: {mensagem_erro}",
+            erro=mensagem_erro
+        )
+
+    def _gerar_resumo(self) -> str:
+        resumo = f"Candidato com classificação {self.classificacao} ({self.score}/100). "
+
+        if self.pontos_fortes:
+            resumo += f"Principais qualificações: {', '.join(self.pontos_fortes[:2])}. "
+
+        if self.pontos_fracos:
+            resumo += f"Principais lacunas: {', '.join(self.pontos_fracos[:2])}."
+
+        return resumo
+
+    def para_dict(self) -> Dict[str, Any]:
+        """
+        Dicionário plano no formato consumido pela interface, ranking e
+        exportações (dados do candidato no mesmo nível da avaliação).
+        """
+        dados: Dict[str, Any] = {"sucesso": self.sucesso}
+        for atributo in _CAMPOS_RESULTADO:
+            valor = getattr(self, atributo)
+            if valor is not None:
+                dados[atributo] = valor
+        dados.update(self.candidato.para_dict())
+        return dados
+
+
+_CAMPOS_RESULTADO = tuple(campo.name for campo in fields(ResultadoAvaliacao) if campo.name != "candidato")
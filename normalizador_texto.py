@@ -0,0 +1,255 @@
+"""Normalização dos textos de currículo e vaga em uma etapa única (tabelas de str.translate e regex combinada)"""
+
+import re
+import sys
+import timeit
+import unicodedata
+from typing import Callable, Dict
+from padroes_texto import EMAIL_REGEX, TELEFONE_REGEX
+
+# Acima deste tamanho o texto do currículo é truncado para conter o custo da API
+LIMITE_TEXTO_CURRICULO = 5000
+TAMANHO_TEXTO_TRUNCADO = 4500
+AVISO_TRUNCAMENTO = "\n\n[TEXTO TRUNCADO PARA OTIMIZAÇÃO]"
+
+# Caracteres removidos do currículo: símbolos fora de letras, dígitos, espaços e
+# desta pontuação (marcadores, emojis, aspas tipográficas, controles...). "#" e "+"
+# ficam, pois fazem parte de nomes de habilidades da taxonomia (c#, c++, f#)
+REMOVIDOS_CURRICULO_REGEX = re.compile(r'[^\w\s@.\-(),;:!?#+]+')
+
+# Título da seção -> palavras que a identificam (sem diferenciar maiúsculas)
+SECOES_CURRICULO = {
+    "EXPERIÊNCIA PROFISSIONAL": ("EXPERIÊNCIA", "EXPERIENCE", "HISTÓRICO", "CARREIRA"),
+    "FORMAÇÃO": ("FORMAÇÃO", "EDUCAÇÃO", "EDUCATION", "ACADEMIC"),
+    "HABILIDADES": ("HABILIDADES", "SKILLS", "COMPETÊNCIAS"),
+    "CERTIFICAÇÕES": ("CERTIFICAÇÕES", "CERTIFICATES", "CURSOS"),
+}
+
+MARCADORES_SECAO = {
+    palavra: f"\n\n{titulo}:\n"
+    for titulo, palavras in SECOES_CURRICULO.items()
+    for palavra in palavras
+}
+
+MARCADOR_EMAIL = "\n\nCONTATO - EMAIL: {}\n"
+MARCADOR_TELEFONE = "\n\nCONTATO - TELEFONE: {}\n"
+
+
+def _sem_diferenciar_maiusculas(palavra: str) -> str:
+    return "".join(f"[{letra}{letra.lower()}]" if letra.lower() != letra else re.escape(letra)
+                   for letra in palavra)
+
+
+def _compilar_secoes() -> re.Pattern:
+    # Uma alternância para todas as seções, agrupada pela letra inicial. As classes
+    # [Ee] no lugar de re.IGNORECASE e o lookahead da letra inicial deixam o
+    # motor de regex descartar rapidamente as posições que não podem casar.
+    por_inicial: Dict[str, list] = {}
+    for palavra in sorted(MARCADORES_SECAO):
+        por_inicial.setdefault(palavra[0], []).append(palavra[1:])
+
+    alternativas = "|".join(
+        _sem_diferenciar_maiusculas(inicial) + "(?:" + "|".join(map(_sem_diferenciar_maiusculas, restos)) + ")"
+        for inicial, restos in por_inicial.items()
+    )
+    iniciais = "".join(inicial + inicial.lower() for inicial in por_inicial)
+    return re.compile(rf"(?<!\w)(?=[{iniciais}])(?:{alternativas})(?!\w)")
+
+
+SECOES_REGEX = _compilar_secoes()
+
+
+class TabelaTraducao(dict):
+    """
+    Tabela de str.translate preenchida sob demanda: cada caractere é
+    classificado uma única vez e, daí em diante, a consulta é um acesso ao dict.
+    """
+
+    def __init__(self, remover: Callable[[str], bool]):
+        super().__init__()
+        self._remover = remover
+
+    def __missing__(self, codigo: int):
+        valor = None if self._remover(chr(codigo)) else codigo
+        self[codigo] = valor
+        return valor
+
+
+# Controles e formatação invisível (\u200b, \ufeff, \xad); os espaços ficam com o split
+TABELA_CONTROLE = TabelaTraducao(
+    lambda caractere: unicodedata.category(caractere) in ("Cc", "Cf") and not caractere.isspace()
+)
+
+# Para texto ASCII, str.translate roda no caminho rápido do CPython (bem à frente da
+# regex); fora do ASCII ela consulta a tabela caractere a caractere e a regex vence
+TABELA_CURRICULO_ASCII = {
+    codigo: None for codigo in range(128) if REMOVIDOS_CURRICULO_REGEX.match(chr(codigo))
+}
+
+
+def _colapsar_espacos(texto: str) -> str:
+    return " ".join(texto.split())
+
+
+def normalizar_texto_avaliacao(texto: str) -> str:
+    """
+    Texto em uma linha para o prompt de avaliação: espaços colapsados e
+    caracteres de controle removidos, preservando acentos e símbolos.
+    """
+    if not texto:
+        return ""
+
+    texto = _colapsar_espacos(texto)
+    # Texto já limpo (o caso comum) não passa pela tabela
+    if not texto.isprintable():
+        texto = _colapsar_espacos(texto.translate(TABELA_CONTROLE))
+    return texto
+
+
+def normalizar_curriculo(texto: str, limite: int = LIMITE_TEXTO_CURRICULO) -> str:
+    """
+    Limpa o texto do currículo e marca as seções comuns e o primeiro contato.
+
+    Args:
+        texto (str): Texto extraído do currículo
+        limite (int): Tamanho acima do qual o texto é truncado
+
+    Returns:
+        str: Texto limpo, com títulos como "EXPERIÊNCIA PROFISSIONAL:" em linhas próprias
+    """
+    if not texto:
+        return ""
+
+    if texto.isascii():
+        texto = texto.translate(TABELA_CURRICULO_ASCII)
+    else:
+        # Compõe os acentos antes (PDFs costumam extrair "e" + acento combinante)
+        texto = REMOVIDOS_CURRICULO_REGEX.sub("", unicodedata.normalize("NFC", texto))
+    texto = _colapsar_espacos(texto)
+
+    # Trechos substituídos (início, fim, marcador), coletados numa passada pelas
+    # seções; o primeiro e-mail e o primeiro telefone são buscas que param cedo
+    trechos = []
+    email = EMAIL_REGEX.search(texto)
+    if email:
+        trechos.append((email.start(), email.end(), MARCADOR_EMAIL.format(email.group(0))))
+    telefone = TELEFONE_REGEX.search(texto)
+    if telefone:
+        trechos.append((telefone.start(), telefone.end(), MARCADOR_TELEFONE.format(telefone.group(0))))
+    for secao in SECOES_REGEX.finditer(texto):
+        trechos.append((secao.start(), secao.end(), MARCADORES_SECAO[secao.group(0).upper()]))
+
+    partes = []
+    posicao = 0
+    for inicio, fim, marcador in sorted(trechos, key=lambda trecho: (trecho[0], -trecho[1])):
+        # Sobreposições (ex.: "carreira@empresa.com"): vale o trecho que começa antes, e o mais longo
+        if inicio < posicao:
+            continue
+        partes.append(texto[posicao:inicio])
+        partes.append(marcador)
+        posicao = fim
+    partes.append(texto[posicao:])
+    texto = "".join(partes)
+
+    if len(texto) > limite:
+        # Prioriza as primeiras seções (geralmente mais importantes)
+        texto = texto[:TAMANHO_TEXTO_TRUNCADO] + AVISO_TRUNCAMENTO
+
+    return texto.strip()
+
+
+def _normalizar_encadeado(texto: str) -> str:
+    """Cadeia de re.sub usada antes desta etapa (referência para o benchmark)."""
+    texto_limpo = re.sub(r'\s+', ' ', texto)
+    texto_limpo = re.sub(r'[^\w\s@.\-(),;:!?\n]', '', texto_limpo)
+    texto_limpo = re.sub(r'\b(EXPERIÊNCIA|EXPERIENCE|HISTÓRICO|CARREIRA)\b', '\n\nEXPERIÊNCIA PROFISSIONAL:\n', texto_limpo, flags=re.IGNORECASE)
+    texto_limpo = re.sub(r'\b(FORMAÇÃO|EDUCAÇÃO|EDUCATION|ACADEMIC)\b', '\n\nFORMAÇÃO:\n', texto_limpo, flags=re.IGNORECASE)
+    texto_limpo = re.sub(r'\b(HABILIDADES|SKILLS|COMPETÊNCIAS)\b', '\n\nHABILIDADES:\n', texto_limpo, flags=re.IGNORECASE)
+    texto_limpo = re.sub(r'\b(CERTIFICAÇÕES|CERTIFICATES|CURSOS)\b', '\n\nCERTIFICAÇÕES:\n', texto_limpo, flags=re.IGNORECASE)
+    texto_limpo = EMAIL_REGEX.sub(r'\n\nCONTATO - EMAIL: \g<0>\n', texto_limpo, count=1)
+    texto_limpo = TELEFONE_REGEX.sub(r'\n\nCONTATO - TELEFONE: \g<0>\n', texto_limpo, count=1)
+    if len(texto_limpo) > LIMITE_TEXTO_CURRICULO:
+        texto_limpo = texto_limpo[:TAMANHO_TEXTO_TRUNCADO] + AVISO_TRUNCAMENTO
+    texto_limpo = texto_limpo.strip()
+
+    # Segunda passada, do avaliador (remove também \x80-\xff, ou seja, os acentos)
+    texto_limpo = re.sub(r'\s+', ' ', texto_limpo)
+    texto_limpo = re.sub(r'[\x00-\x08\x0b\x0c\x0e-\x1f\x7f-\xff]', '', texto_limpo)
+    return texto_limpo.strip()
+
+
+def _normalizar_etapa_unica(texto: str) -> str:
+    return normalizar_texto_avaliacao(normalizar_curriculo(texto))
+
+
+TEXTO_EXEMPLO = """Maria José Conceição • Desenvolvedora Python Sênior
+maria.conceicao@exemplo.com.br | (11) 98765-4321 | São Paulo – SP
+
+EXPERIÊNCIA
+2019 – atual: Engenheira de Software na Ação Logística ★ APIs em Django e FastAPI,
+migração para AWS (ECS, Lambda), orquestração com Kubernetes; redução de 40% no custo.
+2015 – 2019: Desenvolvedora na Inovação & Cia — ETL com Pandas, PostgreSQL e Airflow.
+
+FORMAÇÃO
+Bacharelado em Ciência da Computação – Universidade de São Paulo (2014)
+
+HABILIDADES
+Python, Django, FastAPI, Docker, Kubernetes, AWS, SQL, Git, Scrum “ágil”
+
+CURSOS
+Certificação AWS Solutions Architect — Associate; Inglês avançado (C1)
+"""
+
+
+def _medir(funcao: Callable[[str], str], textos, repeticoes: int) -> float:
+    """Melhor tempo, em microssegundos por texto."""
+    tempos = timeit.repeat(lambda: [funcao(texto) for texto in textos], number=1, repeat=repeticoes)
+    return min(tempos) / len(textos) * 1e6
+
+
+def comparar_desempenho(textos, repeticoes: int = 20) -> Dict[str, float]:
+    """
+    Compara a etapa única com a cadeia de re.sub de currículo + avaliador.
+
+    Returns:
+        Dict: Microssegundos por texto de cada implementação e o ganho
+    """
+    textos = list(textos)
+    # Aquece as tabelas de tradução e o cache de regex do módulo re
+    _normalizar_encadeado(textos[0])
+    _normalizar_etapa_unica(textos[0])
+
+    encadeado = _medir(_normalizar_encadeado, textos, repeticoes)
+    etapa_unica = _medir(_normalizar_etapa_unica, textos, repeticoes)
+    return {
+        "encadeado_us": round(encadeado, 1),
+        "etapa_unica_us": round(etapa_unica, 1),
+        "ganho": round(encadeado / etapa_unica, 2) if etapa_unica else 0.0
+    }
+
+
+def main(argv=None) -> int:
+    argv = sys.argv[1:] if argv is None else argv
+    if len(argv) > 1:
+        print("Uso: python normalizador_texto.py [arquivo_texto.txt]", file=sys.stderr)
+        return 2
+
+    if argv:
+        try:
+            with open(argv[0], encoding="utf-8") as arquivo:
+                textos = [arquivo.read()]
+        except OSError as e:
+            print(f"❌ Não foi possível ler o arquivo: {e}", file=sys.stderr)
+            return 1
+    else:
+        textos = [TEXTO_EXEMPLO * vezes for vezes in (1, 4, 16)]
+
+    for texto in textos:
+        resultado = comparar_desempenho([texto])
+        print(f"{len(texto):>7} caracteres: encadeado {resultado['encadeado_us']:>9} µs | "
+              f"etapa única {resultado['etapa_unica_us']:>9} µs | {resultado['ganho']}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
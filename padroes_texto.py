@@ -0,0 +1,197 @@
+"""Padrões de texto compartilhados: expressões regulares pré-compiladas e busca de palavras-chave"""
+
+import re
+import threading
+from typing import Dict, List, Iterable, Optional
+
+# Contato
+EMAIL_REGEX = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b')
+TELEFONE_REGEX = re.compile(r'(\(?\d{2}\)?[\s-]?\d{4,5}[\s-]?\d{4})')
+TELEFONE_COMPLETO_REGEX = re.compile(
+    r'(\(?\d{2}\)?[\s-]?\d{4,5}[\s-]?\d{4})|(\+?\d{2}[\s-]?\(?\d{2}\)?[\s-]?\d{4,5}[\s-]?\d{4})'
+)
+LINKEDIN_REGEX = re.compile(r'(?:linkedin\.com/in/|linkedin\.com/profile/)([A-Za-z0-9-_]+)', re.IGNORECASE)
+GITHUB_REGEX = re.compile(r'(?:github\.com/)([A-Za-z0-9-_]+)', re.IGNORECASE)
+
+# Vocabulários das heurísticas locais, por finalidade. As habilidades em si
+# (linguagens, frameworks, ferramentas...) ficam em taxonomia_habilidades.
+CATEGORIAS_PADRAO = {
+    # ExtratorInteligente._identificar_especialidades
+    "especialidade_frontend": ['react', 'angular', 'vue', 'next'],
+    "especialidade_backend": ['python', 'java', 'node', 'php'],
+    "especialidade_devops": ['docker', 'kubernetes', 'aws', 'azure'],
+    "especialidade_dados": ['machine learning', 'tensorflow', 'pandas', 'sql']
+}
+
+
+def _eh_caractere_palavra(caractere: str) -> bool:
+    return caractere.isalnum() or caractere == '_'
+
+
+def _continua_palavra(texto: str, posicao: int, passo: int) -> bool:
+    """
+    Indica se o caractere vizinho a um termo (em posicao, andando passo) ainda faz
+    parte da mesma palavra. Um "." entre alfanuméricos também conta, para que
+    "js" não case dentro de "node.js" nem "node" dentro de "node.js".
+    """
+    caractere = texto[posicao]
+    if _eh_caractere_palavra(caractere):
+        return True
+    seguinte = posicao + passo
+    return (caractere == '.' and 0 <= seguinte < len(texto)
+            and _eh_caractere_palavra(texto[seguinte]))
+
+
+class MotorPalavrasChave:
+    """
+    Busca de múltiplas palavras-chave em uma única passada (Aho-Corasick).
+
+    Todos os termos de todas as categorias são compilados num único autômato,
+    e o texto é percorrido uma só vez, independentemente do número de termos.
+    As correspondências respeitam limites de palavra (como \\b em regex), de modo
+    que termos curtos como "r" ou "go" não casam dentro de outras palavras; um
+    "." entre letras ou dígitos não é limite ("js" não casa em "node.js").
+    """
+
+    def __init__(self, categorias: Dict[str, Iterable[str]]):
+        """
+        Args:
+            categorias (Dict): Nome da categoria -> termos (comparados em minúsculas)
+        """
+        self._transicoes: List[Dict[str, int]] = [{}]
+        self._falhas: List[int] = [0]
+        self._saidas: List[List[int]] = [[]]
+        self._termos: List[str] = []
+        self._indice_termos: Dict[str, int] = {}
+        self._categorias: Dict[str, List[int]] = {}
+
+        for categoria, termos in categorias.items():
+            ids_categoria = []
+            for termo in termos:
+                termo_normalizado = termo.lower()
+                if not termo_normalizado:
+                    continue
+                id_termo = self._adicionar_termo(termo_normalizado)
+                if id_termo not in ids_categoria:
+                    ids_categoria.append(id_termo)
+            self._categorias[categoria] = ids_categoria
+
+        self._construir_falhas()
+
+    def _adicionar_termo(self, termo: str) -> int:
+        if termo in self._indice_termos:
+            return self._indice_termos[termo]
+
+        estado = 0
+        for caractere in termo:
+            proximo = self._transicoes[estado].get(caractere)
+            if proximo is None:
+                proximo = len(self._transicoes)
+                self._transicoes.append({})
+                self._falhas.append(0)
+                self._saidas.append([])
+                self._transicoes[estado][caractere] = proximo
+            estado = proximo
+
+        id_termo = len(self._termos)
+        self._termos.append(termo)
+        self._indice_termos[termo] = id_termo
+        self._saidas[estado].append(id_termo)
+        return id_termo
+
+    def _construir_falhas(self):
+        """Calcula os links de falha em largura e propaga as saídas."""
+        fila = list(self._transicoes[0].values())
+        inicio = 0
+
+        while inicio < len(fila):
+            estado = fila[inicio]
+            inicio += 1
+
+            for caractere, proximo in self._transicoes[estado].items():
+                fila.append(proximo)
+
+                falha = self._falhas[estado]
+                while falha and caractere not in self._transicoes[falha]:
+                    falha = self._falhas[falha]
+                destino = self._transicoes[falha].get(caractere, 0)
+                self._falhas[proximo] = destino if destino != proximo else 0
+                self._saidas[proximo] = self._saidas[proximo] + self._saidas[self._falhas[proximo]]
+
+    @property
+    def categorias(self) -> List[str]:
+        return list(self._categorias)
+
+    def encontrar_termos(self, texto: str) -> set:
+        """
+        Retorna os termos presentes no texto, respeitando limites de palavra.
+        """
+        texto = texto.lower()
+        tamanho = len(texto)
+        transicoes = self._transicoes
+        falhas = self._falhas
+        saidas = self._saidas
+        termos = self._termos
+        encontrados = set()
+        estado = 0
+
+        for posicao, caractere in enumerate(texto):
+            while estado and caractere not in transicoes[estado]:
+                estado = falhas[estado]
+            estado = transicoes[estado].get(caractere, 0)
+
+            for id_termo in saidas[estado]:
+                if id_termo in encontrados:
+                    continue
+
+                termo = termos[id_termo]
+                inicio = posicao - len(termo) + 1
+                fim = posicao + 1
+
+                # Só exige limite de palavra onde o próprio termo começa/termina com letra ou dígito
+                if (inicio > 0 and _eh_caractere_palavra(termo[0])
+                        and _continua_palavra(texto, inicio - 1, -1)):
+                    continue
+                if (fim < tamanho and _eh_caractere_palavra(termo[-1])
+                        and _continua_palavra(texto, fim, 1)):
+                    continue
+
+                encontrados.add(id_termo)
+
+        return {termos[id_termo] for id_termo in encontrados}
+
+    def buscar(self, texto: str, categorias: Optional[Iterable[str]] = None) -> Dict[str, List[str]]:
+        """
+        Busca todas as categorias numa única passada pelo texto.
+
+        Args:
+            texto (str): Texto a ser analisado
+            categorias (Iterable): Restringe o resultado a estas categorias (padrão: todas)
+
+        Returns:
+            Dict: Categoria -> termos encontrados, na ordem do vocabulário
+        """
+        encontrados = self.encontrar_termos(texto)
+        nomes = categorias if categorias is not None else self._categorias.keys()
+
+        return {
+            categoria: [self._termos[i] for i in self._categorias.get(categoria, [])
+                        if self._termos[i] in encontrados]
+            for categoria in nomes
+        }
+
+
+_motor_padrao = None
+_motor_padrao_lock = threading.Lock()
+
+
+def obter_motor_padrao() -> MotorPalavrasChave:
+    """
+    Retorna o motor compartilhado com o vocabulário padrão (construído uma vez por processo).
+    """
+    global _motor_padrao
+
+    with _motor_padrao_lock:
+        if _motor_padrao is None:
+            _motor_padrao = MotorPalavrasChave(CATEGORIAS_PADRAO)
+        return _motor_padrao
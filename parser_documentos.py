@@ -0,0 +1,328 @@
+"""Extração de texto de PDF/DOCX em processos separados"""
+
+import io
+import os
+import mmap
+import queue
+import signal
+import threading
+import multiprocessing
+from contextlib import contextmanager
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FuturesTimeout
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, Any, List, Optional, Union, BinaryIO, Iterator, Tuple
+
+import PyPDF2
+import docx
+
+
+# Orçamento padrão de caracteres por currículo. A avaliação e a extração com IA
+# usam no máximo ~5.000 caracteres; o restante serve às heurísticas locais.
+LIMITE_CARACTERES_PADRAO = 20000
+
+# Caminho em disco, conteúdo em memória ou fluxo binário já aberto
+FonteDocumento = Union[str, os.PathLike, bytes, bytearray, memoryview, BinaryIO]
+
+
+@contextmanager
+def abrir_fluxo(fonte: FonteDocumento):
+    """
+    Abre a fonte como fluxo binário legível sem criar arquivos temporários.
+
+    Caminhos são mapeados em memória (mmap), evitando copiar o arquivo para o
+    heap; bytes são envolvidos num BytesIO, que reaproveita o buffer original;
+    fluxos são rebobinados e usados diretamente.
+    """
+    if isinstance(fonte, (str, os.PathLike)):
+        with open(fonte, 'rb') as arquivo:
+            try:
+                mapa = mmap.mmap(arquivo.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                # Arquivo vazio não pode ser mapeado
+                yield io.BytesIO(b"")
+                return
+
+            try:
+                yield mapa
+            finally:
+                mapa.close()
+
+    elif isinstance(fonte, (bytes, bytearray, memoryview)):
+        yield io.BytesIO(fonte)
+
+    else:
+        fonte.seek(0)
+        yield fonte
+
+
+def iterar_paginas_pdf(reader: PyPDF2.PdfReader) -> Iterator[Tuple[int, str]]:
+    """
+    Percorre as páginas de um PDF sob demanda, extraindo o texto de uma por vez.
+
+    Páginas sem texto ou com erro de extração são ignoradas.
+
+    Yields:
+        Tuple[int, str]: Número da página (a partir de 1) e seu texto
+    """
+    for page_num, page in enumerate(reader.pages, 1):
+        try:
+            texto_pagina = page.extract_text()
+        except Exception as e:
+            print(f"Erro ao extrair texto da página {page_num}: {e}")
+            continue
+
+        if texto_pagina and texto_pagina.strip():
+            yield page_num, texto_pagina
+
+
+def extrair_texto_pdf(fonte: FonteDocumento,
+                      limite_caracteres: Optional[int] = LIMITE_CARACTERES_PADRAO) -> Dict[str, Any]:
+    """
+    Extrai o texto de um PDF com PyPDF2, página a página.
+
+    A leitura para assim que o limite de caracteres é atingido: páginas além
+    do limite nem chegam a ser processadas, o que evita o custo de portfólios
+    longos cujo texto seria descartado depois.
+
+    Args:
+        fonte: Caminho, conteúdo em bytes ou fluxo binário do arquivo
+        limite_caracteres (int): Máximo de caracteres a extrair (None = sem limite)
+
+    Returns:
+        Dict: Texto extraído e estatísticas de páginas
+    """
+    partes = []
+    total_caracteres = 0
+    paginas_com_texto = 0
+    paginas_lidas = 0
+    truncado = False
+
+    with abrir_fluxo(fonte) as fluxo:
+        reader = PyPDF2.PdfReader(fluxo)
+        total_paginas = len(reader.pages)
+
+        for page_num, texto_pagina in iterar_paginas_pdf(reader):
+            paginas_lidas = page_num
+            paginas_com_texto += 1
+            partes.append(texto_pagina)
+            total_caracteres += len(texto_pagina) + 1
+
+            if limite_caracteres and total_caracteres >= limite_caracteres:
+                truncado = page_num < total_paginas or total_caracteres > limite_caracteres
+                break
+        else:
+            paginas_lidas = total_paginas
+
+    texto = "\n".join(partes)
+    if limite_caracteres and truncado:
+        texto = texto[:limite_caracteres]
+
+    return {
+        "texto": texto.strip(),
+        "estatisticas": {
+            "paginas": total_paginas,
+            "paginas_lidas": paginas_lidas,
+            "paginas_com_texto": paginas_com_texto,
+            "truncado": truncado
+        }
+    }
+
+
+def extrair_texto_docx(fonte: FonteDocumento,
+                       limite_caracteres: Optional[int] = LIMITE_CARACTERES_PADRAO) -> Dict[str, Any]:
+    """
+    Extrai o texto de um DOCX com python-docx, incluindo tabelas.
+
+    Args:
+        fonte: Caminho, conteúdo em bytes ou fluxo binário do arquivo
+        limite_caracteres (int): Máximo de caracteres a extrair (None = sem limite)
+
+    Returns:
+        Dict: Texto extraído e estatísticas de parágrafos e tabelas
+    """
+    with abrir_fluxo(fonte) as fluxo:
+        doc = docx.Document(fluxo)
+
+    def iterar_blocos() -> Iterator[Tuple[bool, str]]:
+        for paragrafo in doc.paragraphs:
+            if paragrafo.text.strip():
+                yield True, paragrafo.text
+        for tabela in doc.tables:
+            for linha in tabela.rows:
+                for celula in linha.cells:
+                    if celula.text.strip():
+                        yield False, celula.text
+
+    partes = []
+    total_caracteres = 0
+    paragrafos_com_texto = 0
+    truncado = False
+
+    for eh_paragrafo, texto_bloco in iterar_blocos():
+        if limite_caracteres and total_caracteres >= limite_caracteres:
+            truncado = True
+            break
+        partes.append(texto_bloco)
+        total_caracteres += len(texto_bloco) + 1
+        paragrafos_com_texto += 1 if eh_paragrafo else 0
+
+    texto = "\n".join(partes)
+    if limite_caracteres and len(texto) > limite_caracteres:
+        texto = texto[:limite_caracteres]
+        truncado = True
+
+    return {
+        "texto": texto.strip(),
+        "estatisticas": {
+            "paragrafos": len(doc.paragraphs),
+            "paragrafos_com_texto": paragrafos_com_texto,
+            "tabelas": len(doc.tables),
+            "truncado": truncado
+        }
+    }
+
+
+def extrair_documento(tipo_arquivo: str, fonte: FonteDocumento,
+                      limite_caracteres: Optional[int] = LIMITE_CARACTERES_PADRAO) -> Dict[str, Any]:
+    """
+    Extrai texto conforme o tipo do arquivo ('pdf' ou 'docx').
+
+    Função de nível de módulo para poder ser executada no pool de processos;
+    nesse caso a fonte deve ser um caminho (lido via mmap no processo filho)
+    ou bytes.
+    """
+    if tipo_arquivo == 'pdf':
+        return extrair_texto_pdf(fonte, limite_caracteres)
+    elif tipo_arquivo == 'docx':
+        return extrair_texto_docx(fonte, limite_caracteres)
+    raise ValueError(f"Tipo de arquivo não suportado: {tipo_arquivo}")
+
+
+def _registrar_processo(fila_pids):
+    """Inicializador dos processos do pool: informa o PID ao processo principal."""
+    fila_pids.put(os.getpid())
+
+
+class ParserDocumentos:
+    """
+    Pool de processos para extração de texto de currículos.
+
+    A extração com PyPDF2/python-docx é CPU-bound e, em threads, disputa o GIL.
+    Aqui cada documento é processado num processo separado, com tempo limite:
+    se um documento travar, o pool é reciclado e o documento retorna erro sem
+    bloquear o restante do lote.
+    """
+
+    def __init__(self, max_processos: Optional[int] = None, timeout_segundos: float = 60,
+                 limite_caracteres: Optional[int] = LIMITE_CARACTERES_PADRAO):
+        """
+        Args:
+            max_processos (int): Número de processos (padrão: número de CPUs)
+            timeout_segundos (float): Tempo máximo de extração por documento
+            limite_caracteres (int): Máximo de caracteres extraídos por documento
+        """
+        self.max_processos = max_processos or os.cpu_count() or 1
+        self.timeout_segundos = timeout_segundos
+        self.limite_caracteres = limite_caracteres
+        self._executor = None
+        # PIDs informados pelos processos de cada pool, para encerrá-los se travarem
+        self._filas_pids: Dict[ProcessPoolExecutor, Any] = {}
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.encerrar()
+
+    def _obter_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                # "spawn" evita herdar locks de threads do processo principal
+                contexto = multiprocessing.get_context("spawn")
+                fila_pids = contexto.Queue()
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_processos,
+                    mp_context=contexto,
+                    initializer=_registrar_processo,
+                    initargs=(fila_pids,)
+                )
+                self._filas_pids[self._executor] = fila_pids
+            return self._executor
+
+    @staticmethod
+    def _coletar_pids(fila_pids) -> List[int]:
+        pids = []
+        if fila_pids is None:
+            return pids
+        while True:
+            try:
+                pids.append(fila_pids.get_nowait())
+            except queue.Empty:
+                break
+        fila_pids.close()
+        return pids
+
+    def _reciclar_executor(self, executor: ProcessPoolExecutor):
+        """
+        Descarta um pool com processo travado, encerrando seus processos.
+        """
+        with self._lock:
+            if self._executor is not executor:
+                return  # Já reciclado por outra thread
+            self._executor = None
+            fila_pids = self._filas_pids.pop(executor, None)
+
+        # Os PIDs vêm do inicializador de cada processo, sem depender de atributos
+        # internos do ProcessPoolExecutor
+        for pid in self._coletar_pids(fila_pids):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except OSError:
+                pass  # Processo já encerrado
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    def extrair(self, tipo_arquivo: str, fonte: Union[str, bytes]) -> Dict[str, Any]:
+        """
+        Extrai o texto de um documento no pool de processos.
+
+        Args:
+            tipo_arquivo (str): 'pdf' ou 'docx'
+            fonte: Caminho do arquivo (evita serializar o conteúdo) ou bytes
+
+        Returns:
+            Dict: sucesso, texto e estatisticas, ou erro
+        """
+        # Uma segunda tentativa cobre o caso de o pool ter sido reciclado
+        # por causa de outro documento enquanto este aguardava
+        for _ in range(2):
+            executor = self._obter_executor()
+            try:
+                futuro = executor.submit(extrair_documento, tipo_arquivo, fonte, self.limite_caracteres)
+                resultado = futuro.result(timeout=self.timeout_segundos)
+                return {"sucesso": True, **resultado}
+
+            except FuturesTimeout:
+                self._reciclar_executor(executor)
+                return {
+                    "sucesso": False,
+                    "erro": f"Tempo limite de {self.timeout_segundos}s excedido ao extrair o texto"
+                }
+            except (BrokenProcessPool, RuntimeError):
+                # RuntimeError: pool encerrado por outra thread entre a obtenção e o submit
+                self._reciclar_executor(executor)
+                continue
+            except Exception as e:
+                return {"sucesso": False, "erro": str(e)}
+
+        return {"sucesso": False, "erro": "Pool de processos indisponível"}
+
+    def encerrar(self):
+        """Encerra o pool de processos."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+            fila_pids = self._filas_pids.pop(executor, None)
+
+        if executor:
+            executor.shutdown(wait=True, cancel_futures=True)
+        self._coletar_pids(fila_pids)
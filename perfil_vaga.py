@@ -0,0 +1,246 @@
+"""Perfil compilado da vaga, reaproveitado por todos os candidatos avaliados contra ela"""
+
+import re
+import hashlib
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Dict, Any, List, Optional, Tuple
+from modelos import _DATACLASS_SLOTS
+from normalizador_texto import normalizar_texto_avaliacao
+from padroes_texto import EMAIL_REGEX, TELEFONE_REGEX
+from taxonomia_habilidades import obter_taxonomia_padrao
+
+# Pesos usados na compatibilidade e informados no prompt de avaliação
+PESO_OBRIGATORIO = 3.0
+PESO_DESEJAVEL = 2.0
+PESO_NAO_ESPECIFICADO = 1.0
+
+MARCADORES_OBRIGATORIO = re.compile(
+    r'obrigat[óo]ri[oa]s?|essencia(?:l|is)|imprescind[íi]ve(?:l|is)|indispens[áa]ve(?:l|is)|'
+    r'necess[áa]ri[oa]s?|\brequired\b|\bmust\b',
+    re.IGNORECASE
+)
+MARCADORES_DESEJAVEL = re.compile(
+    r'desej[áa]ve(?:l|is)|diferencia(?:l|is)|\bplus\b|nice to have|preferencia(?:l|is)|b[ôo]nus',
+    re.IGNORECASE
+)
+ANOS_EXPERIENCIA_REGEX = re.compile(r'(\d{1,2})\s*\+?\s*(?:anos?|years?)\b', re.IGNORECASE)
+
+# Linhas de candidatura e contato ("Enviar currículo ao Sr. Carlos"), fora da dica de senioridade
+LINHA_CANDIDATURA_REGEX = re.compile(
+    r'\benvi(?:e|ar|ando)\b|\bcandidat(?:e-se|ar-se|uras?)\b|\bcontato\b|\binteressad[oa]s\b',
+    re.IGNORECASE
+)
+
+
+def gerar_hash_vaga(requisitos_vaga: str) -> str:
+    """
+    Identifica uma vaga pelo conteúdo dos requisitos, ignorando diferenças
+    de espaços e de caixa.
+    """
+    texto_normalizado = " ".join(requisitos_vaga.lower().split())
+    return hashlib.sha256(texto_normalizado.encode("utf-8")).hexdigest()
+
+
+@dataclass(**_DATACLASS_SLOTS)
+class PerfilVaga:
+    """
+    Requisitos da vaga processados uma única vez: texto normalizado,
+    habilidades com peso (obrigatória, desejável ou não especificada),
+    experiência mínima e o bloco de requisitos do prompt de avaliação.
+    """
+
+    hash: str
+    texto_original: str
+    texto_normalizado: str
+    pesos_habilidades: Dict[str, float] = field(default_factory=dict)
+    anos_experiencia_minimos: Optional[int] = None
+    senioridade: Optional[str] = None
+    bloco_requisitos: str = ""
+
+    @property
+    def resumo(self) -> str:
+        return " ".join(self.texto_original.split())[:120]
+
+    @property
+    def habilidades_obrigatorias(self) -> List[str]:
+        return [chave for chave, peso in self.pesos_habilidades.items() if peso >= PESO_OBRIGATORIO]
+
+    @property
+    def habilidades_desejaveis(self) -> List[str]:
+        return [chave for chave, peso in self.pesos_habilidades.items() if peso == PESO_DESEJAVEL]
+
+    def calcular_aderencia(self, habilidades_candidato) -> Optional[float]:
+        """
+        Percentual (0-100) do peso das habilidades da vaga atendido pelo candidato.
+
+        Args:
+            habilidades_candidato: Chaves canônicas da taxonomia encontradas no currículo
+
+        Returns:
+            float: Aderência ponderada, ou None se a vaga não cita habilidades conhecidas
+        """
+        peso_total = sum(self.pesos_habilidades.values())
+        if not peso_total:
+            return None
+
+        habilidades_candidato = set(habilidades_candidato)
+        peso_atendido = sum(
+            peso for chave, peso in self.pesos_habilidades.items() if chave in habilidades_candidato
+        )
+        return peso_atendido / peso_total * 100
+
+
+def _segmentos_por_peso(linha: str, peso_secao: float) -> List[Tuple[str, float]]:
+    """
+    Divide a linha nas posições dos marcadores: cada trecho recebe o peso do
+    marcador que o precede. O trecho anterior ao primeiro marcador fica com o
+    peso dele ("Python (desejável)"), como uma linha de marcador único.
+    """
+    marcadores = sorted(
+        [(marcador.start(), PESO_OBRIGATORIO) for marcador in MARCADORES_OBRIGATORIO.finditer(linha)]
+        + [(marcador.start(), PESO_DESEJAVEL) for marcador in MARCADORES_DESEJAVEL.finditer(linha)]
+    )
+    if not marcadores:
+        return [(linha, peso_secao)]
+
+    segmentos = [(linha[:marcadores[0][0]], marcadores[0][1])]
+    for indice, (inicio, peso) in enumerate(marcadores):
+        fim = marcadores[indice + 1][0] if indice + 1 < len(marcadores) else len(linha)
+        segmentos.append((linha[inicio:fim], peso))
+    return segmentos
+
+
+def _pesar_habilidades(requisitos_vaga: str) -> Dict[str, float]:
+    """
+    Atribui a cada habilidade o peso da seção em que aparece. Um marcador
+    "obrigatório"/"desejável" vale para o restante da linha e para as
+    seguintes, até outra marcação; a habilidade citada em mais de uma seção
+    fica com o maior peso.
+    """
+    taxonomia = obter_taxonomia_padrao()
+    pesos: Dict[str, float] = {}
+    peso_secao = PESO_NAO_ESPECIFICADO
+
+    for linha in requisitos_vaga.splitlines():
+        segmentos = _segmentos_por_peso(linha, peso_secao)
+        peso_secao = segmentos[-1][1]
+
+        for trecho, peso in segmentos:
+            for chave in taxonomia.extrair_lista(trecho):
+                pesos[chave] = max(pesos.get(chave, 0.0), peso)
+
+    return pesos
+
+
+def _construir_bloco_requisitos(requisitos_normalizados: str, pesos: Dict[str, float],
+                                anos_minimos: Optional[int]) -> str:
+    taxonomia = obter_taxonomia_padrao()
+    rotulos = {PESO_OBRIGATORIO: "obrigatória", PESO_DESEJAVEL: "desejável",
+               PESO_NAO_ESPECIFICADO: "não especificada"}
+    habilidades = ", ".join(
+        f"{taxonomia.nome_exibicao(chave)} ({rotulos[peso]})"
+        for chave, peso in sorted(pesos.items(), key=lambda item: -item[1])
+    )
+
+    return f"""
+REQUISITOS ORIGINAIS:
+{requisitos_normalizados}
+
+HABILIDADES IDENTIFICADAS NA VAGA: {habilidades or "nenhuma reconhecida automaticamente"}
+EXPERIÊNCIA MÍNIMA: {f"{anos_minimos} anos" if anos_minimos else "não especificada"}
+
+CATEGORIZAÇÃO AUTOMÁTICA PARA ANÁLISE:
+• TECNOLOGIAS: Identifique linguagens, frameworks, ferramentas específicas
+• EXPERIÊNCIA: Anos mínimos, tipo de projetos, senioridade
+• FORMAÇÃO: Graduação, especializações, certificações
+• SOFT SKILLS: Competências comportamentais mencionadas
+• RESPONSABILIDADES: Atividades e entregas esperadas
+
+PESO DOS CRITÉRIOS:
+• Requisitos marcados como "obrigatório/essencial" = peso 3
+• Requisitos marcados como "desejável" = peso 2
+• Requisitos não especificados = peso 1
+"""
+
+
+def _linhas_requisitos(requisitos_vaga: str) -> str:
+    """Texto da vaga sem as linhas de candidatura e contato."""
+    return "\n".join(
+        linha for linha in requisitos_vaga.splitlines()
+        if not (LINHA_CANDIDATURA_REGEX.search(linha) or EMAIL_REGEX.search(linha)
+                or TELEFONE_REGEX.search(linha))
+    )
+
+
+def compilar_perfil_vaga(requisitos_vaga: str) -> PerfilVaga:
+    """Processa os requisitos da vaga (sem cache; prefira obter_perfil_vaga)."""
+    texto_normalizado = normalizar_texto_avaliacao(requisitos_vaga)
+    pesos = _pesar_habilidades(requisitos_vaga)
+
+    anos = [int(valor) for valor in ANOS_EXPERIENCIA_REGEX.findall(requisitos_vaga)]
+    anos_minimos = max(anos) if anos else None
+
+    return PerfilVaga(
+        hash=gerar_hash_vaga(requisitos_vaga),
+        texto_original=requisitos_vaga,
+        texto_normalizado=texto_normalizado,
+        pesos_habilidades=pesos,
+        anos_experiencia_minimos=anos_minimos,
+        senioridade=obter_taxonomia_padrao().sugerir_senioridade(_linhas_requisitos(requisitos_vaga)),
+        bloco_requisitos=_construir_bloco_requisitos(texto_normalizado, pesos, anos_minimos)
+    )
+
+
+class CachePerfisVaga:
+    """
+    Perfis de vaga já compilados, por hash do conteúdo, com remoção LRU.
+    """
+
+    def __init__(self, max_perfis: int = 128):
+        self.max_perfis = max(1, max_perfis)
+        self._perfis: "OrderedDict[str, PerfilVaga]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.acertos = 0
+        self.falhas = 0
+
+    def obter(self, requisitos_vaga: str) -> PerfilVaga:
+        chave = gerar_hash_vaga(requisitos_vaga)
+
+        with self._lock:
+            perfil = self._perfis.get(chave)
+            if perfil is not None:
+                self._perfis.move_to_end(chave)
+                self.acertos += 1
+                return perfil
+            self.falhas += 1
+
+        # Compila fora do lock; duas threads com a mesma vaga nova apenas repetem o trabalho
+        perfil = compilar_perfil_vaga(requisitos_vaga)
+
+        with self._lock:
+            self._perfis[chave] = perfil
+            self._perfis.move_to_end(chave)
+            while len(self._perfis) > self.max_perfis:
+                self._perfis.popitem(last=False)
+
+        return perfil
+
+    def estatisticas(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"perfis": len(self._perfis), "acertos": self.acertos, "falhas": self.falhas}
+
+
+_cache_perfis = CachePerfisVaga()
+
+
+def obter_perfil_vaga(requisitos_vaga: str) -> PerfilVaga:
+    """
+    Retorna o perfil compilado da vaga, reaproveitando o de uma vaga com o mesmo conteúdo.
+    """
+    return _cache_perfis.obter(requisitos_vaga)
+
+
+def obter_cache_perfis_vaga() -> CachePerfisVaga:
+    return _cache_perfis
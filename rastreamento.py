@@ -0,0 +1,318 @@
+#!/usr/bin/env python3
+"""
+Rastreamento leve da latência de cada etapa do processamento.
+
+Uso no código:
+    with iniciar_rastreamento("processar_curriculo", nome_arquivo="cv.pdf") as rastreamento:
+        with medir_etapa("extracao"):
+            ...
+    rastreamento.tempos_ms()  # {"extracao": 812.4, ...}
+
+Fora de um rastreamento ativo, medir_etapa() não registra nada.
+
+Percentis a partir de um arquivo exportado:
+    python rastreamento.py rastreamento.jsonl
+"""
+
+import os
+import sys
+import json
+import time
+import uuid
+import threading
+import contextvars
+from collections import defaultdict, deque
+from contextlib import contextmanager
+from typing import Dict, Any, List, Optional, Iterable
+
+_rastreamento_atual = contextvars.ContextVar("rastreamento_atual", default=None)
+_span_atual = contextvars.ContextVar("span_atual", default=None)
+
+
+class Rastreamento:
+    """
+    Conjunto de spans (etapas cronometradas) de uma unidade de trabalho, como
+    o processamento de um currículo. Spans podem vir de várias threads, desde
+    que elas rodem numa cópia do contexto (contextvars.copy_context()).
+    """
+
+    def __init__(self, nome: str, atributos: Optional[Dict[str, Any]] = None):
+        self.id = uuid.uuid4().hex
+        self.nome = nome
+        self.atributos = atributos or {}
+        self.spans: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+
+    def _registrar(self, span: Dict[str, Any]):
+        with self._lock:
+            self.spans.append(span)
+
+    def tempos_ms(self) -> Dict[str, float]:
+        """
+        Duração de cada etapa em milissegundos, na ordem em que começaram.
+
+        Etapas repetidas são somadas; etapas aninhadas aparecem também dentro
+        do tempo da etapa mãe, e etapas paralelas podem somar mais que ela.
+        """
+        tempos: Dict[str, float] = {}
+        with self._lock:
+            spans = sorted(self.spans, key=lambda s: s["inicio_ns"])
+        for span in spans:
+            tempos[span["nome"]] = round(tempos.get(span["nome"], 0.0) + span["duracao_ms"], 1)
+        return tempos
+
+
+@contextmanager
+def iniciar_rastreamento(nome: str, **atributos):
+    """
+    Abre um rastreamento; ao sair, o span raiz é registrado, a amostra entra
+    nas estatísticas do processo e, se configurado, tudo é exportado.
+
+    Yields:
+        Rastreamento: O rastreamento ativo
+    """
+    rastreamento = Rastreamento(nome, atributos)
+    token = _rastreamento_atual.set(rastreamento)
+    try:
+        with medir_etapa(nome, **atributos):
+            yield rastreamento
+    finally:
+        _rastreamento_atual.reset(token)
+        obter_estatisticas_latencia().adicionar(rastreamento)
+        exportador = obter_exportador_padrao()
+        if exportador:
+            exportador.exportar(rastreamento)
+
+
+@contextmanager
+def medir_etapa(nome: str, **atributos):
+    """
+    Cronometra o bloco como um span do rastreamento ativo.
+    """
+    rastreamento = _rastreamento_atual.get()
+    if rastreamento is None:
+        yield
+        return
+
+    span_id = uuid.uuid4().hex[:16]
+    pai = _span_atual.get()
+    token = _span_atual.set(span_id)
+    inicio_ns = time.time_ns()
+    inicio = time.perf_counter()
+    erro = None
+    try:
+        yield
+    except BaseException as e:
+        erro = type(e).__name__
+        raise
+    finally:
+        _span_atual.reset(token)
+        span = {
+            "nome": nome,
+            "span_id": span_id,
+            "pai": pai,
+            "inicio_ns": inicio_ns,
+            "duracao_ms": (time.perf_counter() - inicio) * 1000,
+            "thread": threading.current_thread().name,
+            "atributos": atributos
+        }
+        if erro:
+            span["erro"] = erro
+        rastreamento._registrar(span)
+
+
+def calcular_percentil(valores: List[float], percentil: float) -> float:
+    """Percentil por interpolação linear (valores não precisam estar ordenados)."""
+    if not valores:
+        return 0.0
+    ordenados = sorted(valores)
+    posicao = (len(ordenados) - 1) * percentil / 100
+    inferior = int(posicao)
+    superior = min(inferior + 1, len(ordenados) - 1)
+    return ordenados[inferior] + (ordenados[superior] - ordenados[inferior]) * (posicao - inferior)
+
+
+def resumir_latencias(amostras: Dict[str, Iterable[float]]) -> Dict[str, Dict[str, float]]:
+    """
+    Returns:
+        Dict: Etapa -> amostras, p50, p95 e máximo (ms)
+    """
+    resumo = {}
+    for etapa, valores in amostras.items():
+        valores = list(valores)
+        if not valores:
+            continue
+        resumo[etapa] = {
+            "amostras": len(valores),
+            "p50_ms": round(calcular_percentil(valores, 50), 1),
+            "p95_ms": round(calcular_percentil(valores, 95), 1),
+            "max_ms": round(max(valores), 1)
+        }
+    return resumo
+
+
+class EstatisticasLatencia:
+    """
+    Guarda as durações mais recentes de cada etapa para calcular p50/p95 no processo.
+    """
+
+    def __init__(self, max_amostras: int = 1000):
+        self._amostras = defaultdict(lambda: deque(maxlen=max_amostras))
+        self._lock = threading.Lock()
+
+    def adicionar(self, rastreamento: Rastreamento):
+        with self._lock:
+            for etapa, duracao in rastreamento.tempos_ms().items():
+                self._amostras[etapa].append(duracao)
+
+    def resumo(self) -> Dict[str, Dict[str, float]]:
+        with self._lock:
+            copia = {etapa: list(valores) for etapa, valores in self._amostras.items()}
+        return resumir_latencias(copia)
+
+
+_estatisticas_latencia = EstatisticasLatencia()
+
+
+def obter_estatisticas_latencia() -> EstatisticasLatencia:
+    return _estatisticas_latencia
+
+
+class ExportadorRastreamento:
+    """
+    Grava rastreamentos num arquivo local, um registro por linha.
+
+    Formatos:
+    - "jsonl": um objeto por rastreamento, com tempos_etapas_ms e os spans;
+    - "otel": um span por linha no formato JSON do OpenTelemetry (OTLP),
+      com traceId/spanId/parentSpanId e tempos em nanossegundos.
+    """
+
+    FORMATOS = ("jsonl", "otel")
+
+    def __init__(self, caminho: str, formato: str = "jsonl"):
+        if formato not in self.FORMATOS:
+            raise ValueError(f"Formato de rastreamento inválido: {formato}")
+
+        self.caminho = caminho
+        self.formato = formato
+        self._lock = threading.Lock()
+
+    def exportar(self, rastreamento: Rastreamento):
+        if self.formato == "otel":
+            linhas = [self._span_otel(rastreamento, span) for span in rastreamento.spans]
+        else:
+            linhas = [{
+                "trace_id": rastreamento.id,
+                "nome": rastreamento.nome,
+                "atributos": rastreamento.atributos,
+                "tempos_etapas_ms": rastreamento.tempos_ms(),
+                "spans": rastreamento.spans
+            }]
+
+        try:
+            with self._lock, open(self.caminho, "a", encoding="utf-8") as arquivo:
+                for linha in linhas:
+                    arquivo.write(json.dumps(linha, ensure_ascii=False, default=str) + "\n")
+        except OSError as e:
+            print(f"⚠️ Não foi possível gravar o rastreamento em {self.caminho}: {e}")
+
+    @staticmethod
+    def _span_otel(rastreamento: Rastreamento, span: Dict[str, Any]) -> Dict[str, Any]:
+        atributos = {**span["atributos"], "thread.name": span["thread"]}
+        if "erro" in span:
+            atributos["error.type"] = span["erro"]
+
+        return {
+            "traceId": rastreamento.id,
+            "spanId": span["span_id"],
+            "parentSpanId": span["pai"] or "",
+            "name": span["nome"],
+            "startTimeUnixNano": span["inicio_ns"],
+            "endTimeUnixNano": span["inicio_ns"] + int(span["duracao_ms"] * 1_000_000),
+            "attributes": [
+                {"key": chave, "value": {"stringValue": str(valor)}}
+                for chave, valor in atributos.items()
+            ],
+            "status": {"code": 2 if "erro" in span else 1}
+        }
+
+
+_exportador_padrao = None
+_exportador_configurado = False
+_exportador_lock = threading.Lock()
+
+
+def obter_exportador_padrao() -> Optional[ExportadorRastreamento]:
+    """
+    Retorna o exportador configurado pelo .env, ou None se desativado.
+
+    Variáveis: RASTREAMENTO_ARQUIVO (caminho; vazio desativa a exportação) e
+    RASTREAMENTO_FORMATO ("jsonl" ou "otel").
+    """
+    global _exportador_padrao, _exportador_configurado
+
+    with _exportador_lock:
+        if not _exportador_configurado:
+            _exportador_configurado = True
+            caminho = os.getenv('RASTREAMENTO_ARQUIVO')
+            if caminho:
+                try:
+                    _exportador_padrao = ExportadorRastreamento(
+                        caminho, os.getenv('RASTREAMENTO_FORMATO', 'jsonl')
+                    )
+                except ValueError as e:
+                    print(f"⚠️ Rastreamento desativado: {e}")
+
+        return _exportador_padrao
+
+
+def carregar_latencias(caminho: str) -> Dict[str, List[float]]:
+    """
+    Lê um arquivo exportado (jsonl ou otel) e agrupa as durações por etapa.
+    """
+    amostras = defaultdict(list)
+    por_rastreamento = defaultdict(lambda: defaultdict(float))
+
+    with open(caminho, "r", encoding="utf-8") as arquivo:
+        for linha in arquivo:
+            if not linha.strip():
+                continue
+            registro = json.loads(linha)
+
+            if "tempos_etapas_ms" in registro:
+                for etapa, duracao in registro["tempos_etapas_ms"].items():
+                    amostras[etapa].append(duracao)
+            elif "spanId" in registro:
+                duracao = (registro["endTimeUnixNano"] - registro["startTimeUnixNano"]) / 1_000_000
+                por_rastreamento[registro["traceId"]][registro["name"]] += duracao
+
+    # No formato otel, etapas repetidas no mesmo rastreamento são somadas como em tempos_ms()
+    for tempos in por_rastreamento.values():
+        for etapa, duracao in tempos.items():
+            amostras[etapa].append(duracao)
+
+    return amostras
+
+
+def main(argv=None) -> int:
+    argv = sys.argv[1:] if argv is None else argv
+    if len(argv) != 1:
+        print("Uso: python rastreamento.py <arquivo_rastreamento.jsonl>", file=sys.stderr)
+        return 2
+
+    try:
+        resumo = resumir_latencias(carregar_latencias(argv[0]))
+    except (OSError, ValueError, KeyError) as e:
+        print(f"❌ Não foi possível ler o rastreamento: {e}", file=sys.stderr)
+        return 1
+
+    print(f"{'etapa':<45} {'n':>6} {'p50 (ms)':>10} {'p95 (ms)':>10} {'máx (ms)':>10}")
+    for etapa, dados in sorted(resumo.items(), key=lambda item: -item[1]["p95_ms"]):
+        print(f"{etapa:<45} {dados['amostras']:>6} {dados['p50_ms']:>10} "
+              f"{dados['p95_ms']:>10} {dados['max_ms']:>10}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,146 +1,893 @@
 from curriculo import Curriculo
 from avaliador import Avaliador
-from typing import Dict, Any, Optional
+from modelos import ResultadoAvaliacao
+from historico_persistente import obter_historico_padrao
+from indice_bm25 import obter_indice_padrao
+from deteccao_duplicatas import obter_indice_duplicatas_padrao
+from matriz_compatibilidade import MatrizCompatibilidade, calcular_compatibilidades
+from perfil_vaga import PerfilVaga, gerar_hash_vaga, obter_perfil_vaga, obter_cache_perfis_vaga
+from arquivo_local import coletar_arquivos
+from parser_documentos import ParserDocumentos
+from cache_persistente import obter_cache_padrao
+from clientes_gemini import obter_cliente_gemini
+from limitador_taxa import prioridade_requisicoes, PRIORIDADE_LOTE
+from uso_tokens import RegistroUsoTokens, contabilizar_uso, obter_registro_global
+from rastreamento import iniciar_rastreamento, medir_etapa, obter_estatisticas_latencia
+from normalizador_texto import normalizar_curriculo
+from taxonomia_habilidades import obter_taxonomia_padrao
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
+from typing import Dict, Any, Optional, Iterator, Callable, List
+import threading
 import pandas as pd
 from datetime import datetime
 
 class SistemaRecrutamento:
+    
+    # Etapa -> (progresso ao iniciar, progresso ao concluir, descrição exibida)
+    ETAPAS_PROCESSAMENTO = {
+        "validacao": (0, 2, "🔍 Validando arquivo e requisitos..."),
+        "criacao_curriculo": (2, 5, "📄 Preparando o currículo..."),
+        "extracao": (5, 10, "📄 Extraindo texto do currículo..."),
+        "preprocessamento": (10, 11, "🧹 Pré-processando o texto..."),
+        "qualidade_texto": (11, 12, "🔎 Verificando a qualidade do texto..."),
+        "deduplicacao": (12, 14, "🧬 Procurando currículos duplicados..."),
+        "extracao_ia": (14, 64, "🤖 Extraindo dados estruturados com IA..."),
+        "enriquecimento_requisitos": (64, 66, "🧩 Combinando perfil da vaga e dados extraídos..."),
+        "avaliacao": (66, 94, "🧠 Avaliando o candidato com inteligência artificial..."),
+        "enriquecimento_resultado": (94, 98, "📊 Consolidando os resultados..."),
+        "historico": (98, 100, "💾 Registrando no histórico...")
+    }
+    
+    # Campos de primeiro nível pedidos no prompt de avaliação (estimativa do progresso do streaming)
+    CAMPOS_ESPERADOS_AVALIACAO = 15
+    
+    # Modo cascata do lote: até onde cada currículo chegou
+    NIVEL_TRIAGEM_LOCAL = "triagem_local"
+    NIVEL_AVALIACAO_IA = "avaliacao_ia"
+    
+    # Compatibilidade local mínima para seguir à IA no modo cascata
+    LIMIAR_CASCATA_PADRAO = 50
+    
     def __init__(self):
         self.avaliador = Avaliador()
+        self.extrator_ia = self._criar_extrator_compartilhado()
         self.curriculo_atual = None
         self.ultima_avaliacao = None
-        self.historico_avaliacoes = []
+        self.historico = obter_historico_padrao()
+        self.indice_curriculos = obter_indice_padrao()
+        self.indice_duplicatas = obter_indice_duplicatas_padrao()
+        
+        # Protege o estado compartilhado quando vários currículos são processados em paralelo
+        self._lock = threading.Lock()
+    
+    def _criar_extrator_compartilhado(self):
+        """
+        Cria o extrator de IA reutilizado por todos os currículos.
+        
+        Returns:
+            ExtratorInteligente: Extrator compartilhado, ou None se indisponível
+                (cada Curriculo então tenta criar o seu)
+        """
+        try:
+            from extrator_inteligente import ExtratorInteligente
+            return ExtratorInteligente()
+        except Exception as e:
+            print(f"⚠️ Extrator inteligente compartilhado indisponível: {e}")
+            return None
     
-    def processar_curriculo(self, arquivo_upload, requisitos_vaga: str) -> Dict[str, Any]:
+    def _notificar_progresso(self, callback_progresso: Optional[Callable[[Dict[str, Any]], None]],
+                             etapa: str, descricao: str, progresso: float, status: str = "em_andamento",
+                             **dados_adicionais):
+        """Envia um evento de progresso; erros do callback não interrompem o processamento."""
+        if not callback_progresso:
+            return
+        
         try:
-            # Validação inicial
-            resultado_validacao = self._validar_entrada(arquivo_upload, requisitos_vaga)
-            if not resultado_validacao["valido"]:
-                return {
-                    "sucesso": False,
-                    "erro": resultado_validacao["erro"],
-                    "etapa": "validacao"
-                }
+            callback_progresso({
+                "etapa": etapa,
+                "descricao": descricao,
+                "progresso": round(progresso, 1),
+                "status": status,
+                **dados_adicionais
+            })
+        except Exception as e:
+            print(f"⚠️ Erro no callback de progresso: {e}")
+    
+    @contextmanager
+    def _etapa(self, nome: str, callback_progresso: Optional[Callable[[Dict[str, Any]], None]]):
+        """Anuncia o início de uma etapa do processamento e a cronometra."""
+        inicio, _, descricao = self.ETAPAS_PROCESSAMENTO[nome]
+        self._notificar_progresso(callback_progresso, nome, descricao, inicio)
+        
+        with medir_etapa(nome):
+            yield
+    
+    def _progresso_extracao(self, callback_progresso: Optional[Callable[[Dict[str, Any]], None]]):
+        """
+        Converte os eventos das passadas do extrator (concluídas/total) em
+        progresso dentro da faixa da etapa de extração.
+        """
+        if not callback_progresso:
+            return None
+        
+        inicio, fim, _ = self.ETAPAS_PROCESSAMENTO["extracao_ia"]
+        
+        def repassar(evento: Dict[str, Any]):
+            fracao = evento["concluidas"] / max(1, evento["total"])
+            self._notificar_progresso(
+                callback_progresso, evento["etapa"],
+                f"🤖 {evento['descricao']} ({evento['concluidas']}/{evento['total']})",
+                inicio + (fim - inicio) * fracao
+            )
+        
+        return repassar
+    
+    def _progresso_avaliacao(self, callback_progresso: Optional[Callable[[Dict[str, Any]], None]]):
+        """
+        Transforma os campos que chegam do streaming da avaliação em eventos de
+        progresso com o resultado parcial acumulado (score e classificação
+        chegam primeiro; o restante do detalhamento vem em seguida).
+        """
+        if not callback_progresso:
+            return None
+        
+        inicio, fim, _ = self.ETAPAS_PROCESSAMENTO["avaliacao"]
+        resultado_parcial: Dict[str, Any] = {}
+        
+        def repassar(campos: Dict[str, Any]):
+            resultado_parcial.update(campos)
+            fracao = min(1.0, len(resultado_parcial) / self.CAMPOS_ESPERADOS_AVALIACAO)
             
-            # Criação do currículo
-            self.curriculo_atual = Curriculo(arquivo_upload)
+            if "score" in resultado_parcial:
+                descricao = (f"🧠 Score preliminar: {resultado_parcial['score']}/100 "
+                             f"({resultado_parcial['classificacao']}) — detalhando a avaliação...")
+            else:
+                descricao = "🧠 Recebendo a avaliação..."
             
-            validacao_arquivo = self.curriculo_atual.validar_arquivo()
-            if not validacao_arquivo["valido"]:
-                return {
-                    "sucesso": False,
-                    "erro": validacao_arquivo["erro"],
-                    "etapa": "validacao_arquivo"
-                }
+            self._notificar_progresso(callback_progresso, "avaliacao.parcial", descricao,
+                                      inicio + (fim - inicio) * fracao,
+                                      resultado_parcial=dict(resultado_parcial))
+        
+        return repassar
+    
+    def processar_curriculo(self, arquivo_upload, requisitos_vaga: str,
+                            parser_documentos: Optional[ParserDocumentos] = None,
+                            callback_progresso: Optional[Callable[[Dict[str, Any]], None]] = None) -> Dict[str, Any]:
+        """
+        Processa um currículo contra os requisitos da vaga.
+        
+        Args:
+            arquivo_upload: Arquivo enviado (name, size, getvalue())
+            requisitos_vaga (str): Requisitos da vaga
+            parser_documentos (ParserDocumentos): Pool de processos opcional para a extração de texto
+            callback_progresso (Callable): Recebe, na thread que chamou este método,
+                um evento {"etapa", "descricao", "progresso" (0-100), "status"} no
+                início de cada etapa, a cada passada de extração concluída e ao
+                final ("concluido" ou "erro"). Com o callback, a avaliação é lida em
+                streaming e os eventos "avaliacao.parcial" trazem também o
+                resultado_parcial (score e classificação primeiro)
+        
+        Os tokens consumidos pelas chamadas à IA deste currículo (extração e
+        avaliação) ficam em metadados["uso_tokens"] e a duração de cada etapa
+        em metadados["tempos_etapas_ms"], inclusive quando o processamento
+        falha numa etapa intermediária.
+        """
+        nome_arquivo = getattr(arquivo_upload, "name", None)
+        
+        with contabilizar_uso() as registro_uso, \
+                iniciar_rastreamento("processar_curriculo", nome_arquivo=nome_arquivo) as rastreamento:
+            resultado = self._processar_curriculo(arquivo_upload, requisitos_vaga, parser_documentos,
+                                                  callback_progresso)
+        
+        if resultado["sucesso"]:
+            self._notificar_progresso(callback_progresso, "concluido", "✅ Análise concluída!", 100, "concluido")
+        else:
+            self._notificar_progresso(callback_progresso, resultado.get("etapa", "sistema"),
+                                      f"❌ {resultado.get('erro', 'Erro desconhecido')}", 100, "erro")
+        
+        metadados = resultado.setdefault("metadados", {})
+        metadados["uso_tokens"] = registro_uso.para_dict()
+        metadados["tempos_etapas_ms"] = rastreamento.tempos_ms()
+        return resultado
+    
+    def _processar_curriculo(self, arquivo_upload, requisitos_vaga: str,
+                             parser_documentos: Optional[ParserDocumentos] = None,
+                             callback_progresso: Optional[Callable[[Dict[str, Any]], None]] = None) -> Dict[str, Any]:
+        try:
+            # 1-5. Validação, extração, pré-processamento e deduplicação
+            preparado = self._preparar_curriculo(arquivo_upload, requisitos_vaga, parser_documentos,
+                                                 callback_progresso)
+            if not preparado["sucesso"]:
+                return preparado
             
-            # Extração de texto
-            resultado_extracao = self.curriculo_atual.extrair_texto()
-            if not resultado_extracao["sucesso"]:
+            # Duplicata de um currículo já avaliado para esta vaga: reaproveita a avaliação
+            if preparado.get("resultado_reaproveitado"):
                 return {
-                    "sucesso": False,
-                    "erro": f"Falha na extração: {resultado_extracao['erro']}",
-                    "etapa": "extracao"
+                    "sucesso": True,
+                    "resultado": preparado["resultado_reaproveitado"],
+                    "metadados": preparado["metadados"]
                 }
             
-            texto_curriculo = resultado_extracao["texto"]
-            dados_estruturados = resultado_extracao.get("dados_estruturados", {})
-            metodo_extracao = resultado_extracao.get("metodo_extracao", "BASICO")
+            # 6-9. Avaliação com IA, enriquecimento e histórico
+            resultado_final = self._avaliar_texto(preparado["texto_preprocessado"], preparado["dados_estruturados"],
+                                                  requisitos_vaga, arquivo_upload.name, callback_progresso,
+                                                  texto_extraido=preparado["texto"])
             
-            # 4. Pré-processamento do texto para melhor análise
-            texto_preprocessado = self._preprocessar_texto(texto_curriculo)
-            
-            # 5. Validação da qualidade do texto extraído
-            validacao_qualidade = self._validar_qualidade_texto(texto_preprocessado)
-            if not validacao_qualidade["valida"]:
-                return {
-                    "sucesso": False,
-                    "erro": f"Qualidade do texto insuficiente: {validacao_qualidade['motivo']}",
-                    "etapa": "qualidade_texto"
-                }
+            return {
+                "sucesso": True,
+                "resultado": resultado_final,
+                "metadados": preparado["metadados"]
+            }
             
-            # 6. Enriquecimento dos requisitos com dados estruturados
-            requisitos_enriquecidos = self._enriquecer_requisitos_com_dados(
-                requisitos_vaga, dados_estruturados
-            )
+        except Exception as e:
+            return {
+                "sucesso": False,
+                "erro": f"Erro interno no sistema: {str(e)}",
+                "etapa": "sistema",
+                "detalhes_tecnico": type(e).__name__
+            }
+    
+    def _preparar_curriculo(self, arquivo_upload, requisitos_vaga: str,
+                            parser_documentos: Optional[ParserDocumentos] = None,
+                            callback_progresso: Optional[Callable[[Dict[str, Any]], None]] = None,
+                            usar_ia: bool = True) -> Dict[str, Any]:
+        """
+        Valida, extrai e pré-processa o currículo e o adiciona ao índice local.
+        
+        A extração com IA só acontece depois da deduplicação: uma duplicata
+        reaproveita os dados já extraídos e, se já foi avaliada para a mesma
+        vaga, também a avaliação (resultado_reaproveitado).
+        
+        Args:
+            usar_ia (bool): Com False, os dados estruturados vêm só da extração
+                local (regex), sem chamadas à IA
+        
+        Returns:
+            Dict: sucesso, texto, texto_preprocessado, dados_estruturados, metadados,
+                duplicata e resultado_reaproveitado; ou sucesso False com erro e etapa
+        """
+        # 1. Validação inicial
+        with self._etapa("validacao", callback_progresso):
+            resultado_validacao = self._validar_entrada(arquivo_upload, requisitos_vaga)
+        if not resultado_validacao["valido"]:
+            return {
+                "sucesso": False,
+                "erro": resultado_validacao["erro"],
+                "etapa": "validacao"
+            }
+        
+        # 2. Criação do currículo (a extração com IA vem depois da deduplicação)
+        with self._etapa("criacao_curriculo", callback_progresso):
+            curriculo = Curriculo(arquivo_upload, parser_documentos=parser_documentos, usar_ia=False)
+            self.curriculo_atual = curriculo
             
-            # 7. Avaliação com IA aprimorada
+            validacao_arquivo = curriculo.validar_arquivo()
+        if not validacao_arquivo["valido"]:
+            return {
+                "sucesso": False,
+                "erro": validacao_arquivo["erro"],
+                "etapa": "validacao_arquivo"
+            }
+        
+        # 3. Extração de texto
+        with self._etapa("extracao", callback_progresso):
+            resultado_extracao = curriculo.extrair_texto()
+        if not resultado_extracao["sucesso"]:
+            return {
+                "sucesso": False,
+                "erro": f"Falha na extração: {resultado_extracao['erro']}",
+                "etapa": "extracao"
+            }
+        
+        texto_curriculo = resultado_extracao["texto"]
+        dados_estruturados = resultado_extracao.get("dados_estruturados", {})
+        metodo_extracao = resultado_extracao.get("metodo_extracao", "BASICO")
+        
+        # 4. Pré-processamento do texto para melhor análise
+        with self._etapa("preprocessamento", callback_progresso):
+            texto_preprocessado = self._preprocessar_texto(texto_curriculo)
+        
+        # 5. Validação da qualidade do texto extraído
+        with self._etapa("qualidade_texto", callback_progresso):
+            validacao_qualidade = self._validar_qualidade_texto(texto_preprocessado)
+        if not validacao_qualidade["valida"]:
+            return {
+                "sucesso": False,
+                "erro": f"Qualidade do texto insuficiente: {validacao_qualidade['motivo']}",
+                "etapa": "qualidade_texto"
+            }
+        
+        # Disponível para pré-seleções futuras (pre_selecionar) sem nova extração. Indexa o
+        # texto extraído completo: o pré-processado é truncado em textos longos
+        # (normalizador_texto) e traz os marcadores de seção, que entrariam como termos
+        with medir_etapa("indexacao"):
+            self.indice_curriculos.adicionar(arquivo_upload.name, texto_curriculo, dados_estruturados)
+        
+        preparado = {
+            "sucesso": True,
+            "texto": texto_curriculo,
+            "texto_preprocessado": texto_preprocessado,
+            "dados_estruturados": dados_estruturados,
+            "metadados": {
+                "timestamp": datetime.now().isoformat(),
+                "nome_arquivo": arquivo_upload.name,
+                "tamanho_arquivo": arquivo_upload.size,
+                "caracteres_extraidos": len(texto_curriculo),
+                "caracteres_processados": len(texto_preprocessado),
+                "metodo_extracao": metodo_extracao,
+                "estatisticas_documento": resultado_extracao.get("estatisticas_documento", {}),
+                "dados_estruturados_disponiveis": bool(dados_estruturados),
+                "qualidade_extracao": dados_estruturados.get("qualidade_extracao", "N/A")
+            }
+        }
+        
+        # Deduplicação (MinHash/LSH), antes de qualquer chamada à IA
+        with self._etapa("deduplicacao", callback_progresso):
+            self._aplicar_duplicata(preparado, arquivo_upload.name, requisitos_vaga)
+        
+        # Extração com IA dos dados estruturados
+        if usar_ia and not preparado.get("resultado_reaproveitado"):
+            with self._etapa("extracao_ia", callback_progresso):
+                self._extrair_dados_ia(preparado, arquivo_upload.name,
+                                       self._progresso_extracao(callback_progresso))
+        
+        return preparado
+    
+    def _aplicar_duplicata(self, preparado: Dict[str, Any], nome_arquivo: str, requisitos_vaga: str):
+        """
+        Indexa a impressão digital do currículo e, se for quase duplicata de
+        outro já processado, reaproveita os dados extraídos pela IA e a
+        avaliação para a mesma vaga.
+        """
+        if not self.indice_duplicatas:
+            return
+        
+        duplicata = self.indice_duplicatas.verificar_e_adicionar(nome_arquivo, preparado["texto_preprocessado"])
+        if not duplicata:
+            return
+        
+        preparado["duplicata"] = {
+            "id_documento": duplicata["id_documento"],
+            "similaridade": duplicata["similaridade"]
+        }
+        preparado["metadados"]["duplicata"] = preparado["duplicata"]
+        print(f"🧬 {nome_arquivo} é quase idêntico a {duplicata['id_documento']} "
+              f"(similaridade {duplicata['similaridade']:.0%})")
+        
+        if duplicata["dados_estruturados"]:
+            preparado["dados_estruturados"] = duplicata["dados_estruturados"]
+            preparado["dados_ia"] = True
+            preparado["metadados"].update({
+                "metodo_extracao": "IA (duplicata)",
+                "dados_estruturados_disponiveis": True,
+                "qualidade_extracao": duplicata["dados_estruturados"].get("qualidade_extracao", "N/A")
+            })
+            self.indice_duplicatas.registrar_dados(nome_arquivo, duplicata["dados_estruturados"])
+        
+        avaliacao = duplicata["avaliacoes"].get(obter_perfil_vaga(requisitos_vaga).hash)
+        if avaliacao:
+            preparado["resultado_reaproveitado"] = {
+                **avaliacao,
+                "arquivo_original": nome_arquivo,
+                "duplicata_de": duplicata["id_documento"],
+                "similaridade_duplicata": duplicata["similaridade"]
+            }
+            with self._lock:
+                self.ultima_avaliacao = preparado["resultado_reaproveitado"]
+    
+    def _avaliar_texto(self, texto: str, dados_estruturados: Dict[str, Any], requisitos_vaga: str,
+                       nome_arquivo: str,
+                       callback_progresso: Optional[Callable[[Dict[str, Any]], None]] = None,
+                       texto_extraido: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Avalia um texto de currículo já extraído e pré-processado e registra no histórico.
+        
+        Args:
+            texto_extraido (str): Texto antes do pré-processamento, usado na compatibilidade
+                (o pré-processado é truncado em textos longos); padrão: o próprio texto
+        
+        Returns:
+            Dict: Resultado final da avaliação (para_dict)
+        """
+        # 6. Perfil compilado da vaga (compartilhado entre candidatos) e contexto do candidato
+        with self._etapa("enriquecimento_requisitos", callback_progresso):
+            perfil_vaga = obter_perfil_vaga(requisitos_vaga)
+            contexto_candidato = self._formatar_contexto_candidato(dados_estruturados)
+        
+        # 7. Avaliação com IA aprimorada
+        with self._etapa("avaliacao", callback_progresso):
             resultado_avaliacao = self.avaliador.avaliar_curriculo(
-                texto_preprocessado, 
-                requisitos_enriquecidos
+                texto, 
+                perfil_vaga,
+                callback_parcial=self._progresso_avaliacao(callback_progresso),
+                contexto_candidato=contexto_candidato
+            )
+        
+        # 8. Enriquecimento do resultado (já validado pelo avaliador) com dados estruturados
+        with self._etapa("enriquecimento_resultado", callback_progresso):
+            self._enriquecer_resultado_com_dados_estruturados(
+                resultado_avaliacao,
+                dados_estruturados,
+                texto_extraido or texto,
+                perfil_vaga,
+                nome_arquivo
             )
+            resultado_final = resultado_avaliacao.para_dict()
+        
+        # 9. Armazenar no histórico
+        with self._etapa("historico", callback_progresso):
+            with self._lock:
+                self.ultima_avaliacao = resultado_final
+            self.historico.registrar(resultado_avaliacao, nome_arquivo, perfil_vaga,
+                                     resultado_final)
+            if self.indice_duplicatas and resultado_avaliacao.sucesso:
+                self.indice_duplicatas.registrar_avaliacao(nome_arquivo, perfil_vaga.hash, resultado_final)
+        
+        return resultado_final
+    
+    def processar_lote_iter(self, arquivos, requisitos_vaga: str, max_workers: int = 4,
+                            max_processos: Optional[int] = None,
+                            timeout_documento: float = 60,
+                            registro_uso: Optional[RegistroUsoTokens] = None,
+                            modo_cascata: bool = False,
+                            limiar_cascata: Optional[int] = LIMIAR_CASCATA_PADRAO,
+                            top_k_cascata: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Processa vários currículos contra a mesma vaga, entregando cada resultado assim que fica pronto.
+        
+        Args:
+            arquivos: Pasta, ZIP, padrão glob ou lista de caminhos/arquivos enviados
+            requisitos_vaga (str): Requisitos da vaga
+            max_workers (int): Número máximo de currículos processados em paralelo
+            max_processos (int): Processos para extração de texto (padrão: número de CPUs)
+            timeout_documento (float): Tempo máximo de extração de texto por documento,
+                incluindo a espera por um processo livre
+            registro_uso (RegistroUsoTokens): Recebe os tokens consumidos por todo o lote
+            modo_cascata (bool): Ranqueia todos os currículos pela compatibilidade local
+                (sem IA) e só envia à IA os que passam no limiar ou estão no top-K
+            limiar_cascata (int): Compatibilidade local mínima para seguir à IA (None = sem limiar)
+            top_k_cascata (int): Os K melhores da triagem local seguem à IA mesmo abaixo do limiar
             
-            # 8. Validação do resultado da avaliação
-            resultado_validado = self._validar_resultado_avaliacao(resultado_avaliacao)
+        Yields:
+            Dict: Resultado de processar_curriculo acrescido de nome_arquivo e
+                nivel_cascata, na ordem em que os currículos terminam
+        """
+        lista_arquivos = coletar_arquivos(arquivos)
+        
+        # Compila a vaga uma vez antes de abrir o pool; os currículos reaproveitam o perfil do cache
+        obter_perfil_vaga(requisitos_vaga)
+        
+        if modo_cascata:
+            yield from self._processar_lote_cascata_iter(lista_arquivos, requisitos_vaga, max_workers,
+                                                         max_processos, timeout_documento, registro_uso,
+                                                         limiar_cascata, top_k_cascata)
+            return
+        
+        def processar_em_lote(arquivo, parser):
+            # Chamadas de lote cedem a vez às análises interativas no limitador de taxa
+            with prioridade_requisicoes(PRIORIDADE_LOTE), contabilizar_uso(registro_uso):
+                return self.processar_curriculo(arquivo, requisitos_vaga, parser)
+        
+        # A extração de texto é CPU-bound: vai para um pool de processos, enquanto
+        # as threads ficam com as chamadas à IA
+        with ParserDocumentos(max_processos, timeout_documento) as parser, \
+                ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+            futuros = {
+                executor.submit(processar_em_lote, arquivo, parser): arquivo
+                for arquivo in lista_arquivos
+            }
             
-            # 9. Enriquecimento do resultado com dados estruturados
-            resultado_enriquecido = self._enriquecer_resultado_com_dados_estruturados(
-                resultado_validado,
-                dados_estruturados,
-                texto_preprocessado,
-                requisitos_vaga,
-                arquivo_upload.name
+            for futuro in as_completed(futuros):
+                arquivo = futuros[futuro]
+                try:
+                    resultado = futuro.result()
+                except Exception as e:
+                    resultado = {
+                        "sucesso": False,
+                        "erro": f"Erro interno no sistema: {str(e)}",
+                        "etapa": "sistema"
+                    }
+                
+                resultado["nome_arquivo"] = arquivo.name
+                resultado["nivel_cascata"] = self.NIVEL_AVALIACAO_IA
+                yield resultado
+    
+    def _processar_lote_cascata_iter(self, lista_arquivos, requisitos_vaga: str, max_workers: int,
+                                     max_processos: Optional[int], timeout_documento: float,
+                                     registro_uso: Optional[RegistroUsoTokens],
+                                     limiar_cascata: Optional[int],
+                                     top_k_cascata: Optional[int]) -> Iterator[Dict[str, Any]]:
+        """
+        Lote em dois níveis: (1) extração local e compatibilidade ponderada pelo
+        perfil da vaga para todos, sem IA; (2) extração e avaliação com IA só
+        para os aprovados na triagem. Os demais saem com nivel_cascata
+        "triagem_local" e apenas o score da triagem.
+        """
+        perfil_vaga = obter_perfil_vaga(requisitos_vaga)
+        
+        taxonomia = obter_taxonomia_padrao()
+        
+        def triar(arquivo, parser):
+            with medir_etapa("cascata.triagem"):
+                preparado = self._preparar_curriculo(arquivo, requisitos_vaga, parser, usar_ia=False)
+                if preparado["sucesso"]:
+                    # Texto extraído completo: o pré-processado é truncado em textos longos
+                    preparado["habilidades"] = taxonomia.extrair_lista(preparado["texto"])
+                return preparado
+        
+        # 1. Triagem local de todos os currículos
+        triados = []
+        with ParserDocumentos(max_processos, timeout_documento) as parser, \
+                ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+            futuros = {executor.submit(triar, arquivo, parser): arquivo for arquivo in lista_arquivos}
+            
+            for futuro in as_completed(futuros):
+                arquivo = futuros[futuro]
+                try:
+                    preparado = futuro.result()
+                except Exception as e:
+                    preparado = {
+                        "sucesso": False,
+                        "erro": f"Erro interno no sistema: {str(e)}",
+                        "etapa": "sistema"
+                    }
+                
+                if preparado.get("resultado_reaproveitado"):
+                    yield {
+                        "sucesso": True,
+                        "resultado": preparado["resultado_reaproveitado"],
+                        "metadados": preparado["metadados"],
+                        "nome_arquivo": arquivo.name,
+                        "nivel_cascata": self.NIVEL_AVALIACAO_IA
+                    }
+                elif preparado["sucesso"]:
+                    triados.append((arquivo, preparado))
+                else:
+                    preparado["nome_arquivo"] = arquivo.name
+                    preparado["nivel_cascata"] = self.NIVEL_TRIAGEM_LOCAL
+                    yield preparado
+        
+        # 2. Compatibilidade de todo o lote numa única operação de matrizes e
+        # seleção: acima do limiar ou entre os K melhores
+        with medir_etapa("cascata.ranking"):
+            metricas = MatrizCompatibilidade(perfil_vaga).calcular(
+                [preparado["habilidades"] for _, preparado in triados],
+                [preparado["texto"] for _, preparado in triados]
             )
+            for (_, preparado), score in zip(triados, metricas["compatibilidade"].tolist()):
+                preparado["score_triagem"] = score
+            triados = [triados[indice] for indice in MatrizCompatibilidade.ranquear(metricas).tolist()]
+        
+        aprovados = []
+        for posicao, (arquivo, preparado) in enumerate(triados):
+            if self._aprovado_na_triagem(preparado["score_triagem"], posicao, limiar_cascata, top_k_cascata):
+                aprovados.append((arquivo, preparado))
+            else:
+                yield self._resultado_triagem_local(arquivo, preparado)
+        
+        # 3. Avaliação com IA dos aprovados
+        def avaliar(arquivo, preparado):
+            with prioridade_requisicoes(PRIORIDADE_LOTE), contabilizar_uso(registro_uso), \
+                    contabilizar_uso() as uso_curriculo, \
+                    iniciar_rastreamento("processar_curriculo", nome_arquivo=arquivo.name) as rastreamento:
+                dados_estruturados = self._extrair_dados_ia(preparado, arquivo.name)
+                resultado_final = self._avaliar_texto(preparado["texto_preprocessado"], dados_estruturados,
+                                                      requisitos_vaga, arquivo.name,
+                                                      texto_extraido=preparado["texto"])
             
-            # 10. Armazenar no histórico
-            self.ultima_avaliacao = resultado_enriquecido
-            self._adicionar_ao_historico(resultado_enriquecido, arquivo_upload.name)
+            metadados = preparado["metadados"]
+            metadados["uso_tokens"] = uso_curriculo.para_dict()
+            metadados["tempos_etapas_ms"] = rastreamento.tempos_ms()
+            return {"sucesso": True, "resultado": resultado_final, "metadados": metadados}
+        
+        with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+            futuros = {executor.submit(avaliar, arquivo, preparado): (arquivo, preparado)
+                       for arquivo, preparado in aprovados}
             
+            for futuro in as_completed(futuros):
+                arquivo, preparado = futuros[futuro]
+                try:
+                    resultado = futuro.result()
+                except Exception as e:
+                    resultado = {
+                        "sucesso": False,
+                        "erro": f"Erro interno no sistema: {str(e)}",
+                        "etapa": "sistema"
+                    }
+                
+                resultado["nome_arquivo"] = arquivo.name
+                resultado["nivel_cascata"] = self.NIVEL_AVALIACAO_IA
+                resultado["score_triagem"] = preparado["score_triagem"]
+                yield resultado
+    
+    @staticmethod
+    def _aprovado_na_triagem(score_triagem: int, posicao: int, limiar_cascata: Optional[int],
+                             top_k_cascata: Optional[int]) -> bool:
+        """Sem limiar nem top-K, todos seguem à IA."""
+        if limiar_cascata is None and not top_k_cascata:
+            return True
+        if limiar_cascata is not None and score_triagem >= limiar_cascata:
+            return True
+        return bool(top_k_cascata) and posicao < top_k_cascata
+    
+    def _extrair_dados_ia(self, preparado: Dict[str, Any], nome_arquivo: str,
+                          callback_progresso: Optional[Callable[[Dict[str, Any]], None]] = None) -> Dict[str, Any]:
+        """
+        Extração com IA dos dados estruturados; mantém os dados locais se a IA
+        falhar e não repete a extração se os dados vieram de uma duplicata.
+        """
+        dados_estruturados = preparado["dados_estruturados"]
+        if not self.extrator_ia or preparado.get("dados_ia"):
+            return dados_estruturados
+        
+        try:
+            print("🤖 Iniciando extração inteligente com IA...")
+            dados_estruturados = self.extrator_ia.extrair_dados_completos(preparado["texto"], callback_progresso)
+        except Exception as e:
+            print(f"⚠️ Falha na extração inteligente de {nome_arquivo}: {e}")
+            return dados_estruturados
+        
+        preparado["dados_estruturados"] = dados_estruturados
+        preparado["dados_ia"] = True
+        self.indice_curriculos.adicionar(nome_arquivo, preparado["texto"], dados_estruturados)
+        if self.indice_duplicatas:
+            self.indice_duplicatas.registrar_dados(nome_arquivo, dados_estruturados)
+        preparado["metadados"].update({
+            "metodo_extracao": "IA",
+            "dados_estruturados_disponiveis": bool(dados_estruturados),
+            "qualidade_extracao": dados_estruturados.get("qualidade_extracao", "N/A")
+        })
+        return dados_estruturados
+    
+    def _resultado_triagem_local(self, arquivo, preparado: Dict[str, Any]) -> Dict[str, Any]:
+        """Resultado de quem parou na triagem local (sem score da IA)."""
+        dados_pessoais = preparado["dados_estruturados"].get("dados_pessoais", {})
+        
+        return {
+            "sucesso": True,
+            "resultado": {
+                "nome_candidato": dados_pessoais.get("nome_completo", "Não identificado"),
+                "email_candidato": dados_pessoais.get("email", "Não identificado"),
+                "score": None,
+                "classificacao": "Não avaliado pela IA",
+                "compatibilidade_vaga": preparado["score_triagem"],
+                "arquivo_original": arquivo.name
+            },
+            "metadados": preparado["metadados"],
+            "nome_arquivo": arquivo.name,
+            "nivel_cascata": self.NIVEL_TRIAGEM_LOCAL,
+            "score_triagem": preparado["score_triagem"]
+        }
+    
+    def processar_lote(self, arquivos, requisitos_vaga: str, max_workers: int = 4,
+                       max_processos: Optional[int] = None,
+                       callback_resultado: Optional[Callable[[Dict[str, Any]], None]] = None,
+                       modo_cascata: bool = False,
+                       limiar_cascata: Optional[int] = LIMIAR_CASCATA_PADRAO,
+                       top_k_cascata: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Processa um lote de currículos contra uma vaga e monta o ranking final.
+        
+        Args:
+            arquivos: Pasta, ZIP, padrão glob ou lista de caminhos/arquivos enviados
+            requisitos_vaga (str): Requisitos da vaga
+            max_workers (int): Número máximo de currículos processados em paralelo
+            max_processos (int): Processos para extração de texto (padrão: número de CPUs)
+            callback_resultado (Callable): Chamado com cada resultado assim que concluído
+            modo_cascata, limiar_cascata, top_k_cascata: Triagem local antes da IA
+                (ver processar_lote_iter)
+            
+        Returns:
+            Dict: Resultados individuais e ranking ordenado por score
+        """
+        if not requisitos_vaga or len(requisitos_vaga.strip()) < 20:
             return {
-                "sucesso": True,
-                "resultado": resultado_enriquecido,
-                "metadados": {
-                    "timestamp": datetime.now().isoformat(),
-                    "nome_arquivo": arquivo_upload.name,
-                    "tamanho_arquivo": arquivo_upload.size,
-                    "caracteres_extraidos": len(texto_curriculo),
-                    "caracteres_processados": len(texto_preprocessado),
-                    "metodo_extracao": metodo_extracao,
-                    "dados_estruturados_disponiveis": bool(dados_estruturados),
-                    "qualidade_extracao": dados_estruturados.get("qualidade_extracao", "N/A")
-                }
+                "sucesso": False,
+                "erro": "Requisitos da vaga muito curtos ou vazios (mínimo: 20 caracteres)",
+                "etapa": "validacao"
             }
-            
-        except Exception as e:
+        
+        inicio = datetime.now()
+        resultados = []
+        registro_uso = RegistroUsoTokens()
+        
+        for resultado in self.processar_lote_iter(arquivos, requisitos_vaga, max_workers, max_processos,
+                                                  registro_uso=registro_uso, modo_cascata=modo_cascata,
+                                                  limiar_cascata=limiar_cascata,
+                                                  top_k_cascata=top_k_cascata):
+            resultados.append(resultado)
+            if callback_resultado:
+                callback_resultado(resultado)
+        
+        if not resultados:
             return {
                 "sucesso": False,
-                "erro": f"Erro interno no sistema: {str(e)}",
-                "etapa": "sistema",
-                "detalhes_tecnico": type(e).__name__
+                "erro": "Nenhum currículo PDF/DOCX encontrado no lote",
+                "etapa": "validacao"
             }
+        
+        processados = sum(1 for r in resultados if r["sucesso"])
+        uso_tokens = registro_uso.para_dict()
+        uso_tokens["media_tokens_por_curriculo"] = round(uso_tokens["total"]["tokens_total"] / len(resultados))
+        
+        return {
+            "sucesso": True,
+            "total": len(resultados),
+            "processados": processados,
+            "falhas": len(resultados) - processados,
+            "avaliados_ia": self.contar_avaliados_ia(resultados),
+            "duracao_segundos": round((datetime.now() - inicio).total_seconds(), 1),
+            "uso_tokens": uso_tokens,
+            "resultados": resultados,
+            "ranking": self.gerar_ranking(resultados)
+        }
     
-    def _preprocessar_texto(self, texto: str) -> str:
-        """Pré-processa o texto do currículo"""
-        import re
+    def pre_selecionar(self, requisitos_vaga: str, k: int = 10) -> List[Dict[str, Any]]:
+        """
+        Busca no índice local (BM25) os currículos já processados mais aderentes à vaga,
+        sem nenhuma chamada à IA.
         
-        if not texto:
-            return ""
+        Args:
+            requisitos_vaga (str): Requisitos da vaga
+            k (int): Quantidade de candidatos pré-selecionados
         
-        # Remove caracteres especiais desnecessários mas preserva estrutura
-        texto_limpo = re.sub(r'\s+', ' ', texto)  # Normaliza espaços
-        texto_limpo = re.sub(r'[^\w\s@.\-(),;:!?\n]', '', texto_limpo)  # Remove caracteres especiais
+        Returns:
+            List[Dict]: id_documento (nome do arquivo), nome_candidato e pontuacao_bm25,
+                do mais para o menos aderente
+        """
+        with medir_etapa("pre_selecao"):
+            termos = self.indice_curriculos.termos_consulta(obter_perfil_vaga(requisitos_vaga))
+            return self.indice_curriculos.buscar(termos, k)
+    
+    def avaliar_pre_selecionados(self, requisitos_vaga: str, k: int = 10, max_workers: int = 4,
+                                 callback_resultado: Optional[Callable[[Dict[str, Any]], None]] = None) -> Dict[str, Any]:
+        """
+        Avalia com IA apenas os K currículos do índice mais aderentes à vaga,
+        reaproveitando o texto e os dados já extraídos.
         
-        # Melhora formatação para seções comuns
-        texto_limpo = re.sub(r'\b(EXPERIÊNCIA|EXPERIENCE|HISTÓRICO|CARREIRA)\b', '\n\nEXPERIÊNCIA PROFISSIONAL:\n', texto_limpo, flags=re.IGNORECASE)
-        texto_limpo = re.sub(r'\b(FORMAÇÃO|EDUCAÇÃO|EDUCATION|ACADEMIC)\b', '\n\nFORMAÇÃO:\n', texto_limpo, flags=re.IGNORECASE)
-        texto_limpo = re.sub(r'\b(HABILIDADES|SKILLS|COMPETÊNCIAS)\b', '\n\nHABILIDADES:\n', texto_limpo, flags=re.IGNORECASE)
-        texto_limpo = re.sub(r'\b(CERTIFICAÇÕES|CERTIFICATES|CURSOS)\b', '\n\nCERTIFICAÇÕES:\n', texto_limpo, flags=re.IGNORECASE)
+        Returns:
+            Dict: Mesmo formato de processar_lote, com pontuacao_bm25 em cada resultado
+        """
+        if not requisitos_vaga or len(requisitos_vaga.strip()) < 20:
+            return {
+                "sucesso": False,
+                "erro": "Requisitos da vaga muito curtos ou vazios (mínimo: 20 caracteres)",
+                "etapa": "validacao"
+            }
         
-        # Identifica e marca seções de contato
-        email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-        telefone_pattern = r'(\(?\d{2}\)?[\s-]?\d{4,5}[\s-]?\d{4})'
+        candidatos = self.pre_selecionar(requisitos_vaga, k)
+        if not candidatos:
+            return {
+                "sucesso": False,
+                "erro": "Nenhum currículo indexado para pré-seleção",
+                "etapa": "pre_selecao"
+            }
         
-        if re.search(email_pattern, texto_limpo):
-            texto_limpo = re.sub(email_pattern, r'\n\nCONTATO - EMAIL: \g<0>\n', texto_limpo, count=1)
+        inicio = datetime.now()
+        resultados = []
+        registro_uso = RegistroUsoTokens()
         
-        if re.search(telefone_pattern, texto_limpo):
-            texto_limpo = re.sub(telefone_pattern, r'\n\nCONTATO - TELEFONE: \g<0>\n', texto_limpo, count=1)
+        def avaliar_documento(candidato):
+            documento = self.indice_curriculos.obter(candidato["id_documento"])
+            if documento is None:
+                return {"sucesso": False, "erro": "Currículo removido do índice", "etapa": "pre_selecao"}
+            
+            with prioridade_requisicoes(PRIORIDADE_LOTE), contabilizar_uso(registro_uso):
+                return {
+                    "sucesso": True,
+                    "resultado": self._avaliar_texto(self._preprocessar_texto(documento.texto),
+                                                     documento.dados_estruturados,
+                                                     requisitos_vaga, documento.id_documento,
+                                                     texto_extraido=documento.texto)
+                }
         
-        # Limita tamanho para otimizar custo da API
-        if len(texto_limpo) > 5000:
-            # Prioriza as primeiras seções (geralmente mais importantes)
-            texto_limpo = texto_limpo[:4500] + "\n\n[TEXTO TRUNCADO PARA OTIMIZAÇÃO]"
+        with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+            futuros = {executor.submit(avaliar_documento, candidato): candidato for candidato in candidatos}
+            
+            for futuro in as_completed(futuros):
+                candidato = futuros[futuro]
+                try:
+                    resultado = futuro.result()
+                except Exception as e:
+                    resultado = {
+                        "sucesso": False,
+                        "erro": f"Erro interno no sistema: {str(e)}",
+                        "etapa": "sistema"
+                    }
+                
+                resultado["nome_arquivo"] = candidato["id_documento"]
+                resultado["nivel_cascata"] = self.NIVEL_AVALIACAO_IA
+                resultado["pontuacao_bm25"] = candidato["pontuacao_bm25"]
+                resultados.append(resultado)
+                if callback_resultado:
+                    callback_resultado(resultado)
         
-        return texto_limpo.strip()
+        processados = sum(1 for r in resultados if r["sucesso"])
+        
+        return {
+            "sucesso": True,
+            "total": len(resultados),
+            "processados": processados,
+            "falhas": len(resultados) - processados,
+            "indexados": len(self.indice_curriculos),
+            "duracao_segundos": round((datetime.now() - inicio).total_seconds(), 1),
+            "uso_tokens": registro_uso.para_dict(),
+            "resultados": resultados,
+            "ranking": self.gerar_ranking(resultados)
+        }
+    
+    def gerar_ranking(self, resultados: List[Dict[str, Any]]) -> pd.DataFrame:
+        """
+        Monta a tabela de ranking de um lote, do maior para o menor score.
+        
+        Currículos que falharam aparecem ao final, com o erro correspondente.
+        """
+        linhas = [self.resumir_resultado_lote(item) for item in resultados]
+        
+        if not linhas:
+            return pd.DataFrame()
+        
+        ranking = pd.DataFrame(linhas)
+        ranking = ranking.sort_values(by=["score", "compatibilidade_vaga"], ascending=False,
+                                      na_position="last").reset_index(drop=True)
+        ranking.insert(0, "posicao", range(1, len(ranking) + 1))
+        
+        return ranking
+    
+    def contar_avaliados_ia(self, resultados: List[Dict[str, Any]]) -> int:
+        """Currículos do lote que chegaram à avaliação com IA (com sucesso)."""
+        return sum(1 for r in resultados
+                   if r["sucesso"] and r.get("nivel_cascata", self.NIVEL_AVALIACAO_IA) == self.NIVEL_AVALIACAO_IA)
+    
+    def resumir_resultado_lote(self, item: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Resume o resultado de um currículo do lote numa linha plana (ranking/CSV).
+        """
+        uso_tokens = item.get("metadados", {}).get("uso_tokens", {}).get("total", {})
+        tokens = {
+            "tokens_entrada": uso_tokens.get("tokens_entrada", 0),
+            "tokens_saida": uso_tokens.get("tokens_saida", 0)
+        }
+        triagem = {
+            "nivel_cascata": item.get("nivel_cascata", self.NIVEL_AVALIACAO_IA),
+            "score_triagem": item.get("score_triagem"),
+            "duplicata_de": item.get("metadados", {}).get("duplicata", {}).get("id_documento", "")
+        }
+        
+        if item.get("sucesso"):
+            resultado = item["resultado"]
+            return {
+                "nome_candidato": resultado.get("nome_candidato", "Não identificado"),
+                "nome_arquivo": item.get("nome_arquivo", "N/A"),
+                "score": resultado.get("score", 0),
+                "classificacao": resultado.get("classificacao", "N/A"),
+                "compatibilidade_vaga": resultado.get("compatibilidade_vaga", 0),
+                "nivel_senioridade": resultado.get("nivel_senioridade", "N/A"),
+                "experiencia_anos": resultado.get("experiencia_anos", "N/A"),
+                "email_candidato": resultado.get("email_candidato", "Não identificado"),
+                **triagem,
+                **tokens,
+                "erro": ""
+            }
+        
+        return {
+            "nome_candidato": "Não identificado",
+            "nome_arquivo": item.get("nome_arquivo", "N/A"),
+            "score": None,
+            "classificacao": "Erro",
+            "compatibilidade_vaga": None,
+            "nivel_senioridade": "N/A",
+            "experiencia_anos": "N/A",
+            "email_candidato": "Não identificado",
+            **triagem,
+            **tokens,
+            "erro": item.get("erro", "Erro desconhecido")
+        }
+    
+    def _preprocessar_texto(self, texto: str) -> str:
+        """Pré-processa o texto do currículo (limpeza e marcação de seções numa etapa só)"""
+        return normalizar_curriculo(texto)
     
     def _validar_qualidade_texto(self, texto: str) -> Dict[str, Any]:
         """Valida se o texto tem qualidade suficiente"""
@@ -173,46 +920,6 @@ class SistemaRecrutamento:
             "tamanho_total": len(texto)
         }
     
-    def _validar_resultado_avaliacao(self, resultado: Dict[str, Any]) -> Dict[str, Any]:
-        """Valida e corrige o resultado da IA"""
-        # Campos obrigatórios com valores padrão
-        campos_obrigatorios = {
-            "score": 0,
-            "pontos_fortes": [],
-            "pontos_fracos": [],
-            "avaliacao_detalhada": "Avaliação não disponível",
-            "nome_candidato": "Não identificado",
-            "principais_habilidades": [],
-            "email_candidato": "Não identificado",
-            "telefone_candidato": "Não identificado",
-            "experiencia_anos": "Não identificado",
-            "nivel_senioridade": "A definir"
-        }
-        
-        # Aplica valores padrão para campos faltantes
-        for campo, valor_padrao in campos_obrigatorios.items():
-            if campo not in resultado or resultado[campo] is None:
-                resultado[campo] = valor_padrao
-        
-        # Validações específicas
-        try:
-            score = int(resultado["score"])
-            resultado["score"] = max(0, min(100, score))  # Garante que está entre 0-100
-        except (ValueError, TypeError):
-            resultado["score"] = 0
-        
-        # Garantir que listas são realmente listas
-        for campo_lista in ["pontos_fortes", "pontos_fracos", "principais_habilidades"]:
-            if not isinstance(resultado[campo_lista], list):
-                resultado[campo_lista] = []
-        
-        # Limita tamanho das listas para evitar spam
-        resultado["pontos_fortes"] = resultado["pontos_fortes"][:8]
-        resultado["pontos_fracos"] = resultado["pontos_fracos"][:8]
-        resultado["principais_habilidades"] = resultado["principais_habilidades"][:10]
-        
-        return resultado
-    
     def _validar_entrada(self, arquivo_upload, requisitos_vaga: str) -> Dict[str, Any]:
         """Valida os dados de entrada do sistema"""
         if not arquivo_upload:
@@ -231,69 +938,30 @@ class SistemaRecrutamento:
             "valido": True
         }
     
-    def _enriquecer_resultado(self, resultado: Dict[str, Any], texto: str, requisitos: str, nome_arquivo: str) -> Dict[str, Any]:
+    def _enriquecer_resultado(self, resultado: ResultadoAvaliacao, texto: str, perfil_vaga: PerfilVaga,
+                              nome_arquivo: str):
         """Enriquece o resultado com análises adicionais"""
         # Adiciona metadados do arquivo
-        resultado["arquivo_original"] = nome_arquivo
-        resultado["timestamp_avaliacao"] = datetime.now().isoformat()
-        
-        # Classificação baseada no score
-        score = resultado.get("score", 0)
-        if score >= 90:
-            resultado["classificacao"] = "Excepcional"
-        elif score >= 80:
-            resultado["classificacao"] = "Muito Bom"
-        elif score >= 70:
-            resultado["classificacao"] = "Bom"
-        elif score >= 60:
-            resultado["classificacao"] = "Regular"
-        elif score >= 50:
-            resultado["classificacao"] = "Inadequado"
-        else:
-            resultado["classificacao"] = "Rejeitado"
+        resultado.arquivo_original = nome_arquivo
+        resultado.timestamp_avaliacao = datetime.now().isoformat()
         
         # Análise de compatibilidade específica
-        resultado["compatibilidade_vaga"] = self._calcular_compatibilidade(texto, requisitos)
+        resultado.compatibilidade_vaga = self._calcular_compatibilidade(texto, perfil_vaga)
         
         # Sugestões de melhoria baseadas no score
-        resultado["sugestoes_melhoria"] = self._gerar_sugestoes_melhoria(resultado)
-        
-        return resultado
+        resultado.sugestoes_melhoria = self._gerar_sugestoes_melhoria(resultado)
     
-    def _calcular_compatibilidade(self, texto: str, requisitos: str) -> int:
+    def _calcular_compatibilidade(self, texto: str, perfil_vaga: PerfilVaga) -> int:
         """Calcula compatibilidade usando palavras-chave"""
-        import re
-        
-        texto_lower = texto.lower()
-        requisitos_lower = requisitos.lower()
-        
-        # Tecnologias comuns para verificar
-        tecnologias = [
-            'python', 'javascript', 'java', 'php', 'sql', 'html', 'css',
-            'react', 'angular', 'vue', 'node', 'django', 'flask', 'spring',
-            'aws', 'azure', 'docker', 'kubernetes', 'git', 'linux'
-        ]
-        
-        # Conta quantas tecnologias mencionadas nos requisitos o candidato possui
-        techs_requisitos = [tech for tech in tecnologias if tech in requisitos_lower]
-        techs_candidato = [tech for tech in tecnologias if tech in texto_lower]
-        techs_match = [tech for tech in techs_requisitos if tech in techs_candidato]
-        
-        if not techs_requisitos:
-            return 70  # Score médio se não há tecnologias específicas
-        
-        compatibilidade_tech = (len(techs_match) / len(techs_requisitos)) * 100
-        
-        # Ajusta baseado na presença de outras palavras-chave relevantes
-        palavras_experiencia = ['anos', 'experiência', 'projeto', 'desenvolvimento', 'gestão']
-        bonus_experiencia = sum(1 for palavra in palavras_experiencia if palavra in texto_lower) * 2
-        
-        return min(100, int(compatibilidade_tech + bonus_experiencia))
+        # Peso das habilidades da vaga que o candidato possui (obrigatórias valem mais),
+        # comparando pelo nome canônico (ex.: "k8s" no CV atende "Kubernetes" na vaga),
+        # mais o bônus de palavras de experiência; o lote usa o mesmo cálculo em matriz
+        return int(calcular_compatibilidades([texto], perfil_vaga)[0])
     
-    def _gerar_sugestoes_melhoria(self, resultado: Dict[str, Any]) -> list:
+    def _gerar_sugestoes_melhoria(self, resultado: ResultadoAvaliacao) -> list:
         """Gera sugestões de melhoria"""
         sugestoes = []
-        score = resultado.get("score", 0)
+        score = resultado.score
         
         if score < 70:
             sugestoes.extend([
@@ -309,34 +977,30 @@ class SistemaRecrutamento:
                 "Organize melhor as seções do currículo"
             ])
         
-        pontos_fracos = resultado.get("pontos_fracos", [])
-        if len(pontos_fracos) > 3:
+        if len(resultado.pontos_fracos) > 3:
             sugestoes.append("Foque em desenvolver as habilidades mencionadas como pontos fracos")
         
         return sugestoes[:5]  # Limita a 5 sugestões
     
-    def _adicionar_ao_historico(self, resultado: Dict[str, Any], nome_arquivo: str):
-        """Adiciona resultado ao histórico"""
-        entrada_historico = {
-            "timestamp": datetime.now().isoformat(),
-            "nome_arquivo": nome_arquivo,
-            "score": resultado.get("score", 0),
-            "classificacao": resultado.get("classificacao", "N/A"),
-            "nome_candidato": resultado.get("nome_candidato", "Não identificado")
-        }
-        
-        self.historico_avaliacoes.append(entrada_historico)
+    def obter_historico(self, pagina: int = 1, tamanho_pagina: int = 100, **filtros) -> pd.DataFrame:
+        """
+        Retorna uma página do histórico (mais recentes primeiro) como DataFrame.
         
-        # Limita histórico a 100 entradas para não consumir muita memória
-        if len(self.historico_avaliacoes) > 100:
-            self.historico_avaliacoes = self.historico_avaliacoes[-100:]
-    
-    def obter_historico(self) -> pd.DataFrame:
-        """Retorna histórico como DataFrame"""
-        if not self.historico_avaliacoes:
+        Args:
+            pagina (int): Página, a partir de 1
+            tamanho_pagina (int): Avaliações por página
+            **filtros: vaga_hash, nome_candidato (prefixo), score_minimo, desde (ISO 8601)
+        """
+        registros = self.historico.listar(pagina, tamanho_pagina, **filtros)
+        if not registros:
             return pd.DataFrame()
         
-        return pd.DataFrame(self.historico_avaliacoes)
+        return pd.DataFrame(registros)
+    
+    def obter_estatisticas_avaliacao(self, requisitos_vaga: Optional[str] = None) -> Dict[str, Any]:
+        """Estatísticas do histórico, de todas as vagas ou só da vaga informada"""
+        filtros = {"vaga_hash": gerar_hash_vaga(requisitos_vaga)} if requisitos_vaga else {}
+        return self.avaliador.obter_estatisticas_avaliacao(historico=self.historico, **filtros)
     
     def exportar_resultado_excel(self, resultado: Dict[str, Any], nome_arquivo: str = None) -> str:
         """Exporta resultado para Excel"""
@@ -380,7 +1044,7 @@ class SistemaRecrutamento:
             avaliador_ok = self.avaliador is not None
             
             # Verifica se há avaliações no histórico
-            total_avaliacoes = len(self.historico_avaliacoes)
+            total_avaliacoes = self.historico.contar()
             
             # Verifica configurações básicas
             import os
@@ -407,6 +1071,14 @@ class SistemaRecrutamento:
                 print(f"Erro ao verificar conexão Gemini: {e}")
                 gemini_conectado = False
             
+            # Contadores do cache persistente de respostas da IA
+            cache_ia = obter_cache_padrao()
+            
+            try:
+                cliente_gemini = obter_cliente_gemini().estatisticas()
+            except Exception:
+                cliente_gemini = {"ativo": False}
+            
             return {
                 "sistema_ativo": True,
                 "avaliador_inicializado": avaliador_ok,
@@ -414,7 +1086,16 @@ class SistemaRecrutamento:
                 "gemini_conectado": gemini_conectado,
                 "total_avaliacoes_realizadas": total_avaliacoes,
                 "ultima_avaliacao": self.ultima_avaliacao is not None,
-                "memoria_sistema": f"{len(self.historico_avaliacoes)}/100 avaliações em cache",
+                "memoria_sistema": f"{total_avaliacoes} avaliações no histórico",
+                "historico": self.historico.caminho,
+                "perfis_vaga": obter_cache_perfis_vaga().estatisticas(),
+                "indice_curriculos": self.indice_curriculos.estatisticas(),
+                "indice_duplicatas": self.indice_duplicatas.estatisticas() if self.indice_duplicatas
+                else {"ativo": False},
+                "cache_ia": cache_ia.estatisticas() if cache_ia else {"ativo": False},
+                "cliente_gemini": cliente_gemini,
+                "uso_tokens": obter_registro_global().para_dict(),
+                "latencias_etapas": obter_estatisticas_latencia().resumo(),
                 "status": "Sistema operacional e pronto para uso"
             }
             
@@ -425,14 +1106,12 @@ class SistemaRecrutamento:
                 "status": f"Sistema com problemas: {str(e)}"
             }
     
-    def _enriquecer_requisitos_com_dados(self, requisitos: str, dados_estruturados: Dict[str, Any]) -> str:
-        """Enriquece requisitos com dados estruturados"""
+    def _formatar_contexto_candidato(self, dados_estruturados: Dict[str, Any]) -> str:
+        """Bloco do prompt com os dados estruturados do candidato (vazio se a extração falhou)"""
         if not dados_estruturados or dados_estruturados.get("qualidade_extracao") == "FALHA":
-            return requisitos
+            return ""
         
-        requisitos_enriquecidos = f"""
-{requisitos}
-
+        contexto_candidato = f"""
 ======= CONTEXTO ADICIONAL DO CANDIDATO PARA ANÁLISE =======
 
 DADOS ESTRUTURADOS EXTRAÍDOS DO CURRÍCULO:
@@ -458,115 +1137,26 @@ DADOS ESTRUTURADOS EXTRAÍDOS DO CURRÍCULO:
 IMPORTANTE: Use estas informações estruturadas para uma análise mais precisa e completa!
 """
         
-        return requisitos_enriquecidos
+        return contexto_candidato
     
-    def _enriquecer_resultado_com_dados_estruturados(self, resultado: Dict[str, Any], 
+    def _enriquecer_resultado_com_dados_estruturados(self, resultado: ResultadoAvaliacao, 
                                                    dados_estruturados: Dict[str, Any],
-                                                   texto: str, requisitos: str, 
-                                                   nome_arquivo: str) -> Dict[str, Any]:
+                                                   texto: str, perfil_vaga: PerfilVaga, 
+                                                   nome_arquivo: str):
         """
-        Enriquece o resultado da avaliação com os dados estruturados extraídos.
+        Enriquece, no próprio objeto, o resultado da avaliação com os dados estruturados extraídos.
         
         Args:
-            resultado (Dict): Resultado base da avaliação
+            resultado (ResultadoAvaliacao): Resultado validado da avaliação
             dados_estruturados (Dict): Dados estruturados extraídos
-            texto (str): Texto do currículo
-            requisitos (str): Requisitos da vaga
+            texto (str): Texto extraído do currículo (compatibilidade com a vaga)
+            perfil_vaga (PerfilVaga): Perfil compilado da vaga
             nome_arquivo (str): Nome do arquivo
-            
-        Returns:
-            Dict: Resultado super enriquecido
         """
-        # Usa o método original como base
-        resultado_enriquecido = self._enriquecer_resultado(resultado, texto, requisitos, nome_arquivo)
+        self._enriquecer_resultado(resultado, texto, perfil_vaga, nome_arquivo)
         
-        # Adiciona dados estruturados se disponíveis
         if dados_estruturados and dados_estruturados.get("qualidade_extracao") != "FALHA":
-            
-            # Sobrescreve dados básicos com informações mais precisas da IA
-            dados_pessoais = dados_estruturados.get("dados_pessoais", {})
-            if dados_pessoais.get("nome_completo", "") != "Não identificado":
-                resultado_enriquecido["nome_candidato"] = dados_pessoais["nome_completo"]
-            if dados_pessoais.get("email", "") != "Não identificado":
-                resultado_enriquecido["email_candidato"] = dados_pessoais["email"]
-            if dados_pessoais.get("telefone", "") != "Não identificado":
-                resultado_enriquecido["telefone_candidato"] = dados_pessoais["telefone"]
-            
-            # Adiciona informações adicionais de contato
-            resultado_enriquecido["linkedin_candidato"] = dados_pessoais.get("linkedin", "Não identificado")
-            resultado_enriquecido["github_candidato"] = dados_pessoais.get("github", "Não identificado")
-            resultado_enriquecido["endereco_candidato"] = dados_pessoais.get("endereco", "Não identificado")
-            
-            # Enriquece com dados de experiência mais precisos
-            exp_profissional = dados_estruturados.get("experiencia_profissional", {})
-            if exp_profissional.get("tempo_total_experiencia_anos"):
-                resultado_enriquecido["experiencia_anos"] = exp_profissional["tempo_total_experiencia_anos"]
-            
-            # Adiciona experiências detalhadas
-            resultado_enriquecido["experiencias_detalhadas"] = exp_profissional.get("experiencias", [])
-            resultado_enriquecido["areas_atuacao"] = exp_profissional.get("areas_de_atuacao", [])
-            resultado_enriquecido["progressao_carreira"] = exp_profissional.get("progressao_carreira", "Não identificado")
-            
-            # Enriquece habilidades com dados estruturados
-            habilidades = dados_estruturados.get("habilidades_competencias", {})
-            if habilidades:
-                resultado_enriquecido["linguagens_programacao"] = habilidades.get("linguagens_programacao", [])
-                resultado_enriquecido["frameworks_bibliotecas"] = habilidades.get("frameworks_bibliotecas", [])
-                resultado_enriquecido["ferramentas_devops"] = habilidades.get("ferramentas_devops", [])
-                resultado_enriquecido["cloud_platforms"] = habilidades.get("cloud_platforms", [])
-                resultado_enriquecido["soft_skills_identificadas"] = habilidades.get("soft_skills", [])
-                resultado_enriquecido["idiomas"] = habilidades.get("idiomas", [])
-                
-                # Atualiza principais habilidades com dados mais precisos
-                principais_hab = []
-                principais_hab.extend(habilidades.get("linguagens_programacao", [])[:3])
-                principais_hab.extend(habilidades.get("frameworks_bibliotecas", [])[:2])
-                principais_hab.extend(habilidades.get("especializacoes", [])[:2])
-                resultado_enriquecido["principais_habilidades"] = principais_hab[:5]
-            
-            # Adiciona formação detalhada
-            formacao = dados_estruturados.get("formacao_educacao", {})
-            if formacao:
-                resultado_enriquecido["formacao_superior"] = formacao.get("formacao_superior", [])
-                resultado_enriquecido["certificacoes_tecnicas"] = formacao.get("certificacoes", [])
-                resultado_enriquecido["cursos_complementares"] = formacao.get("cursos_complementares", [])
-                resultado_enriquecido["nivel_educacional"] = formacao.get("nivel_educacional", "Não identificado")
-                resultado_enriquecido["area_formacao"] = formacao.get("area_formacao", "Não identificado")
-            
-            # Adiciona projetos e conquistas
-            projetos = dados_estruturados.get("projetos_conquistas", {})
-            if projetos:
-                resultado_enriquecido["projetos_destaque"] = projetos.get("projetos_destaque", [])
-                resultado_enriquecido["conquistas_quantificadas"] = projetos.get("conquistas_quantificadas", [])
-                resultado_enriquecido["reconhecimentos"] = projetos.get("reconhecimentos", [])
-                resultado_enriquecido["contribuicoes_open_source"] = projetos.get("contribuicoes_open_source", [])
-            
-            # Adiciona métricas calculadas pela IA
-            metricas = dados_estruturados.get("metricas_calculadas", {})
-            if metricas:
-                resultado_enriquecido["score_completude_dados"] = metricas.get("score_completude", 0)
-                resultado_enriquecido["nivel_senioridade"] = metricas.get("nivel_senioridade_calculado", "A definir")
-                resultado_enriquecido["areas_especialidade"] = metricas.get("areas_especialidade", [])
-                resultado_enriquecido["pontos_fortes_ia"] = metricas.get("pontos_fortes_identificados", [])
-                resultado_enriquecido["gaps_identificados"] = metricas.get("gaps_identificados", [])
-            
-            # Adiciona informações sobre qualidade da extração
-            resultado_enriquecido["qualidade_extracao_dados"] = dados_estruturados.get("qualidade_extracao", "N/A")
-            resultado_enriquecido["metodo_extracao_usado"] = "IA_AVANCADA" if "IA" in dados_estruturados.get("qualidade_extracao", "") else "REGEX_BASICA"
-            
-            # Melhora o nível de senioridade com base nos dados estruturados
-            if exp_profissional.get("tempo_total_experiencia_anos"):
-                anos = exp_profissional["tempo_total_experiencia_anos"]
-                if anos >= 8:
-                    resultado_enriquecido["nivel_senioridade"] = "Especialista"
-                elif anos >= 5:
-                    resultado_enriquecido["nivel_senioridade"] = "Senior"
-                elif anos >= 2:
-                    resultado_enriquecido["nivel_senioridade"] = "Pleno"
-                else:
-                    resultado_enriquecido["nivel_senioridade"] = "Junior"
-        
-        return resultado_enriquecido
+            resultado.candidato.aplicar_dados_estruturados(dados_estruturados)
     
     def _formatar_dados_pessoais(self, dados: Dict) -> str:
         """Formata dados pessoais"""
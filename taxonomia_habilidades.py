@@ -0,0 +1,341 @@
+"""Taxonomia de habilidades carregada de arquivo (JSON/CSV) com busca indexada"""
+
+import os
+import re
+import csv
+import json
+import threading
+from typing import Dict, Any, List, Optional, Iterable
+
+from padroes_texto import MotorPalavrasChave
+
+CAMINHO_TAXONOMIA_PADRAO = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                        "taxonomia_habilidades.json")
+
+# Ordem dos níveis usados nas dicas de senioridade
+NIVEIS_SENIORIDADE = ("Junior", "Pleno", "Senior")
+
+_FIM_TERMO = "\0"
+
+
+def _normalizar(termo: str) -> str:
+    return " ".join(termo.lower().split())
+
+
+class TaxonomiaHabilidades:
+    """
+    Catálogo de habilidades canônicas com sinônimos, categorias e dicas de senioridade.
+
+    Cada habilidade é identificada pelo nome em minúsculas (ex.: "kubernetes") e
+    pode ter aliases ("k8s", "kube"). Os termos ficam indexados em:
+
+    - um dicionário alias -> habilidade, para resolução em O(1);
+    - uma trie, para busca por prefixo (autocompletar);
+    - um autômato Aho-Corasick, para encontrar todas as habilidades de um
+      texto numa única passada, seja qual for o tamanho do catálogo.
+
+    Habilidades com nome ambíguo em texto comum (ex.: "R", que aparece em
+    "R$" e "R. das Flores") podem declarar um padrão: elas ficam fora do
+    autômato, que não diferencia maiúsculas, e são buscadas pela regex.
+    """
+
+    def __init__(self):
+        self._habilidades: Dict[str, Dict[str, Any]] = {}
+        self._aliases: Dict[str, str] = {}
+        self._trie: Dict[str, Any] = {}
+        self._indicadores_senioridade: Dict[str, List[str]] = {}
+        self._padroes: Dict[str, re.Pattern] = {}
+        self._motor: Optional[MotorPalavrasChave] = None
+        self._motor_senioridade: Optional[MotorPalavrasChave] = None
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._habilidades)
+
+    def __contains__(self, termo: str) -> bool:
+        return self.resolver(termo) is not None
+
+    @classmethod
+    def de_arquivo(cls, caminho: str) -> 'TaxonomiaHabilidades':
+        """
+        Cria a taxonomia a partir de um arquivo .json ou .csv.
+        """
+        taxonomia = cls()
+        taxonomia.carregar_arquivo(caminho)
+        return taxonomia
+
+    def carregar_arquivo(self, caminho: str):
+        """
+        Carrega habilidades de um arquivo, escolhendo o formato pela extensão.
+        """
+        if caminho.lower().endswith('.csv'):
+            self.carregar_csv(caminho)
+        else:
+            self.carregar_json(caminho)
+
+    def carregar_json(self, caminho: str):
+        """
+        Carrega habilidades de um JSON no formato:
+
+            {
+              "habilidades": [
+                {"nome": "Kubernetes", "categoria": "ferramentas",
+                 "aliases": ["k8s"], "senioridade": "Pleno"},
+                {"nome": "R", "categoria": "linguagens", "padrao": "(?<![\\w.&])R(?![\\w$&#+]|\\.\\s*\\w)"}
+              ],
+              "indicadores_senioridade": {"Senior": ["tech lead", "arquiteto"]}
+            }
+        """
+        with open(caminho, 'r', encoding='utf-8') as arquivo:
+            dados = json.load(arquivo)
+
+        for item in dados.get("habilidades", []):
+            self.adicionar_habilidade(
+                item["nome"],
+                item.get("categoria", "outros"),
+                item.get("aliases", []),
+                item.get("senioridade"),
+                item.get("padrao")
+            )
+
+        for nivel, termos in dados.get("indicadores_senioridade", {}).items():
+            self.adicionar_indicadores_senioridade(nivel, termos)
+
+    def carregar_csv(self, caminho: str):
+        """
+        Carrega habilidades de um CSV com as colunas nome, categoria, aliases
+        (separados por "|"), senioridade e padrao (opcionais).
+        """
+        with open(caminho, 'r', encoding='utf-8-sig', newline='') as arquivo:
+            for linha in csv.DictReader(arquivo):
+                nome = (linha.get("nome") or "").strip()
+                if not nome:
+                    continue
+
+                aliases = [a.strip() for a in (linha.get("aliases") or "").split("|") if a.strip()]
+                self.adicionar_habilidade(
+                    nome,
+                    (linha.get("categoria") or "outros").strip(),
+                    aliases,
+                    (linha.get("senioridade") or "").strip() or None,
+                    (linha.get("padrao") or "").strip() or None
+                )
+
+    def adicionar_habilidade(self, nome: str, categoria: str, aliases: Iterable[str] = (),
+                             senioridade: Optional[str] = None, padrao: Optional[str] = None):
+        """
+        Registra uma habilidade canônica e seus sinônimos.
+
+        Args:
+            nome (str): Nome de exibição (ex.: "Kubernetes")
+            categoria (str): Categoria (ex.: "linguagens", "frameworks", "ferramentas")
+            aliases (Iterable): Sinônimos e grafias alternativas (ex.: "k8s")
+            senioridade (str): Nível mínimo sugerido por dominar a habilidade
+            padrao (str): Regex (com diferença de maiúsculas) que substitui a busca
+                pelo nome e aliases no texto, para nomes ambíguos
+        """
+        chave = _normalizar(nome)
+        padrao_compilado = re.compile(padrao) if padrao else None
+
+        with self._lock:
+            habilidade = self._habilidades.setdefault(chave, {
+                "nome": nome,
+                "categoria": categoria,
+                "aliases": [],
+                "senioridade": senioridade
+            })
+            if senioridade:
+                habilidade["senioridade"] = senioridade
+            if padrao_compilado:
+                self._padroes[chave] = padrao_compilado
+
+            for termo in [nome, *aliases]:
+                termo_normalizado = _normalizar(termo)
+                if not termo_normalizado:
+                    continue
+
+                dono = self._aliases.get(termo_normalizado)
+                if dono is not None and dono != chave:
+                    print(f"⚠️ Alias '{termo}' já pertence a '{dono}', ignorado para '{chave}'")
+                    continue
+
+                if dono is None:
+                    self._aliases[termo_normalizado] = chave
+                    self._inserir_trie(termo_normalizado, chave)
+                    if termo_normalizado != chave:
+                        habilidade["aliases"].append(termo)
+
+            self._motor = None
+
+    def adicionar_indicadores_senioridade(self, nivel: str, termos: Iterable[str]):
+        """
+        Registra termos (cargos, títulos) que indicam um nível de senioridade.
+        """
+        with self._lock:
+            self._indicadores_senioridade.setdefault(nivel, []).extend(
+                _normalizar(t) for t in termos if t.strip()
+            )
+            self._motor_senioridade = None
+
+    def _inserir_trie(self, termo: str, chave: str):
+        no = self._trie
+        for caractere in termo:
+            no = no.setdefault(caractere, {})
+        no.setdefault(_FIM_TERMO, set()).add(chave)
+
+    def resolver(self, termo: str) -> Optional[str]:
+        """
+        Resolve um nome ou alias para a habilidade canônica.
+
+        Returns:
+            str: Chave canônica (ex.: "k8s" -> "kubernetes"), ou None se desconhecido
+        """
+        return self._aliases.get(_normalizar(termo))
+
+    def obter(self, termo: str) -> Optional[Dict[str, Any]]:
+        """
+        Retorna os dados da habilidade (nome, categoria, aliases, senioridade).
+        """
+        chave = self.resolver(termo)
+        return dict(self._habilidades[chave]) if chave else None
+
+    def nome_exibicao(self, chave: str) -> str:
+        habilidade = self._habilidades.get(chave)
+        return habilidade["nome"] if habilidade else chave
+
+    def categoria(self, termo: str) -> Optional[str]:
+        chave = self.resolver(termo)
+        return self._habilidades[chave]["categoria"] if chave else None
+
+    @property
+    def categorias(self) -> List[str]:
+        return list(dict.fromkeys(h["categoria"] for h in self._habilidades.values()))
+
+    def buscar_prefixo(self, prefixo: str, limite: int = 10) -> List[str]:
+        """
+        Lista habilidades cujo nome ou alias começa com o prefixo.
+
+        Args:
+            prefixo (str): Início do termo digitado
+            limite (int): Máximo de resultados
+
+        Returns:
+            List[str]: Chaves canônicas, das correspondências mais curtas às mais longas
+        """
+        no = self._trie
+        for caractere in _normalizar(prefixo):
+            no = no.get(caractere)
+            if no is None:
+                return []
+
+        encontrados = []
+        nivel = [no]
+        # Busca em largura: termos mais curtos (mais próximos do prefixo) primeiro
+        while nivel and len(encontrados) < limite:
+            proximo_nivel = []
+            for atual in nivel:
+                for caractere, filho in atual.items():
+                    if caractere == _FIM_TERMO:
+                        for chave in sorted(filho):
+                            if chave not in encontrados:
+                                encontrados.append(chave)
+                    else:
+                        proximo_nivel.append(filho)
+            nivel = proximo_nivel
+
+        return encontrados[:limite]
+
+    def _obter_motor(self) -> MotorPalavrasChave:
+        with self._lock:
+            if self._motor is None:
+                # Habilidades com padrão próprio ficam fora do autômato
+                self._motor = MotorPalavrasChave({
+                    "termos": [termo for termo, chave in self._aliases.items() if chave not in self._padroes]
+                })
+            return self._motor
+
+    def extrair(self, texto: str, categorias: Optional[Iterable[str]] = None) -> Dict[str, List[str]]:
+        """
+        Encontra as habilidades citadas no texto, já resolvidas para a forma canônica.
+
+        Args:
+            texto (str): Texto a ser analisado
+            categorias (Iterable): Restringe o resultado a estas categorias (padrão: todas)
+
+        Returns:
+            Dict: Categoria -> chaves canônicas encontradas, na ordem da taxonomia
+        """
+        nomes = list(categorias) if categorias is not None else self.categorias
+        resultado = {categoria: [] for categoria in nomes}
+
+        if not texto:
+            return resultado
+
+        encontradas = {self._aliases[termo] for termo in self._obter_motor().encontrar_termos(texto)}
+        encontradas.update(chave for chave, padrao in self._padroes.items() if padrao.search(texto))
+
+        for chave, habilidade in self._habilidades.items():
+            if chave in encontradas and habilidade["categoria"] in resultado:
+                resultado[habilidade["categoria"]].append(chave)
+
+        return resultado
+
+    def extrair_lista(self, texto: str, categorias: Optional[Iterable[str]] = None) -> List[str]:
+        """
+        Igual a extrair(), mas com todas as categorias numa única lista.
+        """
+        return [chave for chaves in self.extrair(texto, categorias).values() for chave in chaves]
+
+    def sugerir_senioridade(self, texto: str) -> Optional[str]:
+        """
+        Sugere o nível mais alto indicado no texto por cargos ou habilidades.
+
+        Returns:
+            str: "Junior", "Pleno" ou "Senior", ou None sem indícios
+        """
+        with self._lock:
+            if self._motor_senioridade is None:
+                self._motor_senioridade = MotorPalavrasChave(self._indicadores_senioridade)
+            motor_senioridade = self._motor_senioridade
+
+        niveis = {nivel for nivel, termos in motor_senioridade.buscar(texto).items() if termos}
+        niveis.update(
+            self._habilidades[chave]["senioridade"]
+            for chave in self.extrair_lista(texto)
+            if self._habilidades[chave]["senioridade"]
+        )
+
+        for nivel in reversed(NIVEIS_SENIORIDADE):
+            if nivel in niveis:
+                return nivel
+        return None
+
+
+_taxonomia_padrao = None
+_taxonomia_padrao_lock = threading.Lock()
+
+
+def obter_taxonomia_padrao() -> TaxonomiaHabilidades:
+    """
+    Retorna a taxonomia compartilhada pelo processo.
+
+    O arquivo pode ser trocado pela variável TAXONOMIA_HABILIDADES_CAMINHO
+    (JSON ou CSV); se não puder ser lido, usa a taxonomia que acompanha o projeto.
+    """
+    global _taxonomia_padrao
+
+    with _taxonomia_padrao_lock:
+        if _taxonomia_padrao is None:
+            caminho = os.getenv('TAXONOMIA_HABILIDADES_CAMINHO', CAMINHO_TAXONOMIA_PADRAO)
+            try:
+                _taxonomia_padrao = TaxonomiaHabilidades.de_arquivo(caminho)
+            except (OSError, ValueError, KeyError) as e:
+                print(f"⚠️ Taxonomia de habilidades '{caminho}' indisponível: {e}")
+                _taxonomia_padrao = TaxonomiaHabilidades()
+                if caminho != CAMINHO_TAXONOMIA_PADRAO:
+                    try:
+                        _taxonomia_padrao.carregar_arquivo(CAMINHO_TAXONOMIA_PADRAO)
+                    except (OSError, ValueError, KeyError) as e:
+                        print(f"⚠️ Taxonomia padrão indisponível: {e}")
+
+        return _taxonomia_padrao
@@ -0,0 +1,25 @@
+"""Regressões da pré-seleção BM25"""
+
+from indice_bm25 import IndiceBM25
+from perfil_vaga import compilar_perfil_vaga
+
+
+def test_consulta_ignora_salario_e_vocabulario_do_anuncio():
+    perfil = compilar_perfil_vaga("Obrigatório: C#, .NET. Salário R$ 10.000")
+
+    termos = IndiceBM25.termos_consulta(perfil)
+
+    assert not {"obrigatorio", "salario", "10.000", "r", "hab:r"} & set(termos)
+    assert termos["hab:c#"] == 3.0
+
+
+def test_curriculo_sem_relacao_nao_aparece_pela_pretensao_salarial():
+    indice = IndiceBM25()
+    indice.adicionar("vendas.pdf", "Analista de vendas, pretensão salarial R$ 3.000")
+    indice.adicionar("dotnet.pdf", "Desenvolvedor C# com .NET e SQL Server")
+    indice.adicionar("enfermagem.pdf", "Enfermeira com experiência hospitalar")
+
+    perfil = compilar_perfil_vaga("Obrigatório: C#, .NET. Salário R$ 10.000")
+    encontrados = indice.buscar(IndiceBM25.termos_consulta(perfil), k=3)
+
+    assert [item["id_documento"] for item in encontrados] == ["dotnet.pdf"]
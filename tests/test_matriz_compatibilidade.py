@@ -0,0 +1,57 @@
+"""Regressões da compatibilidade calculada em matriz"""
+
+from matriz_compatibilidade import MatrizCompatibilidade, calcular_compatibilidades
+from normalizador_texto import normalizar_curriculo
+from perfil_vaga import compilar_perfil_vaga
+from taxonomia_habilidades import obter_taxonomia_padrao
+
+VAGA_COM_SALARIO = (
+    "Desenvolvedor backend\n"
+    "Obrigatório: Python, Django\n"
+    "Salário: R$ 8.000"
+)
+
+
+def test_linha_de_salario_nao_vira_requisito():
+    perfil = compilar_perfil_vaga(VAGA_COM_SALARIO)
+
+    assert perfil.pesos_habilidades == {"python": 3.0, "django": 3.0}
+
+
+def test_pretensao_salarial_nao_altera_compatibilidade():
+    perfil = compilar_perfil_vaga(VAGA_COM_SALARIO)
+    curriculo = "Desenvolvedor Python com Django"
+
+    compatibilidades = calcular_compatibilidades(
+        [curriculo, curriculo + "\nPretensão R$ 9.000"], perfil
+    )
+
+    assert compatibilidades.tolist() == [100, 100]
+
+
+def test_triagem_em_cascata_nao_depende_da_formatacao_do_salario():
+    # Mesmo cálculo da triagem de _processar_lote_cascata_iter: habilidades do
+    # texto extraído, matriz de compatibilidade e ranking do lote
+    perfil = compilar_perfil_vaga(VAGA_COM_SALARIO)
+    textos = [
+        "Vendedor com experiência em varejo",
+        "Desenvolvedor Python com Django. Pretensão R$ 9.000",
+        "Desenvolvedor Python com Django",
+    ]
+    taxonomia = obter_taxonomia_padrao()
+
+    metricas = MatrizCompatibilidade(perfil).calcular(
+        [taxonomia.extrair_lista(texto) for texto in textos], textos
+    )
+
+    assert metricas["compatibilidade"].tolist()[1:] == [100, 100]
+    assert MatrizCompatibilidade.ranquear(metricas).tolist() == [1, 2, 0]
+
+
+def test_csharp_e_cpp_casam_no_texto_pre_processado():
+    perfil = compilar_perfil_vaga("Requisitos obrigatórios: C#, .NET, C++ e Node.js")
+    curriculo = "Desenvolvedor C# e C++ com .NET e Node.js"
+
+    compatibilidades = calcular_compatibilidades([curriculo, normalizar_curriculo(curriculo)], perfil)
+
+    assert compatibilidades.tolist() == [100, 100]
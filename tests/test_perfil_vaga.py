@@ -0,0 +1,31 @@
+"""Regressões do perfil compilado da vaga"""
+
+from perfil_vaga import PESO_DESEJAVEL, PESO_OBRIGATORIO, compilar_perfil_vaga
+
+
+def test_marcadores_na_mesma_linha_pesam_cada_trecho():
+    perfil = compilar_perfil_vaga("Requisitos obrigatórios: C#, .NET. Desejável: Kubernetes")
+
+    assert perfil.pesos_habilidades == {
+        "c#": PESO_OBRIGATORIO, ".net": PESO_OBRIGATORIO, "kubernetes": PESO_DESEJAVEL
+    }
+
+
+def test_senioridade_ignora_linhas_de_contato():
+    perfil = compilar_perfil_vaga(
+        "Vaga de desenvolvedor Python\n"
+        "Obrigatório: Python, Django\n"
+        "Enviar currículo ao Sr. Carlos - rh@empresa.com.br"
+    )
+
+    assert perfil.senioridade is None
+
+
+def test_senioridade_dos_requisitos_e_mantida():
+    perfil = compilar_perfil_vaga(
+        "Desenvolvedor Sênior\n"
+        "Obrigatório: Python\n"
+        "Interessados enviar currículo para rh@empresa.com.br"
+    )
+
+    assert perfil.senioridade == "Senior"
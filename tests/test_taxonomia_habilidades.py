@@ -0,0 +1,51 @@
+"""Regressões da busca de habilidades e senioridade em texto comum"""
+
+import pytest
+
+from taxonomia_habilidades import obter_taxonomia_padrao
+
+
+@pytest.fixture(scope="module")
+def taxonomia():
+    return obter_taxonomia_padrao()
+
+
+@pytest.mark.parametrize("texto", [
+    "Pretensão: R$ 3.000",
+    "Salário: R$ 8.000 + benefícios",
+    "Rua R. das Flores, 120",
+    "Experiência em R&D",
+    "Eu ia trabalhar no sábado",
+    "Frasco de 500 ml",
+])
+def test_texto_comum_nao_gera_habilidade(taxonomia, texto):
+    assert taxonomia.extrair_lista(texto) == []
+
+
+@pytest.mark.parametrize("texto", [
+    "Linguagens: Python, R, SQL",
+    "Análises estatísticas em R.",
+])
+def test_linguagem_r_continua_reconhecida(taxonomia, texto):
+    assert "r" in taxonomia.extrair_lista(texto)
+
+
+def test_js_nao_casa_dentro_de_node_js(taxonomia):
+    assert taxonomia.extrair_lista("Node.js e React.js") == ["react", "node.js"]
+
+
+@pytest.mark.parametrize("texto", [
+    "Sr. João da Silva, auxiliar administrativo",
+    "Enviar currículo ao Sr. Carlos",
+    "Responsável: José Pereira Jr.",
+])
+def test_tratamento_nao_indica_senioridade(taxonomia, texto):
+    assert taxonomia.sugerir_senioridade(texto) is None
+
+
+@pytest.mark.parametrize("texto, nivel", [
+    ("Desenvolvedor Sr. Python", "Senior"),
+    ("Vaga para Analista Jr", "Junior"),
+])
+def test_cargo_abreviado_indica_senioridade(taxonomia, texto, nivel):
+    assert taxonomia.sugerir_senioridade(texto) == nivel
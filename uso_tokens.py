@@ -0,0 +1,165 @@
+"""Contabilização dos tokens consumidos nas chamadas à IA"""
+
+import os
+import threading
+import contextvars
+from contextlib import contextmanager
+from typing import Dict, Any, Optional
+
+# Registros que recebem o uso das chamadas feitas no contexto atual
+# (ex.: o do currículo em processamento e o do lote a que ele pertence)
+_registros_ativos = contextvars.ContextVar("registros_uso_tokens", default=())
+
+
+class RegistroUsoTokens:
+    """
+    Acumula, por etapa (ex.: "extracao:habilidades", "avaliacao"), o número de
+    chamadas, os tokens de entrada/saída informados em usage_metadata e o
+    tamanho dos prompts enviados.
+    """
+
+    CAMPOS = ("chamadas", "respostas_cache", "tokens_entrada", "tokens_saida",
+              "tokens_total", "tokens_cache", "caracteres_prompt")
+
+    def __init__(self):
+        self._etapas: Dict[str, Dict[str, int]] = {}
+        self._lock = threading.Lock()
+
+    def _obter_etapa(self, etapa: str) -> Dict[str, int]:
+        return self._etapas.setdefault(etapa, {campo: 0 for campo in self.CAMPOS})
+
+    def registrar(self, etapa: str, tokens_entrada: int = 0, tokens_saida: int = 0,
+                  tokens_total: Optional[int] = None, tokens_cache: int = 0,
+                  caracteres_prompt: int = 0):
+        """
+        Registra uma chamada à IA.
+
+        Args:
+            etapa (str): Identificação da chamada
+            tokens_entrada (int): Tokens do prompt
+            tokens_saida (int): Tokens gerados
+            tokens_total (int): Total informado pela API (padrão: entrada + saída)
+            tokens_cache (int): Tokens de entrada servidos do cache de contexto do provedor
+            caracteres_prompt (int): Tamanho do prompt em caracteres
+        """
+        with self._lock:
+            dados = self._obter_etapa(etapa)
+            dados["chamadas"] += 1
+            dados["tokens_entrada"] += tokens_entrada
+            dados["tokens_saida"] += tokens_saida
+            dados["tokens_total"] += tokens_total if tokens_total is not None else tokens_entrada + tokens_saida
+            dados["tokens_cache"] += tokens_cache
+            dados["caracteres_prompt"] += caracteres_prompt
+
+    def registrar_resposta_cache(self, etapa: str):
+        """Registra uma resposta servida pelo cache persistente (sem consumo de tokens)."""
+        with self._lock:
+            self._obter_etapa(etapa)["respostas_cache"] += 1
+
+    def totais(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                campo: sum(dados[campo] for dados in self._etapas.values())
+                for campo in self.CAMPOS
+            }
+
+    def para_dict(self) -> Dict[str, Any]:
+        """
+        Returns:
+            Dict: Totais, custo estimado (se configurado) e detalhamento por etapa,
+                com a média de tokens de entrada por chamada
+        """
+        with self._lock:
+            por_etapa = {}
+            for etapa, dados in sorted(self._etapas.items()):
+                por_etapa[etapa] = dict(dados)
+                por_etapa[etapa]["media_tokens_entrada"] = (
+                    round(dados["tokens_entrada"] / dados["chamadas"]) if dados["chamadas"] else 0
+                )
+
+        totais = self.totais()
+        return {
+            "total": totais,
+            "custo_estimado_usd": estimar_custo(totais),
+            "por_etapa": por_etapa
+        }
+
+
+def estimar_custo(totais: Dict[str, int]) -> Optional[float]:
+    """
+    Estima o custo em dólares pelos preços por milhão de tokens do .env
+    (GEMINI_PRECO_ENTRADA_POR_MILHAO e GEMINI_PRECO_SAIDA_POR_MILHAO).
+
+    Returns:
+        float: Custo estimado, ou None se os preços não estiverem configurados
+    """
+    preco_entrada = os.getenv('GEMINI_PRECO_ENTRADA_POR_MILHAO')
+    preco_saida = os.getenv('GEMINI_PRECO_SAIDA_POR_MILHAO')
+    if not preco_entrada or not preco_saida:
+        return None
+
+    try:
+        custo = (totais.get("tokens_entrada", 0) * float(preco_entrada) +
+                 totais.get("tokens_saida", 0) * float(preco_saida)) / 1_000_000
+    except ValueError:
+        return None
+    return round(custo, 6)
+
+
+_registro_global = RegistroUsoTokens()
+
+
+def obter_registro_global() -> RegistroUsoTokens:
+    """Retorna o registro acumulado desde o início do processo."""
+    return _registro_global
+
+
+@contextmanager
+def contabilizar_uso(registro: Optional[RegistroUsoTokens] = None):
+    """
+    Direciona o uso das chamadas feitas dentro do bloco também para o registro dado.
+
+    Blocos aninhados acumulam: uma chamada feita dentro do bloco de um
+    currículo que está dentro do bloco de um lote conta para os dois.
+
+    Yields:
+        RegistroUsoTokens: O registro informado, ou um novo
+    """
+    registro = registro or RegistroUsoTokens()
+    token = _registros_ativos.set(_registros_ativos.get() + (registro,))
+    try:
+        yield registro
+    finally:
+        _registros_ativos.reset(token)
+
+
+def _registros_destino():
+    return (_registro_global,) + _registros_ativos.get()
+
+
+def registrar_resposta(etapa: str, response, prompt: str = ""):
+    """
+    Registra o usage_metadata de uma resposta do genai em todos os registros ativos.
+    """
+    uso = getattr(response, "usage_metadata", None)
+
+    def valor(campo: str) -> int:
+        numero = getattr(uso, campo, None)
+        return numero if isinstance(numero, int) else 0
+
+    tokens_total = getattr(uso, "total_token_count", None)
+    for registro in _registros_destino():
+        registro.registrar(
+            etapa,
+            tokens_entrada=valor("prompt_token_count"),
+            tokens_saida=valor("candidates_token_count"),
+            tokens_total=tokens_total if isinstance(tokens_total, int) else None,
+            tokens_cache=valor("cached_content_token_count"),
+            caracteres_prompt=len(prompt)
+        )
+
+
+def registrar_resposta_cache(etapa: str):
+    """Registra, em todos os registros ativos, uma resposta vinda do cache persistente."""
+    for registro in _registros_destino():
+        registro.registrar_resposta_cache(etapa)